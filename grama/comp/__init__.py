@@ -0,0 +1 @@
+from .comp_sympy import *
@@ -0,0 +1,139 @@
+__all__ = ["comp_sym_function", "cp_sym_function"]
+
+try:
+    from sympy import Matrix, Symbol, lambdify
+
+except ModuleNotFoundError:
+    raise ModuleNotFoundError("module sympy not found")
+
+from grama import add_pipe, comp_vec_function
+from numpy import broadcast_to, asarray
+from pandas import DataFrame
+from toolz import curry
+
+## Helper functions
+# --------------------------------------------------
+def _sym_lambdify(symbols, exprs):
+    r"""Generate a vectorized NumPy kernel for a list of expressions
+
+    Args:
+        symbols (list(sympy.Symbol)): Kernel arguments, in order
+        exprs (list(sympy.Expr)): Expressions to evaluate
+
+    Returns:
+        function: Kernel taking one array per symbol, returning a 2d array with
+            one column per expression
+
+    """
+    kernel = lambdify(symbols, exprs, modules="numpy", cse=True)
+
+    def fun(*args):
+        n = len(args[0]) if len(args) > 0 else 1
+        values = kernel(*args)
+        ## Constant expressions evaluate to scalars; broadcast to rows
+        return [broadcast_to(asarray(val, dtype=float), (n,)) for val in values]
+
+    return fun
+
+
+## Symbolic function
+# -------------------------
+@curry
+def comp_sym_function(model, expr=None, var=None, out=None, name=None, runtime=0):
+    r"""Add a symbolic function to a model
+
+    Composition. Add a function defined by SymPy expressions to an existing
+    model. The expressions are compiled to a NumPy kernel vectorized over
+    DataFrames, and are symbolically differentiated to provide an exact
+    jacobian; see gr.comp_vec_function(). Both kernels use common
+    subexpression elimination.
+
+    Args:
+        model (gr.model): Model to compose
+        expr (sympy.Expr, list(sympy.Expr), or dict): Expression(s) to add; a
+            dict must map output names to expressions
+        var (list(string) or None): List of variable names, matched against
+            the names of the expression symbols. Defaults to all free symbols,
+            sorted by name.
+        out (list(string) or None): List of output names; must be provided
+            unless expr is a dict
+        name (string or None): Name of function
+        runtime (numeric): Estimated single-eval runtime (in seconds)
+
+    Returns:
+        gr.model: New model with added function
+
+    @pre len(out) == len(expr)
+
+    Examples:
+
+        >>> import grama as gr
+        >>> import sympy as sp
+        >>> from grama.comp import cp_sym_function
+        >>> w, t, H, V, Y = sp.symbols("w t H V Y")
+        >>> md = gr.Model("Cantilever stress") >> \
+        >>>     cp_sym_function(
+        >>>         expr={"g_stress": Y - 600 * V / w / t**2 - 600 * H / w**2 / t},
+        >>>         var=["w", "t", "H", "V", "Y"],
+        >>>         name="limit state: stress",
+        >>>     )
+        >>> md >> gr.ev_grad_fd(df_base=gr.df_make(w=3, t=3, H=500, V=1000, Y=4e4))
+
+    """
+    ## Check invariants
+    if expr is None:
+        raise ValueError("`expr` must be a sympy expression, list, or dict")
+    if isinstance(expr, dict):
+        if out is not None:
+            raise ValueError("`out` must be None when `expr` is a dict")
+        out = list(expr.keys())
+        exprs = list(expr.values())
+    else:
+        exprs = list(expr) if isinstance(expr, (list, tuple)) else [expr]
+        if out is None:
+            raise ValueError("`out` must be given unless `expr` is a dict")
+        if isinstance(out, int):
+            if out != len(exprs):
+                raise ValueError("`out` must match the number of expressions")
+            i0 = model.n_out
+            out = ["y{}".format(i) for i in range(i0, i0 + out)]
+        elif len(out) != len(exprs):
+            raise ValueError("`out` must match the number of expressions")
+
+    ## Match variable names to expression symbols
+    symbols_free = {}
+    for e in exprs:
+        for s in e.free_symbols:
+            symbols_free[s.name] = s
+    if var is None:
+        var = sorted(symbols_free.keys())
+    else:
+        var_diff = set(symbols_free.keys()).difference(set(var))
+        if len(var_diff) > 0:
+            raise ValueError(
+                "`var` must include every expression symbol;\n"
+                + "missing = {}".format(var_diff)
+            )
+    symbols = [symbols_free.get(v, Symbol(v)) for v in var]
+
+    ## Generate kernels
+    fun_kernel = _sym_lambdify(symbols, exprs)
+    jac_exprs = list(Matrix(exprs).jacobian(symbols))
+    jac_kernel = _sym_lambdify(symbols, jac_exprs)
+    jac_labels = ["D" + o + "_D" + v for o in out for v in var]
+
+    def fun(df):
+        values = fun_kernel(*[df[v].values for v in var])
+        return DataFrame(data=dict(zip(out, values)), index=df.index)
+
+    def jac(df):
+        values = jac_kernel(*[df[v].values for v in var])
+        return DataFrame(data=dict(zip(jac_labels, values)), index=df.index)
+
+    ## Register as vectorized function with jacobian
+    return comp_vec_function(
+        model, fun=fun, var=var, out=out, name=name, runtime=runtime, jac=jac
+    )
+
+
+cp_sym_function = add_pipe(comp_sym_function)
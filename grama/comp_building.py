@@ -81,7 +81,7 @@ def _comp_function_data(model, fun, var, out, name, runtime):
 # Add a lambda function
 # -------------------------
 @curry
-def comp_function(model, fun=None, var=None, out=None, name=None, runtime=0):
+def comp_function(model, fun=None, var=None, out=None, name=None, runtime=0, jac=None):
     r"""Add a function to a model
 
     Composition. Add a function to an existing model.
@@ -92,6 +92,9 @@ def comp_function(model, fun=None, var=None, out=None, name=None, runtime=0):
         var (list(string)): List of variable names or number of inputs
         out (list(string)): List of output names or number of outputs
         runtime (numeric): Estimated single-eval runtime (in seconds)
+        jac (function or None): Jacobian of fun, taking R^d -> R^(r x d);
+            entry [i, j] is d out[i] / d var[j]. Enables analytic gradients in
+            gr.eval_grad_fd() and the optimizers.
 
     Returns:
         gr.model: New model with added function
@@ -109,6 +112,14 @@ def comp_function(model, fun=None, var=None, out=None, name=None, runtime=0):
         >>>         out=["y"],
         >>>         name="identity"
         >>>     )
+        >>> ## Provide an analytic jacobian
+        >>> md_jac = gr.Model("test") >> \
+        >>>     gr.cp_function(
+        >>>         fun=lambda x: x[0] * x[1],
+        >>>         var=["a", "b"],
+        >>>         out=["y"],
+        >>>         jac=lambda x: [[x[1], x[0]]],
+        >>>     )
 
     """
     model_new = model.copy()
@@ -119,7 +130,7 @@ def comp_function(model, fun=None, var=None, out=None, name=None, runtime=0):
     )
 
     ## Add new function
-    model_new.functions.append(gr.Function(fun, var, out, name, runtime))
+    model_new.functions.append(gr.Function(fun, var, out, name, runtime, jac=jac))
 
     model_new.update()
     return model_new
@@ -130,7 +141,9 @@ cp_function = add_pipe(comp_function)
 # Add vectorized function
 # -------------------------
 @curry
-def comp_vec_function(model, fun=None, var=None, out=None, name=None, runtime=0):
+def comp_vec_function(
+    model, fun=None, var=None, out=None, name=None, runtime=0, jac=None
+):
     r"""Add a vectorized function to a model
 
     Composition. Add a function to an existing model. Function must be
@@ -143,6 +156,9 @@ def comp_vec_function(model, fun=None, var=None, out=None, name=None, runtime=0)
         var (list(string)): List of variable names or number of inputs
         out (list(string)): List of output names or number of outputs
         runtime (numeric): Estimated single-eval runtime (in seconds)
+        jac (function or None): Jacobian of fun; must be *vectorized* over
+            DataFrames, and return a DataFrame with columns named
+            "D" + out + "_D" + var
 
     Returns:
         gr.model: New model with added function
@@ -170,7 +186,9 @@ def comp_vec_function(model, fun=None, var=None, out=None, name=None, runtime=0)
     )
 
     ## Add new vectorized function
-    model_new.functions.append(gr.FunctionVectorized(fun, var, out, name, runtime))
+    model_new.functions.append(
+        gr.FunctionVectorized(fun, var, out, name, runtime, jac=jac)
+    )
 
     model_new.update()
     return model_new
@@ -449,15 +467,22 @@ cp_copula_independence = add_pipe(comp_copula_independence)
 
 # -------------------------
 @curry
-def comp_copula_gaussian(model, df_corr=None, df_data=None):
+def comp_copula_gaussian(model, df_corr=None, df_data=None, corr=None, loadings=None):
     r"""Add a Gaussian copula to model
 
-    Composition. Add a gaussian copula to an existing model.
+    Composition. Add a gaussian copula to an existing model. Provide exactly one
+    source of correlation information.
 
     Args:
         model (gr.model): Model to modify
         df_corr (DataFrame): Correlation information
         df_data (DataFrame): Data for automated fitting
+        corr (array-like or DataFrame): Correlation matrix; rows and columns
+            ordered as model.var_rand, or a DataFrame with var_rand as index
+            and columns. Avoids long-format correlations for many variables.
+        loadings (array-like): Factor loadings B with shape (n_var_rand, k);
+            defines a low-rank-plus-diagonal correlation via
+            gr.CopulaGaussianFactor, for very many random variables
 
     Returns:
         gr.model: Model with Gaussian copula
@@ -478,6 +503,13 @@ def comp_copula_gaussian(model, df_corr=None, df_data=None):
         >>>             corr=[0.5]
         >>>         ))
         >>>     )
+        >>> ## Matrix assignment
+        >>> md = gr.Model() >> \
+        >>>     cp_marginals(
+        >>>         x0={"dist": "norm", "loc": 0, "scale": 1}
+        >>>         x1={"dist": "uniform", "loc": -1, "scale": 2}
+        >>>     ) >> \
+        >>>     cp_copula_gaussian(corr=[[1.0, 0.5], [0.5, 1.0]])
         >>> ## Automated fitting
         >>> from grama.data import df_stang
         >>> md = gr.Model() >> \
@@ -489,30 +521,30 @@ def comp_copula_gaussian(model, df_corr=None, df_data=None):
         >>>     gr.cp_copula_gaussian(df_data=df_stang)
 
     """
+    var_rand = list(model.density.marginals.keys())
+
     if not (df_corr is None):
-        new_model = model.copy()
-        new_model.density = gr.Density(
-            marginals=model.density.marginals,
-            copula=gr.CopulaGaussian(list(model.density.marginals.keys()), df_corr,),
-        )
-        new_model.update()
+        copula = gr.CopulaGaussian(var_rand, df_corr=df_corr)
 
-        return new_model
+    elif not (corr is None):
+        copula = gr.CopulaGaussian(var_rand, corr=corr)
 
-    elif not (df_data is None):
-        new_model = model.copy()
-        df_corr = gr.tran_copula_corr(df_data, model=new_model)
+    elif not (loadings is None):
+        copula = gr.CopulaGaussianFactor(var_rand, loadings)
 
-        new_model.density = gr.Density(
-            marginals=model.density.marginals,
-            copula=gr.CopulaGaussian(list(model.density.marginals.keys()), df_corr,),
+    elif not (df_data is None):
+        copula = gr.CopulaGaussian(
+            var_rand, corr=gr.tran_copula_corr(df_data, model=model, matrix=True)
         )
-        new_model.update()
-
-        return new_model
 
     else:
-        raise ValueError("Must provide df_corr or df_data")
+        raise ValueError("Must provide df_corr, df_data, corr, or loadings")
+
+    new_model = model.copy()
+    new_model.density = gr.Density(marginals=model.density.marginals, copula=copula)
+    new_model.update()
+
+    return new_model
 
 
 cp_copula_gaussian = add_pipe(comp_copula_gaussian)
@@ -4,6 +4,7 @@
 __all__ = [
     "CopulaIndependence",
     "CopulaGaussian",
+    "CopulaGaussianFactor",
     "Domain",
     "Density",
     "Function",
@@ -12,6 +13,7 @@ __all__ = [
     "Marginal",
     "MarginalNamed",
     "MarginalGKDE",
+    "MarginalEmpirical",
     "Model",
     "NaN",
 ]
@@ -29,23 +31,47 @@ from numpy import (
     NaN,
     sqrt,
     dot,
-    diag,
     isfinite,
+    atleast_2d,
+    ndim,
+    newaxis,
+    diag,
+    allclose,
+    minimum,
+    maximum,
+    unique,
+    log,
+    exp,
+    sort,
+    linspace,
+    histogram,
+    ceil,
+    arange,
+    convolve,
+    interp,
+    searchsorted,
+    clip,
+    where,
+    empty,
+    reshape,
+    einsum,
+    stack,
 )
 from numpy import min as npmin
 from numpy import max as npmax
-from numpy.random import random, multivariate_normal
+from numpy.random import random, multivariate_normal, standard_normal
 from numpy.random import seed as set_seed
-from scipy.linalg import det, LinAlgError, solve
+from scipy.linalg import det, LinAlgError, solve_triangular
 from scipy.optimize import root_scalar
 from scipy.stats import norm, gaussian_kde
 from pandas import DataFrame, concat
 
 import grama as gr
 from grama import pipe, valid_dist, param_dist
+from grama.tools import _fork_map
 
 from itertools import chain
-from numpy.linalg import cholesky
+from numpy.linalg import cholesky, svd
 from toolz import curry
 import warnings
 import networkx as nx
@@ -55,6 +81,28 @@ RUNTIME_LOWER = 1  # Cutoff threshold for runtime messages
 
 ## Core functions
 ##################################################
+def _jac_array(df_jac, out, var):
+    r"""Arrange labeled jacobian columns as an array
+
+    Args:
+        df_jac (DataFrame): Jacobian values; columns "D" + out + "_D" + var
+        out (list(str)): Outputs; order of axis 1
+        var (list(str)): Variables; order of axis 2
+
+    Returns:
+        array: Jacobian values; shape (n, len(out), len(var))
+
+    """
+    labels = ["D" + o + "_D" + v for o in out for v in var]
+    label_diff = set(labels).difference(set(df_jac.columns))
+    if len(label_diff) > 0:
+        raise ValueError(
+            "jacobian missing columns;\n" + "missing = {}".format(label_diff)
+        )
+
+    return df_jac[labels].values.reshape((df_jac.shape[0], len(out), len(var)))
+
+
 # Function class
 class Function:
     """Parent class for functions.
@@ -64,7 +112,9 @@ class Function:
 
     """
 
-    def __init__(self, func, var, out, name, runtime):
+    jac = None
+
+    def __init__(self, func, var, out, name, runtime, jac=None):
         """Function constructor
 
         Construct a grama function. Generally not called directly; preferred
@@ -76,6 +126,8 @@ class Function:
             out (list(str)): Named outputs; must match order of X^r
             name (str): Function name
             runtime (numeric): Estimated single-eval runtime (in seconds)
+            jac (function or None): Jacobian of func; maps X^d -> R^(r x d),
+                with entry [i, j] equal to d out[i] / d var[j]
 
         Returns:
             gr.Function: grama function
@@ -86,6 +138,12 @@ class Function:
         self.out = out
         self.name = name
         self.runtime = runtime
+        self.jac = jac
+
+    @property
+    def has_jac(self):
+        """Does the function provide an analytic jacobian?"""
+        return self.jac is not None
 
     def copy(self):
         """Make a copy"""
@@ -95,6 +153,7 @@ class Function:
             copy.deepcopy(self.out),
             copy.deepcopy(self.name),
             runtime=self.runtime,
+            jac=copy.deepcopy(self.jac),
         )
         return func_new
 
@@ -128,6 +187,31 @@ class Function:
         ## Package output as DataFrame
         return DataFrame(data=results, columns=self.out)
 
+    def eval_jac(self, df):
+        """Evaluate function jacobian
+
+        Evaluate the analytic jacobian of a grama function; loops over
+        dataframe rows. Intended for internal use.
+
+        Args:
+            df (DataFrame): Input values to evaluate
+
+        Returns:
+            array: Jacobian values; shape (n, len(out), len(var))
+
+        """
+        if not self.has_jac:
+            raise ValueError("Function `{}` has no jacobian".format(self.name))
+
+        n_rows = df.shape[0]
+        results = zeros((n_rows, len(self.out), len(self.var)))
+        for ind in range(n_rows):
+            results[ind] = reshape(
+                self.jac(df.loc[ind, self.var]), (len(self.out), len(self.var))
+            )
+
+        return results
+
     def summary(self):
         """Returns a summary string
         """
@@ -150,10 +234,29 @@ class FunctionVectorized(Function):
         df_res = self.func(df)
         return df_res[self.out]
 
+    def eval_jac(self, df):
+        """Evaluate function jacobian; DataFrame vectorized
+
+        Evaluate the analytic jacobian of a grama function. Assumes the jacobian
+        is vectorized over dataframes, and returns columns named
+        "D" + out + "_D" + var.
+
+        Args:
+            df (DataFrame): Input values to evaluate
+
+        Returns:
+            array: Jacobian values; shape (n, len(out), len(var))
+
+        """
+        if not self.has_jac:
+            raise ValueError("Function `{}` has no jacobian".format(self.name))
+
+        return _jac_array(self.jac(df), self.out, self.var)
+
     def copy(self):
         """Make a copy"""
         func_new = FunctionVectorized(
-            self.func, self.var, self.out, self.name, self.runtime
+            self.func, self.var, self.out, self.name, self.runtime, jac=self.jac
         )
         return func_new
 
@@ -162,7 +265,7 @@ class FunctionModel(Function):
     """gr.Model as gr.Function
     """
 
-    def __init__(self, md, ev=None, var=None, out=None):
+    def __init__(self, md, ev=None, var=None, out=None, jac=None):
         """Model-Function constructor
 
         Construct a grama function from a model. Generally not called directly;
@@ -175,6 +278,9 @@ class FunctionModel(Function):
             var (list): Variables used by ev() to evaluate md. Ignored if
                 default ev used.
             out (list): Outputs returned by ev(). Ignored if default ev used.
+            jac (function or None): Jacobian of ev(); must have signature
+                jac(md, df) and return columns "D" + out + "_D" + var. Ignored
+                if default ev used.
 
         Returns:
             gr.Function: grama function
@@ -189,15 +295,20 @@ class FunctionModel(Function):
                 df_res = md.evaluate_df(df)
                 return df_res[md.out]
 
+            def _jac(md, df):
+                return md.evaluate_jac(df)
+
             self.ev = _ev
             self.var = self.model.var
             self.out = self.model.out
+            self.jac = _jac if md.has_jac else None
 
         ## Use given evaluator
         else:
             self.ev = ev
             self.var = var
             self.out = out
+            self.jac = jac
 
         ## Copy model data
         self.runtime = md.runtime(1)
@@ -217,9 +328,26 @@ class FunctionModel(Function):
         """
         return self.ev(self.model, df)
 
+    def eval_jac(self, df):
+        """Evaluate function jacobian; DataFrame vectorized
+
+        Args:
+            df (DataFrame): Input values to evaluate
+
+        Returns:
+            array: Jacobian values; shape (n, len(out), len(var))
+
+        """
+        if not self.has_jac:
+            raise ValueError("Function `{}` has no jacobian".format(self.name))
+
+        return _jac_array(self.jac(self.model, df), self.out, self.var)
+
     def copy(self):
         """Make a copy"""
-        func_new = FunctionModel(self.model, ev=self.ev, var=self.var, out=self.out)
+        func_new = FunctionModel(
+            self.model, ev=self.ev, var=self.var, out=self.out, jac=self.jac
+        )
         return func_new
 
 
@@ -474,6 +602,95 @@ class MarginalGKDE(Marginal):
         )
 
 
+## Empirical marginal class
+class MarginalEmpirical(Marginal):
+    """Marginal using the empirical distribution of data
+
+    Stores the sorted data; the CDF and quantile function linearly interpolate
+    the order statistics, so each evaluation is a binary search.
+
+    """
+
+    def __init__(self, data, smooth=False, bins="auto", n_grid=512, **kw):
+        super().__init__(**kw)
+
+        self.smooth = smooth
+        self.bins = bins
+        self.n_grid = n_grid
+        self.fit(data)
+
+    def copy(self):
+        new_marginal = MarginalEmpirical(
+            data=self.data,
+            smooth=self.smooth,
+            bins=self.bins,
+            n_grid=self.n_grid,
+            sign=self.sign,
+        )
+
+        return new_marginal
+
+    def _set_density(self):
+        ## Tabulate the density on a grid, for constant-cost evaluation
+        if self.smooth:
+            ## Binned gaussian KDE; Silverman's rule bandwidth
+            n = len(self.data)
+            bw = 1.06 * self.data.std() * n ** (-1 / 5)
+            edges = linspace(
+                self.data[0] - 3 * bw, self.data[-1] + 3 * bw, self.n_grid + 1
+            )
+            counts, _ = histogram(self.data, bins=edges)
+            dx = edges[1] - edges[0]
+            m = min(int(ceil(3 * bw / dx)), self.n_grid // 2 - 1)
+            kernel = norm.pdf(arange(-m, m + 1) * dx, scale=bw)
+            self._dens = convolve(counts, kernel, mode="same") / n
+        else:
+            self._dens, edges = histogram(self.data, bins=self.bins, density=True)
+
+        self._edges = edges
+
+    ## Fitting function
+    def fit(self, data):
+        data = sort(array(data, dtype=float).flatten())
+        if len(unique(data)) < 2:
+            raise ValueError("data must contain at least two distinct values")
+
+        self.data = data
+        self._pr = linspace(0, 1, len(data))
+        self._set_density()
+
+    ## Likelihood function
+    def l(self, x):
+        if self.smooth:
+            centers = 0.5 * (self._edges[1:] + self._edges[:-1])
+            return interp(x, centers, self._dens, left=0, right=0)
+
+        ## Histogram lookup
+        ind = searchsorted(self._edges, x, side="right") - 1
+        ind = clip(ind, 0, len(self._dens) - 1)
+        inside = (x >= self._edges[0]) & (x <= self._edges[-1])
+
+        return where(inside, self._dens[ind], 0)
+
+    ## Cumulative density function
+    def p(self, x):
+        return interp(x, self.data, self._pr, left=0, right=1)
+
+    ## Quantile function
+    def q(self, p):
+        return interp(p, self._pr, self.data)
+
+    ## Summary
+    def summary(self):
+        return "({0:+}) empirical, n={1:}, [{2:2.1e}, {3:2.1e}], {4:}".format(
+            self.sign,
+            len(self.data),
+            self.data[0],
+            self.data[-1],
+            "smoothed" if self.smooth else "histogram",
+        )
+
+
 ## Copula base class
 class Copula(ABC):
     """Parent class for copulas
@@ -504,9 +721,28 @@ class Copula(ABC):
         pass
 
     @abstractmethod
-    def dudz(self, z):
+    def dudz_factor(self, z):
         pass
 
+    def dudz(self, z):
+        """Jacobian
+
+        Assemble the jacobian from its factored form; see dudz_factor().
+
+        Args:
+            z (array-like): Single vector, or 2d array with one point per row
+
+        Returns:
+            array: Jacobian; shape (d, d) for a single vector, (n, d, d) for a
+                2d array
+
+        """
+        A, W = self.dudz_factor(z)
+
+        if ndim(W) == 1:
+            return A * W[newaxis, :]
+        return A[newaxis, :, :] * W[:, newaxis, :]
+
     @abstractmethod
     def summary(self):
         pass
@@ -536,12 +772,14 @@ class CopulaIndependence(Copula):
 
         return cop
 
-    def sample(self, n=1, seed=None):
+    def sample(self, n=1, seed=None, rng=None):
         """Draw samples from copula
 
         Args:
             n (int): Number of samples
             seed (int): Random seed
+            rng (numpy.random.Generator or None): Generator to draw from; uses
+                numpy's global random state if None
 
         Returns:
             DataFrame: Independent samples
@@ -550,7 +788,12 @@ class CopulaIndependence(Copula):
         if seed is not None:
             set_seed(seed)
 
-        return DataFrame(data=random((n, len(self.var_rand))), columns=self.var_rand)
+        if rng is None:
+            U = random((n, len(self.var_rand)))
+        else:
+            U = rng.random((n, len(self.var_rand)))
+
+        return DataFrame(data=U, columns=self.var_rand)
 
     def l(self, u):
         """Density function
@@ -588,57 +831,93 @@ class CopulaIndependence(Copula):
         """
         return norm.cdf(z)
 
-    def dudz(self, z):
-        """Jacobian
+    def dudz_factor(self, z):
+        """Jacobian; factored form
+
+        The jacobian at each point is dudz[k] = A @ diag(W[k]).
 
         Args:
-            z (array-like):
+            z (array-like): Single vector, or 2d array with one point per row
 
         Returns:
-            array:
+            tuple: (A, W); shared factor A, and weights W with the shape of z
 
         """
-        return diag(norm.pdf(z))
+        return eye(len(self.var_rand)), norm.pdf(z)
 
     def summary(self):
         return "Independence copula"
 
 
 class CopulaGaussian(Copula):
-    def __init__(self, var_rand, df_corr):
+    def __init__(self, var_rand, df_corr=None, corr=None):
         """Constructor
 
+        Provide the correlation structure either as long-format pairwise
+        correlations (df_corr) or as a full correlation matrix (corr). The
+        matrix form avoids building a long-format frame, which matters for
+        many random variables.
+
         Args:
             self (gr.CopulaGaussian):
+            var_rand (list of str): Random variable names
             df_corr (DataFrame): Pairwise correlations provided as
                 off-diagonal upper-triangular entries. Must have columns
                 ["var1", "var2", "corr"]. Zero-correlation entires must
                 be provided.
+            corr (array-like or DataFrame): Correlation matrix; rows and
+                columns must match the order of var_rand. A DataFrame with
+                var_rand as index and columns is re-ordered to match.
 
         Returns:
             gr.CopulaGaussian: Gaussian copula
 
         """
-        ## Sort correlations along given var_rand
-        sorter_index = dict(zip(var_rand, range(len(var_rand))))
-        df_corr["var1_rank"] = df_corr["var1"].map(sorter_index)
-        df_corr["var2_rank"] = df_corr["var2"].map(sorter_index)
-        df_corr.sort_values(
-            ["var1_rank", "var2_rank"], ascending=[True, True], inplace=True
-        )
-        df_corr.drop(["var1_rank", "var2_rank"], axis=1, inplace=True)
-
         n_var_rand = len(var_rand)
-        Ind_upper = triu_indices(n_var_rand, 1)
 
-        ## Check invariants
-        if len(Ind_upper[0]) != len(df_corr["corr"]):
-            raise ValueError("Invalid set of correlations provided")
+        if (df_corr is None) == (corr is None):
+            raise ValueError("Must provide exactly one of df_corr or corr")
+
+        ## Build correlation structure from pairwise entries
+        if corr is None:
+            ## Check invariants
+            if len(triu_indices(n_var_rand, 1)[0]) != df_corr.shape[0]:
+                raise ValueError("Invalid set of correlations provided")
+            if not (
+                df_corr["var1"].isin(var_rand).all()
+                and df_corr["var2"].isin(var_rand).all()
+            ):
+                raise ValueError("Invalid set of correlations provided")
+
+            ## Map pairs to (upper-triangular) matrix entries
+            sorter_index = dict(zip(var_rand, range(n_var_rand)))
+            ind1 = df_corr["var1"].map(sorter_index).values
+            ind2 = df_corr["var2"].map(sorter_index).values
+            ind_lo = minimum(ind1, ind2)
+            ind_hi = maximum(ind1, ind2)
+            if (ind_lo == ind_hi).any() or (
+                len(unique(ind_lo * n_var_rand + ind_hi)) != len(ind_lo)
+            ):
+                raise ValueError("Invalid set of correlations provided")
+
+            Sigma = eye(n_var_rand)
+            Sigma[ind_lo, ind_hi] = df_corr["corr"].values
+            Sigma[ind_hi, ind_lo] = df_corr["corr"].values
+
+        ## Use correlation matrix directly
+        else:
+            if isinstance(corr, DataFrame):
+                corr = corr.loc[var_rand, var_rand]
+            Sigma = array(corr, dtype=float)
+
+            ## Check invariants
+            if Sigma.shape != (n_var_rand, n_var_rand):
+                raise ValueError(
+                    "corr must have shape ({0:}, {0:})".format(n_var_rand)
+                )
+            if not (allclose(Sigma, Sigma.T) and allclose(diag(Sigma), 1)):
+                raise ValueError("corr must be symmetric with unit diagonal")
 
-        ## Build correlation structure
-        Sigma = eye(n_var_rand)
-        Sigma[Ind_upper] = df_corr["corr"].values
-        Sigma = Sigma + (Sigma - eye(n_var_rand)).T
         try:
             Sigma_h = cholesky(Sigma)
         except LinAlgError:
@@ -648,33 +927,62 @@ class CopulaGaussian(Copula):
             Sigma_h = None
 
         ## Build density quantities
-
-        self.df_corr = df_corr
+        self._df_corr = df_corr
         self.var_rand = var_rand
         self.Sigma = Sigma
         self.Sigma_h = Sigma_h
 
+    @property
+    def df_corr(self):
+        """Pairwise correlations in long format
+
+        Built from the correlation matrix on first access, if the copula was
+        constructed from a matrix.
+
+        """
+        if self._df_corr is None:
+            Ind_upper = triu_indices(len(self.var_rand), 1)
+            var_rand = array(self.var_rand, dtype=object)
+            self._df_corr = DataFrame(
+                dict(
+                    var1=var_rand[Ind_upper[0]],
+                    var2=var_rand[Ind_upper[1]],
+                    corr=self.Sigma[Ind_upper],
+                )
+            )
+
+        return self._df_corr
+
     def copy(self):
         """Copy
 
+        Shares the (read-only) correlation matrix and its factor with the
+        original, rather than re-factorizing.
+
         Args:
             self (gr.CopulaGaussian):
 
         Returns:
             gr.CopulaGaussian:
         """
-        cop = CopulaGaussian(self.var_rand, self.df_corr.copy())
+        cop = copy.copy(self)
+        cop.var_rand = list(self.var_rand)
 
         return cop
 
-    def sample(self, n=1, seed=None):
+    def sample(self, n=1, seed=None, rng=None):
         """Draw samples from copula
 
-        Draw samples according to gaussian copula dependence structure.
+        Draw samples according to gaussian copula dependence structure. Uses
+        the cached Cholesky factor, so repeated (chunked) sampling costs a
+        single matrix product per call.
 
         Args:
             self (gr.CopulaGaussian):
             n (int): Number of samples to draw
+            seed (int): Random seed
+            rng (numpy.random.Generator or None): Generator to draw from; uses
+                numpy's global random state if None
 
         Returns:
             array: Copula samples
@@ -685,9 +993,22 @@ class CopulaGaussian(Copula):
             set_seed(seed)
 
         ## Generate correlated samples
-        gaussian_samples = multivariate_normal(
-            mean=[0] * len(self.var_rand), cov=self.Sigma, size=n
-        )
+        n_var_rand = len(self.var_rand)
+        if self.Sigma_h is not None:
+            if rng is None:
+                Z = standard_normal((n, n_var_rand))
+            else:
+                Z = rng.standard_normal((n, n_var_rand))
+            gaussian_samples = dot(Z, self.Sigma_h.T)
+        ## Fall back to factorization-free sampling if not positive-definite
+        elif rng is None:
+            gaussian_samples = multivariate_normal(
+                mean=[0] * n_var_rand, cov=self.Sigma, size=n
+            )
+        else:
+            gaussian_samples = rng.multivariate_normal(
+                mean=[0] * n_var_rand, cov=self.Sigma, size=n
+            )
         ## Convert to uniform marginals
         quantiles = valid_dist["norm"].cdf(gaussian_samples)
 
@@ -715,7 +1036,7 @@ class CopulaGaussian(Copula):
 
         """
         N = norm.ppf(u)
-        Z = solve(self.Sigma_h, N)
+        Z = solve_triangular(self.Sigma_h, N.T, lower=True).T
 
         return Z
 
@@ -729,24 +1050,191 @@ class CopulaGaussian(Copula):
             array:
 
         """
-        return norm.cdf(dot(self.Sigma_h, z))
+        return norm.cdf(dot(z, self.Sigma_h.T))
 
-    def dudz(self, z):
-        """Jacobian
+    def dudz_factor(self, z):
+        """Jacobian; factored form
+
+        The jacobian at each point is dudz[k] = A @ diag(W[k]).
 
         Args:
-            z (array-like):
+            z (array-like): Single vector, or 2d array with one point per row
 
         Returns:
-            array:
+            tuple: (A, W); shared factor A, and weights W with the shape of z
 
         """
-        return dot(self.Sigma_h.T, diag(norm.pdf(dot(self.Sigma_h, z))))
+        return self.Sigma_h.T, norm.pdf(dot(z, self.Sigma_h.T))
 
     def summary(self):
         return "Gaussian copula with correlations:\n{}".format(self.df_corr)
 
 
+class CopulaGaussianFactor(Copula):
+    def __init__(self, var_rand, loadings):
+        """Constructor
+
+        Gaussian copula with a low-rank-plus-diagonal (factor) correlation
+
+            Sigma = B B^T + diag(1 - sum(B**2, axis=1))
+
+        where B are the factor loadings. Sampling and transforms cost
+        O(n d k) for n points, d variables, and k factors; the full
+        correlation matrix is never formed.
+
+        Args:
+            self (gr.CopulaGaussianFactor):
+            var_rand (list of str): Random variable names
+            loadings (array-like): Factor loadings B with shape (d, k); rows
+                must match the order of var_rand. Each row must have squared
+                norm less than one.
+
+        Returns:
+            gr.CopulaGaussianFactor: Gaussian factor copula
+
+        """
+        B = array(loadings, dtype=float)
+        if B.ndim == 1:
+            B = B[:, newaxis]
+
+        ## Check invariants
+        if B.shape[0] != len(var_rand):
+            raise ValueError("loadings must have one row per var_rand")
+        psi = 1 - (B ** 2).sum(axis=1)
+        if (psi <= 0).any():
+            raise ValueError("loadings rows must have squared norm less than one")
+
+        ## Symmetric square root of I + C C^T, with C = diag(psi)^{-1/2} B
+        psi_h = sqrt(psi)
+        U, s, _ = svd(B / psi_h[:, newaxis], full_matrices=False)
+
+        self.var_rand = var_rand
+        self.loadings = B
+        self.psi = psi
+        self._psi_h = psi_h
+        self._U = U
+        self._s = s
+        self._a = sqrt(1 + s ** 2) - 1
+        self._a_inv = 1 / sqrt(1 + s ** 2) - 1
+
+    @property
+    def Sigma(self):
+        """Full correlation matrix; formed on demand"""
+        return dot(self.loadings, self.loadings.T) + diag(self.psi)
+
+    def copy(self):
+        """Copy
+
+        Args:
+            self (gr.CopulaGaussianFactor):
+
+        Returns:
+            gr.CopulaGaussianFactor:
+        """
+        cop = copy.copy(self)
+        cop.var_rand = list(self.var_rand)
+
+        return cop
+
+    def sample(self, n=1, seed=None, rng=None):
+        """Draw samples from copula
+
+        Args:
+            self (gr.CopulaGaussianFactor):
+            n (int): Number of samples to draw
+            seed (int): Random seed
+            rng (numpy.random.Generator or None): Generator to draw from; uses
+                numpy's global random state if None
+
+        Returns:
+            DataFrame: Copula samples
+
+        """
+        ## Set seed only if given
+        if seed is not None:
+            set_seed(seed)
+
+        if rng is None:
+            Z = standard_normal((n, len(self.var_rand)))
+        else:
+            Z = rng.standard_normal((n, len(self.var_rand)))
+
+        return DataFrame(data=self.z2u(Z), columns=self.var_rand)
+
+    def _z2n(self, z):
+        ## Correlated normals; N = Z (I + U A U^T) diag(psi)^{1/2}
+        return (z + dot(dot(z, self._U) * self._a, self._U.T)) * self._psi_h
+
+    def _n2z(self, n):
+        ## Inverse of _z2n
+        y = n / self._psi_h
+        return y + dot(dot(y, self._U) * self._a_inv, self._U.T)
+
+    def l(self, u):
+        """Density function
+
+        Args:
+            u (array-like): Single vector, or 2d array with one point per row
+
+        Returns:
+            array: Copula density values
+
+        """
+        N = norm.ppf(u)
+        Z = self._n2z(N)
+        logdet = log(self.psi).sum() + log(1 + self._s ** 2).sum()
+
+        return exp(-0.5 * (logdet + (Z ** 2).sum(axis=-1) - (N ** 2).sum(axis=-1)))
+
+    def u2z(self, u):
+        """Transform to standard-normal space
+
+        Args:
+            u (array-like): Single vector, or 2d array with one point per row
+
+        Returns:
+            array:
+
+        """
+        return self._n2z(norm.ppf(u))
+
+    def z2u(self, z):
+        """Transform to uniform-marginal space
+
+        Args:
+            z (array-like): Single vector, or 2d array with one point per row
+
+        Returns:
+            array:
+
+        """
+        return norm.cdf(self._z2n(z))
+
+    def dudz_factor(self, z):
+        """Jacobian; factored form
+
+        The jacobian at each point is dudz[k] = A @ diag(W[k]). Note that A is
+        a dense (d, d) matrix.
+
+        Args:
+            z (array-like): Single vector, or 2d array with one point per row
+
+        Returns:
+            tuple: (A, W); shared factor A, and weights W with the shape of z
+
+        """
+        A = (eye(len(self.var_rand)) + dot(self._U * self._a, self._U.T)) * (
+            self._psi_h[newaxis, :]
+        )
+
+        return A, norm.pdf(self._z2n(z))
+
+    def summary(self):
+        return "Gaussian factor copula; {0:} factors over {1:} variables".format(
+            self.loadings.shape[1], self.loadings.shape[0]
+        )
+
+
 ## Density parent class
 class Density:
     """Parent class for joint densities
@@ -794,58 +1282,136 @@ class Density:
 
         return new_density
 
-    def pr2sample(self, df_prval):
-        """Convert CDF probabilities to samples
+    def _marginal_map(self, method, values, var, out, n_jobs):
+        ## Apply a marginal method column-by-column; shared by array conversions
+        if values.ndim != 2 or values.shape[1] != len(var):
+            raise ValueError("values must have one column per entry of var")
+        if out is None:
+            out = empty(values.shape)
+        elif out.shape != values.shape:
+            raise ValueError("out must have shape {}".format(values.shape))
+
+        ## Workers inherit the marginals and values through fork; only the
+        ## column indices and results are pickled
+        results = _fork_map(
+            lambda i: getattr(self.marginals[var[i]], method)(values[:, i]),
+            list(range(len(var))),
+            n_jobs,
+        )
 
-        Convert random variable CDF probabilities to random variable samples.
-        Ignores dependence structure.
+        for i, res in enumerate(results):
+            out[:, i] = res
+
+        return out
+
+    def pr2sample_array(self, prval, var=None, out=None, n_jobs=None):
+        r"""Convert CDF probabilities to samples; array version
+
+        Convert random variable CDF probabilities to random variable samples,
+        without DataFrame overhead. Ignores dependence structure.
 
         Args:
-            df_prval (DataFrame): Values \in [0,1]
+            prval (2d array): Values \in [0,1]; one column per entry of var
+            var (list of str or None): Variables matching the columns of
+                prval; uses the marginal order if None
+            out (2d array or None): Buffer for results, same shape as prval;
+                allocated if None. May be prval itself, for in-place
+                conversion.
+            n_jobs (int or None): Number of processes to evaluate marginals in
+                parallel across columns; worthwhile for expensive marginals
+                (e.g. KDE). Evaluates serially if None.
 
         Returns:
-            DataFrame: Variable samples (quantiles)
+            array: Variable samples (quantiles); out, if provided
 
-        @pre df_prval.shape[1] == len(self.var_rand)
-        @post result.shape[1] == len(self.var_rand)
+        """
+        if var is None:
+            var = list(self.marginals.keys())
+
+        return self._marginal_map("q", prval, var, out, n_jobs)
+
+    def sample2pr_array(self, sample, var=None, out=None, n_jobs=None):
+        r"""Convert samples to CDF probabilities; array version
+
+        Convert random variable samples to CDF probabilities, without
+        DataFrame overhead. Ignores dependence structure.
+
+        Args:
+            sample (2d array): Variable values; one column per entry of var
+            var (list of str or None): Variables matching the columns of
+                sample; uses the marginal order if None
+            out (2d array or None): Buffer for results, same shape as sample;
+                allocated if None. May be sample itself, for in-place
+                conversion.
+            n_jobs (int or None): Number of processes to evaluate marginals in
+                parallel across columns; worthwhile for expensive marginals
+                (e.g. KDE). Evaluates serially if None.
+
+        Returns:
+            array: CDF probabilities; out, if provided
 
         """
+        if var is None:
+            var = list(self.marginals.keys())
+
+        return self._marginal_map("p", sample, var, out, n_jobs)
+
+    def _var_comp(self, df, name):
+        ## Variables to convert; stable (marginal) order
         try:
             var_rand = list(self.marginals.keys())
         except AttributeError:
             var_rand = []
 
-        ## Empty case
-        if len(var_rand) == 0:
-            return DataFrame()
-
-        ## Variables to convert
-        var_comp = list(set(var_rand).intersection(set(df_prval.columns)))
-        if len(var_comp) == 0:
+        var_comp = [var for var in var_rand if var in df.columns]
+        if (len(var_rand) > 0) and (len(var_comp) == 0):
             raise ValueError(
-                "Intersection of df_prval.columns and var_rand must be nonempty"
+                "Intersection of {}.columns and var_rand must be nonempty".format(name)
             )
 
-        samples = zeros(df_prval[var_comp].shape)
-        ## Ensure correct column ordering
-        prval = df_prval[var_comp].values
+        return var_comp
+
+    def pr2sample(self, df_prval, n_jobs=None):
+        r"""Convert CDF probabilities to samples
 
-        ## Apply appropriate marginal
-        for ind in range(len(var_comp)):
-            ## Map with inverse density
-            var = var_comp[ind]
-            samples[:, ind] = self.marginals[var].q(prval[:, ind])
+        Convert random variable CDF probabilities to random variable samples.
+        Ignores dependence structure. Result columns follow the marginal
+        order.
+
+        Args:
+            df_prval (DataFrame): Values \in [0,1]
+            n_jobs (int or None): Number of processes for parallel marginal
+                evaluation; see pr2sample_array()
+
+        Returns:
+            DataFrame: Variable samples (quantiles)
+
+        @pre df_prval.shape[1] == len(self.var_rand)
+        @post result.shape[1] == len(self.var_rand)
+
+        """
+        var_comp = self._var_comp(df_prval, "df_prval")
+
+        ## Empty case
+        if len(var_comp) == 0:
+            return DataFrame()
+
+        ## Convert in-place on a single copy of the data
+        samples = df_prval[var_comp].values.astype(float)
+        self.pr2sample_array(samples, var=var_comp, out=samples, n_jobs=n_jobs)
 
         return DataFrame(data=samples, columns=var_comp)
 
-    def sample2pr(self, df_sample):
-        """Convert samples to CDF probabilities
+    def sample2pr(self, df_sample, n_jobs=None):
+        r"""Convert samples to CDF probabilities
 
         Convert random variable samples to CDF probabilities. Ignores dependence
-        structure.
+        structure. Result columns follow the marginal order.
 
         Args:
             df_sample (DataFrame): Values \in [0,1]
+            n_jobs (int or None): Number of processes for parallel marginal
+                evaluation; see sample2pr_array()
 
         Returns:
             DataFrame: Variable samples (quantiles)
@@ -854,35 +1420,19 @@ class Density:
         @post result.shape[1] == len(self.var_rand)
 
         """
-        try:
-            var_rand = list(self.marginals.keys())
-        except AttributeError:
-            var_rand = []
+        var_comp = self._var_comp(df_sample, "df_sample")
 
         ## Empty case
-        if len(var_rand) == 0:
-            return DataFrame()
-
-        ## Variables to convert
-        var_comp = list(set(var_rand).intersection(set(df_sample.columns)))
         if len(var_comp) == 0:
-            raise ValueError(
-                "Intersection of df_sample.columns and var_rand must be nonempty"
-            )
-
-        prval = zeros(df_sample[var_comp].shape)
-        ## Ensure correct column ordering
-        sample = df_sample[var_comp].values
+            return DataFrame()
 
-        ## Apply appropriate marginal
-        for ind in range(len(var_comp)):
-            ## Map with inverse density
-            var = var_comp[ind]
-            prval[:, ind] = self.marginals[var].p(sample[:, ind])
+        ## Convert in-place on a single copy of the data
+        prval = df_sample[var_comp].values.astype(float)
+        self.sample2pr_array(prval, var=var_comp, out=prval, n_jobs=n_jobs)
 
         return DataFrame(data=prval, columns=var_comp)
 
-    def sample(self, n=1, seed=None):
+    def sample(self, n=1, seed=None, rng=None):
         """Draw samples from joint density
 
         Draw samples according to joint density using marginal and copula
@@ -891,13 +1441,15 @@ class Density:
         Args:
             n (int): Number of samples to draw
             seed (int): random seed to use
+            rng (numpy.random.Generator or None): Generator to draw from; uses
+                numpy's global random state if None
 
         Returns:
             DataFrame: Joint density samples
 
         """
         if not (self.copula is None):
-            df_pr = self.copula.sample(n=n, seed=seed)
+            df_pr = self.copula.sample(n=n, seed=seed, rng=rng)
         else:
             raise ValueError(
                 "\n"
@@ -1012,6 +1564,11 @@ class Model:
         self.n_var_det = len(self.var_det)
         self.n_out = len(self.out)
 
+        ## Analytic derivatives available only if every function provides them
+        self.has_jac = (len(self.functions) > 0) and all(
+            fun.has_jac for fun in self.functions
+        )
+
     def runtime(self, n):
         """Estimate runtime
 
@@ -1092,6 +1649,81 @@ class Model:
 
         return df_tmp[self.out]
 
+    def _jac_chain(self, df, var):
+        """Evaluate outputs and chain function jacobians through the DAG
+
+        Args:
+            df (DataFrame): Variable values at which to evaluate model functions
+            var (list(str)): Variables with respect to which to differentiate
+
+        Returns:
+            DataFrame: Output results
+            array: Jacobian values; shape (n, n_out, len(var)), with axis 1
+                ordered as self.out
+
+        """
+        n = df.shape[0]
+        df_tmp = (
+            df.copy().drop(self.out, axis=1, errors="ignore").reset_index(drop=True)
+        )
+
+        ## Seed derivatives of model inputs
+        D = {}
+        for v in self.var:
+            D[v] = zeros((n, len(var)))
+        for i, v in enumerate(var):
+            D[v][:, i] = 1
+
+        ## Forward-mode chain rule, one function at a time
+        for func in self.functions:
+            J = func.eval_jac(df_tmp)
+            D_in = stack([D[v] for v in func.var], axis=1)
+            D_out = einsum("nij,njk->nik", J, D_in)
+            for i, o in enumerate(func.out):
+                D[o] = D_out[:, i, :]
+
+            df_tmp = concat((df_tmp, func.eval(df_tmp)), axis=1)
+
+        return df_tmp[self.out], stack([D[o] for o in self.out], axis=1)
+
+    def evaluate_jac(self, df, var=None):
+        """Evaluate analytic jacobian using an input dataframe
+
+        Chains the jacobians of each model function through the DAG to compute
+        d out / d var in a single pass. Requires every function to provide a
+        jacobian; see gr.comp_function().
+
+        Args:
+            df (DataFrame): Variable values at which to evaluate jacobian
+            var (list(str) or None): Variables with respect to which to
+                differentiate; defaults to self.var
+
+        Returns:
+            DataFrame: Jacobian values; columns named "D" + out + "_D" + var
+
+        """
+        ## Check invariants
+        if not self.has_jac:
+            raise ValueError("every model function must provide a jacobian")
+        var_diff = set(self.var).difference(set(df.columns))
+        if len(var_diff) != 0:
+            raise ValueError(
+                "Model inputs not a subset of given columns;\n"
+                + "missing var = {}".format(var_diff)
+            )
+        if var is None:
+            var = self.var
+        elif not set(var).issubset(set(self.var)):
+            raise ValueError("var must be subset of model.var")
+
+        _, J = self._jac_chain(df, var)
+
+        ## Order labels as in gr.eval_grad_fd()
+        labels = ["D" + o + "_D" + v for v in var for o in self.out]
+        data = J.transpose((0, 2, 1)).reshape((df.shape[0], len(var) * self.n_out))
+
+        return DataFrame(data=data, columns=labels)
+
     def var_outer(self, df_rand, df_det=None):
         """Outer product of random and deterministic samples
 
@@ -1135,71 +1767,95 @@ class Model:
     def x2z(self, x):
         r"""Transform to standard normal space
 
-        Transform a single vector of random variable values to standard normal
-        space.
+        Transform random variable values to standard normal space. Accepts a
+        single vector or a batch of vectors arranged as rows.
 
         Args:
-            x (array): Single vector of values in var_rand. Order of entries
-                must match self.var_rand
+            x (array): Single vector of values in var_rand, or 2d array with
+                one observation per row. Order of entries must match
+                self.var_rand
 
         Returns:
-            array: Single vector of values transformed to standard normal space
+            array: Values transformed to standard normal space; same shape as x
 
         """
+        X = atleast_2d(x)
         ## Transform to uniform
-        u = zeros(self.n_var_rand)
+        U = zeros(X.shape)
         for i in range(self.n_var_rand):
-            u[i] = self.density.marginals[self.var_rand[i]].p(x[i])
+            U[:, i] = self.density.marginals[self.var_rand[i]].p(X[:, i])
         ## Transform to standard normal
-        z = self.density.copula.u2z(u)
+        Z = self.density.copula.u2z(U)
 
-        return z
+        if ndim(x) == 1:
+            return Z[0]
+        return Z
 
     def z2x(self, z):
         r"""Transform to random variable space
 
-        Transform a single vector of normal values to the model's random
-        variable space.
+        Transform standard normal values to the model's random variable space.
+        Accepts a single vector or a batch of vectors arranged as rows.
 
         Args:
-            z (array): Single vector of standard normal values. Order of entries
-                must match self.var_rand
+            z (array): Single vector of standard normal values, or 2d array
+                with one observation per row. Order of entries must match
+                self.var_rand
 
         Returns:
-            array: Single vector of values transformed to model random variable space
+            array: Values transformed to model random variable space; same
+                shape as z
 
         """
         ## Correlate and map to uniform
-        u = self.density.copula.z2u(z)
+        U = atleast_2d(self.density.copula.z2u(atleast_2d(z)))
         ## Transform per marginal
-        x = zeros(self.n_var_rand)
+        X = zeros(U.shape)
         for i in range(self.n_var_rand):
-            x[i] = self.density.marginals[self.var_rand[i]].q(u[i])
+            X[:, i] = self.density.marginals[self.var_rand[i]].q(U[:, i])
 
-        return x
+        if ndim(z) == 1:
+            return X[0]
+        return X
 
-    def dxdz(self, z):
+    def dxdz(self, z, factor=False):
         r"""Inverse transform jacobian
 
-        Compute jacobian of the inverse transform X = phi^{-1}(Z)
+        Compute jacobian of the inverse transform X = phi^{-1}(Z). Entry [i, j]
+        of the jacobian is dx_j / dz_i. Accepts a single vector or a batch of
+        vectors arranged as rows; batches are evaluated in a single pass.
 
         Args:
-            z (array): Single vector of standard normal values. Order of entries
-                must match self.var_rand
+            z (array): Single vector of standard normal values, or 2d array
+                with one observation per row. Order of entries must match
+                self.var_rand
+            factor (bool): Return the jacobian in factored form (A, W), where
+                the jacobian at point k is A @ diag(W[k])?
 
         Returns:
-            2d array: Jacobian of inverse transform
+            array: Jacobian of inverse transform; shape (d, d) for a single
+                vector, (n, d, d) for a 2d array
+            OR
+            tuple: Factored jacobian (A, W) with A.shape == (d, d) and W the
+                same shape as z; returned if factor == True
 
         """
-        ## Setup
-        dudz = self.density.copula.dudz(z)
-
-        x = self.z2x(z)
-        F = zeros(self.n_var_rand)
+        Z = atleast_2d(z)
+        ## Copula contribution
+        A, W = self.density.copula.dudz_factor(Z)
+        ## Marginal contribution
+        X = self.z2x(Z)
         for i in range(self.n_var_rand):
-            F[i] = 1 / self.density.marginals[self.var_rand[i]].l(x[i])
+            W[:, i] = W[:, i] / self.density.marginals[self.var_rand[i]].l(X[:, i])
+
+        if ndim(z) == 1:
+            W = W[0]
 
-        return dot(dudz, diag(F))
+        if factor:
+            return A, W
+        if ndim(W) == 1:
+            return A * W[newaxis, :]
+        return A[newaxis, :, :] * W[:, newaxis, :]
 
     ## Sample transforms; DataFrame
     # --------------------------------------------------
@@ -1219,9 +1875,7 @@ class Model:
         if not set(self.var_rand).issubset(set(df.columns)):
             raise ValueError("model.var_rand must be subset of df.columns")
 
-        data = zeros((df.shape[0], self.n_var_rand))
-        for i in range(df.shape[0]):
-            data[i] = self.x2z(df[self.var_rand].iloc[i].values)
+        data = self.x2z(df[self.var_rand].values)
 
         return DataFrame(data=data, columns=self.var_rand)
 
@@ -1243,9 +1897,7 @@ class Model:
         if not set(self.var_rand).issubset(set(df.columns)):
             raise ValueError("model.var_rand must be subset of df.columns")
 
-        data = zeros((df.shape[0], self.n_var_rand))
-        for i in range(df.shape[0]):
-            data[i] = self.z2x(df[self.var_rand].iloc[i].values)
+        data = self.z2x(df[self.var_rand].values)
 
         return DataFrame(data=data, columns=self.var_rand)
 
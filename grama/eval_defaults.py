@@ -9,11 +9,10 @@ __all__ = [
     "ev_conservative",
 ]
 
-from numpy import ones, eye, tile, atleast_2d
+from numpy import ones, eye, zeros, repeat, newaxis, concatenate, atleast_2d
 from pandas import DataFrame, concat
 import itertools
 
-import grama as gr
 from grama import add_pipe, pipe
 from toolz import curry
 
@@ -115,11 +114,22 @@ ev_nominal = add_pipe(eval_nominal)
 ## Gradient finite-difference evaluation
 # --------------------------------------------------
 @curry
-def eval_grad_fd(model, h=1e-8, df_base=None, var=None, append=True, skip=False):
+def eval_grad_fd(
+    model,
+    h=1e-8,
+    df_base=None,
+    var=None,
+    method="central",
+    use_jac=True,
+    append=True,
+    skip=False,
+):
     r"""Finite-difference gradient approximation
 
-    Evaluates a given model with a central-difference stencil to approximate the
-    gradient.
+    Evaluates a given model with a finite-difference stencil to approximate the
+    gradient. The stencil for all base points is assembled into a single
+    DataFrame and evaluated with one call to eval_df(). If every model function
+    provides an analytic jacobian, the exact gradient is computed instead.
 
     Args:
         model (gr.Model): Model to differentiate
@@ -128,6 +138,9 @@ def eval_grad_fd(model, h=1e-8, df_base=None, var=None, append=True, skip=False)
         df_base (DataFrame): Base-points for gradient calculations
         var (list(str) or string): list of variables to differentiate,
             or flag; "rand" for var_rand, "det" for var_det
+        method (str): Difference scheme; "central" uses 2 * n_var evaluations
+            per base point, "forward" uses n_var + 1
+        use_jac (bool): Use analytic jacobians, if available?
         append (bool): Append results to base point inputs?
         skip (bool): Skip evaluation of the functions?
 
@@ -145,6 +158,8 @@ def eval_grad_fd(model, h=1e-8, df_base=None, var=None, append=True, skip=False)
         >>> df_nom = md >> gr.ev_nominal(df_det="nom")
         >>> df_grad = md >> gr.ev_grad_fd(df_base=df_nom)
         >>> df_grad >> gr.tf_gather("var", "val", gr.everything())
+        >>> ## Forward differences; cheaper but less accurate
+        >>> md >> gr.ev_grad_fd(df_base=df_nom, method="forward", h=1e-6)
 
     """
     ## Check invariants
@@ -162,56 +177,54 @@ def eval_grad_fd(model, h=1e-8, df_base=None, var=None, append=True, skip=False)
     else:
         if not set(var).issubset(set(model.var)):
             raise ValueError("var must be subset of model.var")
+    if method not in ["central", "forward"]:
+        raise ValueError("method must be 'central' or 'forward'")
     var_fix = list(set(model.var).difference(set(var)))
 
-    ## TODO
-    if skip == True:
-        raise NotImplementedError("skip not implemented")
+    ## Use analytic derivatives, if available
+    if use_jac and model.has_jac and (not skip):
+        return model.evaluate_jac(df_base, var=var)
 
-    ## Build stencil
+    ## Build stencil; shape (n_base, n_stencil, n_var)
+    n_base = df_base.shape[0]
     n_var = len(var)
-    stencil = eye(n_var) * h
-    stepscale = tile(atleast_2d(0.5 / h).T, (1, model.n_out))
+    h = ones(n_var) * h
+    step = eye(n_var) * h
+    if method == "central":
+        offsets = concatenate((-step, +step), axis=0)
+    else:
+        offsets = concatenate((zeros((1, n_var)), step), axis=0)
+    n_stencil = offsets.shape[0]
+
+    X_base = df_base[var].values.astype(float)
+    X = X_base[:, newaxis, :] + offsets[newaxis, :, :]
 
+    df_stencil = DataFrame(data=X.reshape((n_base * n_stencil, n_var)), columns=var)
+    for v in var_fix:
+        df_stencil[v] = repeat(df_base[v].values, n_stencil)
+
+    if skip:
+        return df_stencil
+
+    ## Evaluate all base points at once
     outputs = model.out
+    df_res = eval_df(model, df=df_stencil, append=False)
+    Y = df_res[outputs].values.reshape((n_base, n_stencil, len(outputs)))
+
+    ## Compute differences; shape (n_base, n_var, n_out)
+    if method == "central":
+        dY = (Y[:, n_var:, :] - Y[:, :n_var, :]) / (2 * h[newaxis, :, newaxis])
+    else:
+        dY = (Y[:, 1:, :] - Y[:, [0], :]) / h[newaxis, :, newaxis]
+
     nested_labels = [
         list(map(lambda s_out: "D" + s_out + "_D" + s_var, outputs)) for s_var in var
     ]
     grad_labels = list(itertools.chain.from_iterable(nested_labels))
 
-    ## Loop over df_base
-    results = []  # TODO: Preallocate?
-    for row_i in range(df_base.shape[0]):
-        ## Evaluate
-        df_left = eval_df(
-            model,
-            gr.tran_outer(
-                DataFrame(
-                    columns=var, data=-stencil + df_base[var].iloc[[row_i]].values
-                ),
-                df_base[var_fix].iloc[[row_i]],
-            ),
-            append=False,
-        )
-
-        df_right = eval_df(
-            model,
-            gr.tran_outer(
-                DataFrame(
-                    columns=var, data=+stencil + df_base[var].iloc[[row_i]].values
-                ),
-                df_base[var_fix].iloc[[row_i]],
-            ),
-            append=False,
-        )
-
-        ## Compute differences
-        res = (stepscale * (df_right[outputs] - df_left[outputs]).values).flatten()
-        df_grad = DataFrame(columns=grad_labels, data=[res])
-
-        results.append(df_grad)
-
-    return concat(results).reset_index(drop=True)
+    return DataFrame(
+        data=dY.reshape((n_base, n_var * len(outputs))), columns=grad_labels
+    )
 
 
 ev_grad_fd = add_pipe(eval_grad_fd)
@@ -3,17 +3,194 @@ __all__ = [
     "ev_nls",
     "eval_min",
     "ev_min",
+    "eval_min_population",
+    "ev_min_population",
+    "eval_bayes_opt",
+    "ev_bayes_opt",
 ]
 
-from grama import add_pipe, pipe, custom_formatwarning, df_make
+from grama import add_pipe, pipe, custom_formatwarning, df_make, Model
 from grama import eval_df, eval_nominal, eval_monte_carlo
 from grama import comp_marginals, comp_copula_independence
-from grama import tran_outer
-from numpy import Inf, isfinite
+from numpy import Inf, isfinite, array, array_equal, atleast_2d, sqrt
+from numpy import finfo, maximum, where, diag, concatenate, newaxis, tile, repeat
+from numpy import arange, argsort, eye, clip, lexsort, log, exp, outer, ones, zeros
+from numpy import minimum, argmax, array_split, quantile
+from numpy.linalg import eigh
+from numpy.linalg import norm as length
+from numpy.random import random, randint, standard_normal
 from numpy.random import seed as setseed
 from pandas import DataFrame, concat
-from scipy.optimize import minimize
+from scipy.optimize import minimize, least_squares
+from scipy.stats import norm
 from toolz import curry
+from grama.tools import _fork_map
+
+## scipy.optimize.minimize methods that ignore gradient information
+_METHODS_NO_JAC = ("nelder-mead", "powell", "cobyla")
+## scipy.optimize.least_squares methods
+_METHODS_LSQ = ("trf", "dogbox", "lm")
+
+
+## Shared model evaluation
+# --------------------------------------------------
+def _make_point_cache(model, bounds):
+    r"""Share model evaluations between an objective and its constraints
+
+    Builds evaluators for the outputs and output gradients of a model at a
+    single point x (ordered as model.var). The most recent point is cached, so
+    an objective and any number of constraints trigger one model evaluation per
+    unique x. Gradients of all outputs are computed together; analytically if
+    model.has_jac, otherwise by forward differences evaluated as one batch
+    (steps flip sign at an upper bound).
+
+    Args:
+        model (gr.Model): Model to evaluate
+        bounds (list): (lower, upper) bounds for each entry of model.var
+
+    Returns:
+        function: value(x); dict of output values at x
+        function: grad(x); dict of output gradients at x
+
+    """
+    cache = {"x": None, "x_grad": None}
+    ub = array([b[1] if b[1] is not None else Inf for b in bounds], dtype=float)
+
+    def _eval(X):
+        df_res = eval_df(model, DataFrame(X, columns=model.var), append=False)
+        return df_res[model.out].values
+
+    def value(x):
+        if (cache["x"] is None) or (not array_equal(x, cache["x"])):
+            Y = _eval(atleast_2d(x))
+            cache["y"] = dict(zip(model.out, Y[0]))
+            cache["x"] = array(x, dtype=float, copy=True)
+        return cache["y"]
+
+    def grad(x):
+        if (cache["x_grad"] is not None) and array_equal(x, cache["x_grad"]):
+            return cache["grad"]
+
+        if model.has_jac:
+            df_out, J = model._jac_chain(DataFrame([x], columns=model.var), model.var)
+            y0 = df_out[model.out].values[0]
+            J = J[0]
+        else:
+            x = array(x, dtype=float)
+            h = sqrt(finfo(float).eps) * maximum(1, abs(x))
+            h = where(x + h > ub, -h, h)
+            ## Reuse the cached base point, if available
+            if (cache["x"] is not None) and array_equal(x, cache["x"]):
+                y0 = array([cache["y"][o] for o in model.out])
+                Y = _eval(x + diag(h))
+            else:
+                Y = _eval(concatenate((atleast_2d(x), x + diag(h)), axis=0))
+                y0, Y = Y[0], Y[1:]
+            J = ((Y - y0) / h[:, newaxis]).T
+
+        cache["x"] = array(x, dtype=float, copy=True)
+        cache["y"] = dict(zip(model.out, y0))
+        cache["x_grad"] = cache["x"]
+        cache["grad"] = dict(zip(model.out, J))
+
+        return cache["grad"]
+
+    return value, grad
+
+
+def _make_residual(model, df_base, df_data, var_fit, out, bounds):
+    r"""Residual vector and Jacobian for nonlinear least squares
+
+    Builds evaluators for the residuals between model outputs and data at a
+    parameter set x (ordered as var_fit). The design df_base holds the feature
+    and fixed variable levels for every observation and is built once; a batch
+    of K parameter sets is evaluated as a single model evaluation over K stacked
+    copies of the design. The Jacobian is analytic if model.has_jac, otherwise
+    forward differences in all parameters are evaluated as one batch (steps
+    flip sign at an upper bound), reusing the most recent residual.
+
+    Args:
+        model (gr.Model): Model to evaluate
+        df_base (DataFrame): Feature and fixed variable levels, one row per
+            observation in df_data
+        df_data (DataFrame): Observed outputs
+        var_fit (list): Variables to fit
+        out (list): Outputs contributing to the residual
+        bounds (list): (lower, upper) bounds for each entry of var_fit
+
+    Returns:
+        function: fun(x); residual vector of length n_obs * len(out)
+        function: jac(x); Jacobian of shape (n_obs * len(out), len(var_fit))
+
+    """
+    cache = {"x": None}
+    n_obs = df_base.shape[0]
+    Y_data = df_data[out].values
+    ind_out = [model.out.index(o) for o in out]
+    ub = array([b[1] if b[1] is not None else Inf for b in bounds], dtype=float)
+
+    def _design(X):
+        df_var = df_base.iloc[tile(arange(n_obs), X.shape[0])].reset_index(drop=True)
+        for j, var in enumerate(var_fit):
+            df_var[var] = repeat(X[:, j], n_obs)
+        return df_var
+
+    def _eval(X):
+        df_res = eval_df(model, df=_design(X), append=False)
+        R = df_res[out].values.reshape(X.shape[0], n_obs, len(out)) - Y_data
+        return R.reshape(X.shape[0], -1)
+
+    def fun(x):
+        if (cache["x"] is None) or (not array_equal(x, cache["x"])):
+            cache["r"] = _eval(atleast_2d(x))[0]
+            cache["x"] = array(x, dtype=float, copy=True)
+        return cache["r"]
+
+    def jac(x):
+        if model.has_jac:
+            df_res, J = model._jac_chain(_design(atleast_2d(x)), var_fit)
+            cache["r"] = (df_res[out].values - Y_data).ravel()
+            cache["x"] = array(x, dtype=float, copy=True)
+            return J[:, ind_out, :].reshape(-1, len(var_fit))
+
+        x = array(x, dtype=float)
+        h = sqrt(finfo(float).eps) * maximum(1, abs(x))
+        h = where(x + h > ub, -h, h)
+        R = _eval(x + diag(h))
+        return ((R - fun(x)) / h[:, newaxis]).T
+
+    return fun, jac
+
+
+## Early termination of restarts
+def _make_stop(n_agree, key, tol):
+    r"""Stop once n_agree successful restarts agree on the best optimum
+
+    Args:
+        n_agree (int or None): Number of agreeing restarts; None disables
+        key (str): Column holding the optimized objective value
+        tol (float): Relative tolerance for agreement
+
+    Returns:
+        function or None: Early termination rule for tools._fork_map
+
+    """
+    if n_agree is None:
+        return None
+    if n_agree < 1:
+        raise ValueError("n_agree must be a positive integer")
+
+    def stop(results):
+        f = [df[key].values[0] for df in results.values() if df["success"].values[0]]
+        if len(f) < n_agree:
+            return False
+        f_best = min(f)
+        n_best = sum(abs(fi - f_best) <= tol * maximum(1, abs(f_best)) for fi in f)
+
+        return n_best >= n_agree
+
+    return stop
+
 
 ## Nonlinear least squares
 # --------------------------------------------------
@@ -32,6 +209,8 @@ def eval_nls(
     n_restart=1,
     method="L-BFGS-B",
     seed=None,
+    n_jobs=None,
+    n_agree=None,
     verbose=True,
 ):
     r"""Estimate with Nonlinear Least Squares (NLS)
@@ -51,10 +230,19 @@ def eval_nls(
         df_init (DataFrame): Initial guesses for parameters; overrides n_restart
         append (bool): Append metadata? (Initial guess, MSE, optimizer status)
         tol (float): Optimizer convergence tolerance
-        n_maxiter (int): Optimizer maximum iterations
+        n_maxiter (int): Optimizer maximum iterations; maximum number of
+            residual evaluations for least-squares methods
         n_restart (int): Number of restarts; beyond n_restart=1 random
             restarts are used.
+        method (str): Optimization method; a scipy.optimize.minimize method
+            applied to the MSE, or one of "trf", "dogbox", "lm" to apply
+            scipy.optimize.least_squares to the residual vector. Method "lm"
+            requires unbounded fitting variables.
         seed (int OR None): Random seed for restarts
+        n_jobs (int OR None): Number of worker processes for restarts; None
+            runs restarts serially
+        n_agree (int OR None): Stop remaining restarts once n_agree successful
+            restarts agree on the best MSE (within tol); None runs all restarts
         verbose (bool): Print messages to console?
 
     Returns:
@@ -182,37 +370,71 @@ def eval_nls(
             )
             df_init = concat((df_init, df_rand[var_fit]), axis=0).reset_index(drop=True)
 
-    ## Iterate over initial guesses
-    df_res = DataFrame()
-    for i in range(n_restart):
-        x0 = df_init[var_fit].iloc[i].values
-        ## Build evaluator
-        def objective(x):
-            """x = [var_fit]"""
-            ## Evaluate model
-            df_var = tran_outer(
-                df_data[var_feat],
-                concat(
-                    (df_nom[var_fix].iloc[[0]], df_make(**dict(zip(var_fit, x)))),
-                    axis=1,
-                ),
+    ## Precompute the design of features and fixed levels
+    df_base = df_data[list(var_feat)].reset_index(drop=True)
+    for var in var_fix:
+        df_base[var] = df_nom[var].values[0]
+    residual, residual_jac = _make_residual(
+        model, df_base, df_data, var_fit, out, bounds
+    )
+
+    ## Select optimizer
+    use_lsq = method.lower() in _METHODS_LSQ
+    if use_lsq:
+        lb, ub = zip(*bounds) if len(bounds) > 0 else ((), ())
+        if (method.lower() == "lm") and any(isfinite(lb + ub)):
+            raise ValueError(
+                "method 'lm' does not support bounds; use 'trf' or 'dogbox'"
             )
-            df_tmp = eval_df(model, df=df_var)
 
+    ## Use analytic gradients, if available
+    use_jac = model.has_jac and (method.lower() not in _METHODS_NO_JAC)
+
+    ## Build evaluator
+    def objective(x):
+        """x = [var_fit]"""
+        if not use_jac:
             ## Compute joint MSE
-            return ((df_tmp[out].values - df_data[out].values) ** 2).mean()
+            return (residual(x) ** 2).mean()
 
-        ## Run optimization
-        res = minimize(
-            objective,
-            x0,
-            args=(),
-            method=method,
-            jac=False,
-            tol=tol,
-            options={"maxiter": n_maxiter, "disp": False, "ftol": ftol, "gtol": gtol,},
-            bounds=bounds,
-        )
+        ## Compute joint MSE and its gradient in one pass
+        J = residual_jac(x)
+        R = residual(x)
+
+        return (R ** 2).mean(), 2 * J.T.dot(R) / R.size
+
+    ## Run a single restart
+    def run(x0):
+        if use_lsq:
+            res = least_squares(
+                residual,
+                x0,
+                jac=residual_jac,
+                bounds=(lb, ub) if method.lower() != "lm" else (-Inf, Inf),
+                method=method.lower(),
+                ftol=ftol,
+                xtol=tol,
+                gtol=gtol,
+                max_nfev=n_maxiter,
+            )
+            res.nit = res.njev
+            res.fun = (res.fun ** 2).mean()
+        else:
+            res = minimize(
+                objective,
+                x0,
+                args=(),
+                method=method,
+                jac=use_jac,
+                tol=tol,
+                options={
+                    "maxiter": n_maxiter,
+                    "disp": False,
+                    "ftol": ftol,
+                    "gtol": gtol,
+                },
+                bounds=bounds,
+            )
 
         ## Package results
         df_tmp = df_make(
@@ -224,7 +446,12 @@ def eval_nls(
         df_tmp["n_iter"] = [res.nit]
         df_tmp["mse"] = [res.fun]
 
-        df_res = concat((df_res, df_tmp,), axis=0,).reset_index(drop=True)
+        return df_tmp
+
+    ## Iterate over initial guesses
+    X0 = list(df_init[var_fit].values[:n_restart])
+    rows = _fork_map(run, X0, n_jobs, stop=_make_stop(n_agree, "mse", tol))
+    df_res = concat(rows, axis=0).reset_index(drop=True)
 
     ## Post-process
     if append:
@@ -250,6 +477,8 @@ def eval_min(
     n_maxiter=50,
     seed=None,
     df_start=None,
+    n_jobs=None,
+    n_agree=None,
 ):
     r"""Constrained minimization using functions from a model
 
@@ -273,6 +502,11 @@ def eval_min(
             restarts are used.
         df_start (None or DataFrame): Specific starting values to use; overrides
             n_restart if non None provided.
+        n_jobs (int OR None): Number of worker processes for restarts; None
+            runs restarts serially
+        n_agree (int OR None): Stop remaining restarts once n_agree successful
+            restarts agree on the best objective value (within tol); None runs
+            all restarts
 
     Returns:
         DataFrame: Results of optimization
@@ -370,49 +604,63 @@ def eval_min(
     else:
         n_restart = df_start.shape[0]
 
+    ## Parse the bounds for minimize
+    bounds = list(map(lambda k: model.domain.bounds[k], model.var))
+
+    ## Objective and constraints share one model evaluation per point
+    value, grad = _make_point_cache(model, bounds)
+    use_jac = method.lower() not in _METHODS_NO_JAC
+
     ## Factory for wrapping model's output
     def make_fun(out, sign=+1):
         def fun(x):
-            df = DataFrame([x], columns=model.var)
-            df_res = eval_df(model, df)
-            return sign * df_res[out]
+            return sign * value(x)[out]
 
         return fun
 
+    ## Factory for wrapping model's gradient
+    def make_jac(out, sign=+1):
+        if not use_jac:
+            return None
+
+        def jac(x):
+            return sign * grad(x)[out]
+
+        return jac
+
     ## Create helper functions for constraints
     constraints = []
 
     if not (out_geq is None):
         for out in out_geq:
             constraints.append(
-                {"type": "ineq", "fun": make_fun(out),}
+                {"type": "ineq", "fun": make_fun(out), "jac": make_jac(out),}
             )
 
     if not (out_leq is None):
         for out in out_leq:
             constraints.append(
-                {"type": "ineq", "fun": make_fun(out, sign=-1),}
+                {
+                    "type": "ineq",
+                    "fun": make_fun(out, sign=-1),
+                    "jac": make_jac(out, sign=-1),
+                }
             )
 
     if not (out_eq is None):
         for out in out_eq:
             constraints.append(
-                {"type": "eq", "fun": make_fun(out),}
+                {"type": "eq", "fun": make_fun(out), "jac": make_jac(out),}
             )
 
-    ## Parse the bounds for minimize
-    bounds = list(map(lambda k: model.domain.bounds[k], model.var))
-
-    ## Run optimization
-    df_res = DataFrame()
-    for i in range(n_restart):
-        x0 = df_start[model.var].iloc[i].values
+    ## Run a single restart
+    def run(x0):
         res = minimize(
             make_fun(out_min),
             x0,
             args=(),
             method=method,
-            jac=False,
+            jac=make_jac(out_min),
             tol=tol,
             options={"maxiter": n_maxiter, "disp": False},
             constraints=constraints,
@@ -428,9 +676,595 @@ def eval_min(
         df_tmp["message"] = [res.message]
         df_tmp["n_iter"] = [res.nit]
 
-        df_res = concat((df_res, df_tmp), axis=0).reset_index(drop=True)
+        return df_tmp
 
-    return df_res
+    ## Run optimization
+    X0 = list(df_start[model.var].values[:n_restart])
+    rows = _fork_map(run, X0, n_jobs, stop=_make_stop(n_agree, out_min, tol))
 
+    return concat(rows, axis=0).reset_index(drop=True)
 
 ev_min = add_pipe(eval_min)
+
+
+## Population-based minimization
+# --------------------------------------------------
+def _de_generation(X, F, CR):
+    r"""DE/rand/1/bin trial vectors in normalized coordinates"""
+    n_pop, n_var = X.shape
+    ## Three distinct donors, none equal to the target
+    I = argsort(random((n_pop, n_pop)) + eye(n_pop), axis=1)[:, :3]
+    V = X[I[:, 0]] + F * (X[I[:, 1]] - X[I[:, 2]])
+    ## Binomial crossover; at least one coordinate from the mutant
+    mask = random((n_pop, n_var)) < CR
+    mask[arange(n_pop), randint(n_var, size=n_pop)] = True
+    U = where(mask, V, X)
+    ## Bounce back between the parent and a violated bound
+    U = where(U < 0, X * random((n_pop, n_var)), U)
+    U = where(U > 1, X + (1 - X) * random((n_pop, n_var)), U)
+
+    return U
+
+
+class _CMAES:
+    r"""(mu/mu_w, lambda)-CMA-ES state in normalized coordinates
+
+    References:
+        Hansen, "The CMA Evolution Strategy: A Tutorial" (2016)
+
+    """
+
+    def __init__(self, m, sigma, n_pop):
+        n = len(m)
+        self.n, self.m, self.sigma = n, array(m, dtype=float), sigma
+        self.mu = n_pop // 2
+        w = log(self.mu + 0.5) - log(arange(1, self.mu + 1))
+        self.w = w / w.sum()
+        self.mueff = 1 / (self.w ** 2).sum()
+        self.cc = (4 + self.mueff / n) / (n + 4 + 2 * self.mueff / n)
+        self.cs = (self.mueff + 2) / (n + self.mueff + 5)
+        self.c1 = 2 / ((n + 1.3) ** 2 + self.mueff)
+        self.cmu = minimum(
+            1 - self.c1,
+            2 * (self.mueff - 2 + 1 / self.mueff) / ((n + 2) ** 2 + self.mueff),
+        )
+        self.damps = 1 + 2 * maximum(0, sqrt((self.mueff - 1) / (n + 1)) - 1) + self.cs
+        self.chiN = sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n ** 2))
+        self.pc, self.ps = zeros(n), zeros(n)
+        self.C, self.B, self.D = eye(n), eye(n), ones(n)
+        self.gen = 0
+
+    def ask(self, n_pop):
+        Z = standard_normal((n_pop, self.n))
+        self.Y = (Z * self.D).dot(self.B.T)
+        return self.m + self.sigma * self.Y
+
+    def tell(self, order):
+        n, w = self.n, self.w
+        Y_sel = self.Y[order[: self.mu]]
+        y_w = w.dot(Y_sel)
+        self.m = self.m + self.sigma * y_w
+        self.gen += 1
+
+        ## Cumulation
+        C_isqrt = self.B.dot(diag(1 / self.D)).dot(self.B.T)
+        self.ps = (1 - self.cs) * self.ps + sqrt(
+            self.cs * (2 - self.cs) * self.mueff
+        ) * C_isqrt.dot(y_w)
+        hsig = length(self.ps) / sqrt(
+            1 - (1 - self.cs) ** (2 * self.gen)
+        ) / self.chiN < 1.4 + 2 / (n + 1)
+        self.pc = (1 - self.cc) * self.pc + hsig * sqrt(
+            self.cc * (2 - self.cc) * self.mueff
+        ) * y_w
+
+        ## Covariance and step-size adaptation
+        self.C = (
+            (1 - self.c1 - self.cmu) * self.C
+            + self.c1
+            * (outer(self.pc, self.pc) + (1 - hsig) * self.cc * (2 - self.cc) * self.C)
+            + self.cmu * (Y_sel.T * w).dot(Y_sel)
+        )
+        self.sigma *= exp((self.cs / self.damps) * (length(self.ps) / self.chiN - 1))
+
+        self.C = (self.C + self.C.T) / 2
+        D2, self.B = eigh(self.C)
+        self.D = sqrt(maximum(D2, 1e-30))
+
+    @property
+    def spread(self):
+        return self.sigma * self.D.max()
+
+
+@curry
+def eval_min_population(
+    model,
+    out_min=None,
+    out_geq=None,
+    out_leq=None,
+    out_eq=None,
+    method="de",
+    pop_size=None,
+    n_gen=100,
+    tol=1e-6,
+    tol_eq=1e-6,
+    F=0.8,
+    CR=0.9,
+    sigma0=0.3,
+    seed=None,
+    history=False,
+):
+    r"""Constrained minimization with a population-based optimizer
+
+    Perform constrained minimization using functions from a model with
+    differential evolution or CMA-ES. Each generation is submitted to the model
+    as a single DataFrame, so vectorized model functions evaluate a whole
+    population at once. Constraints are handled with feasibility rules: feasible
+    points are ranked by the objective, infeasible points by their total
+    constraint violation, and any feasible point beats any infeasible point.
+    Model must have deterministic variables only, with finite bounds.
+
+    Equality constraints are hard to satisfy by sampling, so when out_eq is
+    given the comparison uses an epsilon level: violations below a threshold
+    count as feasible, where the threshold starts at the violation of the best
+    fifth of the initial population and shrinks to zero over the first half of
+    the generations. The reported optimum always uses the exact violation.
+    CMA-ES with equality constraints tends to locate the optimum but may need
+    more than the default n_gen to report convergence; prefer "de" or raise
+    n_gen in that case.
+
+    Args:
+        model (gr.Model): Model to analyze. All model variables must be
+            deterministic and bounded.
+        out_min (str): Output to use as minimization objective.
+        out_geq (None OR list of str): Outputs to use as geq constraints; var >= 0
+        out_leq (None OR list of str): Outputs to use as leq constraints; var <= 0
+        out_eq (None OR list of str): Outputs to use as equality constraints; var == 0
+        method (str): Optimization method; "de" for differential evolution
+            (DE/rand/1/bin), "cmaes" for the covariance matrix adaptation
+            evolution strategy
+        pop_size (int or None): Points per generation; defaults to
+            max(15 * n_var, 20) for "de" and 4 + floor(3 log(n_var)) for "cmaes"
+        n_gen (int): Maximum number of generations
+        tol (float): Convergence tolerance; stop once a feasible population
+            agrees on the objective within tol (relative), or for "cmaes" once
+            the search distribution shrinks below tol (normalized by the bounds)
+        tol_eq (float): Tolerance for equality constraints
+        F (float): DE differential weight
+        CR (float): DE crossover probability
+        sigma0 (float): CMA-ES initial step size, relative to the bounds
+        seed (int OR None): Random seed
+        history (bool): Return the best point found after each generation,
+            rather than the optimum only? The last row is the optimum, and
+            carries the success and message of the run; earlier rows have None
+            in those columns.
+
+    Returns:
+        DataFrame: Results of optimization
+
+    Examples:
+        >>> import grama as gr
+        >>> md = (
+        >>>     gr.Model("Constrained Rosenbrock")
+        >>>     >> gr.cp_vec_function(
+        >>>         fun=lambda df: gr.df_make(
+        >>>             c=(1 - df.x)**2 + 100*(df.y - df.x**2)**2,
+        >>>             g1=(df.x - 1)**3 - df.y + 1,
+        >>>             g2=df.x + df.y - 2,
+        >>>         ),
+        >>>         var=["x", "y"],
+        >>>         out=["c", "g1", "g2"],
+        >>>     )
+        >>>     >> gr.cp_bounds(
+        >>>         x=(-1.5, +1.5),
+        >>>         y=(-0.5, +2.5),
+        >>>     )
+        >>> )
+        >>> md >> gr.ev_min_population(
+        >>>     out_min="c",
+        >>>     out_leq=["g1", "g2"],
+        >>>     method="cmaes",
+        >>>     seed=101,
+        >>> )
+
+    """
+    ## Check that model has only deterministic variables
+    if model.n_var_rand > 0:
+        raise ValueError("model must have no random variables")
+    ## Check that objective is in model
+    if not (out_min in model.out):
+        raise ValueError("model must contain out_min")
+    ## Check that constraints are in model
+    out_geq = [] if out_geq is None else list(out_geq)
+    out_leq = [] if out_leq is None else list(out_leq)
+    out_eq = [] if out_eq is None else list(out_eq)
+    out_diff = set(out_geq + out_leq + out_eq).difference(set(model.out))
+    if len(out_diff) > 0:
+        raise ValueError(
+            "model must contain each constraint; missing {}".format(out_diff)
+        )
+    ## Check method
+    method = method.lower()
+    if method not in ("de", "cmaes"):
+        raise ValueError("method must be 'de' or 'cmaes'; got {}".format(method))
+
+    ## Parse the bounds
+    n_var = model.n_var
+    lb = array([model.domain.get_bound(v)[0] for v in model.var], dtype=float)
+    ub = array([model.domain.get_bound(v)[1] for v in model.var], dtype=float)
+    if not all(isfinite(lb) & isfinite(ub)):
+        var_prob = [v for v, l, u in zip(model.var, lb, ub) if not isfinite(l + u)]
+        raise ValueError(
+            "all variables must have finite bounds; offending var = {}".format(var_prob)
+        )
+    wid = ub - lb
+
+    if pop_size is None:
+        if method == "de":
+            pop_size = max([15 * n_var, 20])
+        else:
+            pop_size = 4 + int(3 * log(n_var))
+    if pop_size < 4:
+        raise ValueError("pop_size must be at least 4")
+
+    if not (seed is None):
+        setseed(seed)
+
+    ## Evaluate a generation in one call; U holds normalized variables
+    def evaluate(U):
+        X = lb + clip(U, 0, 1) * wid
+        df_res = eval_df(model, df=DataFrame(X, columns=model.var), append=False)
+        f = df_res[out_min].values.astype(float)
+        v = (
+            maximum(0, -df_res[out_geq].values).sum(axis=1)
+            + maximum(0, df_res[out_leq].values).sum(axis=1)
+            + maximum(0, abs(df_res[out_eq].values) - tol_eq).sum(axis=1)
+        )
+        ## Penalize sampled points outside the bounds
+        v = v + length(U - clip(U, 0, 1), axis=1)
+        ## Treat failed evaluations as infeasible
+        fail = ~isfinite(f) | ~isfinite(v)
+        f[fail] = Inf
+        v[fail] = Inf
+
+        return X, df_res[model.out].values, f, v
+
+    ## Track the best point found so far
+    best = {"f": Inf, "v": Inf}
+    records = []
+
+    def update_best(X, Y, f, v, gen):
+        i = lexsort((f, v))[0]
+        if (v[i] < best["v"]) or ((v[i] == best["v"]) and (f[i] < best["f"])):
+            best.update(x=X[i], y=Y[i], f=f[i], v=v[i])
+        records.append(
+            dict(
+                **dict(zip(model.var, best["x"])),
+                **dict(zip(model.out, best["y"])),
+                gen=gen,
+                violation=best["v"],
+            )
+        )
+
+    def converged(f, v):
+        if not all(v == 0):
+            return False
+        return f.max() - f.min() <= tol * maximum(1, abs(f.min()))
+
+    ## Epsilon level for ranking; relaxes equality constraints early on
+    def relax(v, gen):
+        if (len(out_eq) == 0) or (gen >= n_gen_eps):
+            return v
+        return where(v <= eps0 * (1 - gen / n_gen_eps) ** 5, 0, v)
+
+    ## Initial generation
+    if method == "de":
+        U = random((pop_size, n_var))
+        X, Y, f, v = evaluate(U)
+    else:
+        es = _CMAES(random(n_var), sigma0, pop_size)
+        U = es.ask(pop_size)
+        X, Y, f, v = evaluate(U)
+    eps0 = quantile(v[isfinite(v)], 0.2) if any(isfinite(v)) else 0
+    n_gen_eps = max([n_gen // 2, 1])
+    if method == "cmaes":
+        es.tell(lexsort((f, relax(v, 0))))
+    update_best(X, Y, f, v, 0)
+
+    ## Evolve
+    message = "Maximum number of generations reached"
+    success = False
+    for gen in range(1, n_gen + 1):
+        if converged(f, v):
+            message = "Population converged"
+            success = True
+            break
+
+        if method == "de":
+            U_trial = _de_generation(U, F, CR)
+            X_t, Y_t, f_t, v_t = evaluate(U_trial)
+            ## Pairwise selection by feasibility rules
+            v_r, v_t_r = relax(v, gen), relax(v_t, gen)
+            keep = (v_t_r < v_r) | ((v_t_r == v_r) & (f_t <= f))
+            U = where(keep[:, newaxis], U_trial, U)
+            X = where(keep[:, newaxis], X_t, X)
+            f, v = where(keep, f_t, f), where(keep, v_t, v)
+            update_best(X_t, Y_t, f_t, v_t, gen)
+        else:
+            if es.spread < tol:
+                message = "Search distribution converged"
+                success = True
+                break
+            U = es.ask(pop_size)
+            X, Y, f, v = evaluate(U)
+            es.tell(lexsort((f, relax(v, gen))))
+            update_best(X, Y, f, v, gen)
+
+    df_hist = DataFrame(records)
+    success = success and (best["v"] == 0)
+    message = message if best["v"] == 0 else "No feasible point found"
+    if history:
+        ## Report the outcome of the run on its final row, the optimum
+        n_hist = df_hist.shape[0]
+        df_hist["success"] = [None] * (n_hist - 1) + [success]
+        df_hist["message"] = [None] * (n_hist - 1) + [message]
+        return df_hist
+
+    df_res = df_hist.iloc[[-1]].drop(columns=["violation"]).reset_index(drop=True)
+    df_res = df_res.rename(columns={"gen": "n_iter"})
+    df_res["success"] = [success]
+    df_res["message"] = [message]
+
+    return df_res[model.var + model.out + ["success", "message", "n_iter"]]
+
+
+ev_min_population = add_pipe(eval_min_population)
+
+
+## Bayesian optimization
+# --------------------------------------------------
+def _expected_improvement(mu, sd, f_best):
+    r"""Expected improvement below f_best of a normal prediction"""
+    sd = maximum(sd, 1e-300)
+    z = (f_best - mu) / sd
+    return where(sd > 1e-300, (f_best - mu) * norm.cdf(z) + sd * norm.pdf(z), 0)
+
+
+@curry
+def eval_bayes_opt(
+    model,
+    out_min=None,
+    out_geq=None,
+    out_leq=None,
+    n_init=None,
+    n_iter=10,
+    batch=1,
+    ft=None,
+    n_cand=1000,
+    n_jobs=None,
+    seed=None,
+    history=False,
+):
+    r"""Constrained minimization with batch Bayesian optimization
+
+    Minimize an expensive model output with few evaluations. Gaussian process
+    surrogates for the objective and each constraint are fit to all evaluations
+    so far; each round selects `batch` new points by maximizing expected
+    improvement weighted by the probability of feasibility. Points after the
+    first in a round are chosen with the kriging believer heuristic: the
+    surrogates are refit with the predicted means at the points already chosen.
+    Hyperparameters are fit once per round; believer refits of gaussian process
+    surrogates keep that round's kernels fixed, while other surrogates are refit
+    with ft.
+    Each batch is evaluated in one call, optionally split across processes.
+    Model must have deterministic variables only, with finite bounds.
+
+    Args:
+        model (gr.Model): Model to analyze. All model variables must be
+            deterministic and bounded.
+        out_min (str): Output to use as minimization objective.
+        out_geq (None OR list of str): Outputs to use as geq constraints; var >= 0
+        out_leq (None OR list of str): Outputs to use as leq constraints; var <= 0
+        n_init (int or None): Size of the initial Latin hypercube design;
+            defaults to max(2 * n_var + 1, 5)
+        n_iter (int): Number of rounds after the initial design
+        batch (int): Points evaluated per round
+        ft (gr.ft_ or None): Partially-evaluated fit function for the
+            surrogates. Given evaluations with columns model.var and the
+            objective and constraint outputs, it must return a model with
+            outputs `{out}_mean` and `{out}_sd`. Defaults to gr.fit.ft_gp.
+        n_cand (int): Random candidates per acquisition search; the best is
+            polished with L-BFGS-B
+        n_jobs (int or None): Number of worker processes for evaluating each
+            batch; None evaluates each batch in a single call
+        seed (int OR None): Random seed
+        history (bool): Return every evaluated point, rather than the optimum
+            only? Column `round` gives the round of each evaluation, with 0
+            for the initial design.
+
+    Returns:
+        DataFrame: Results of optimization
+
+    References:
+        Jones, Schonlau, and Welch, "Efficient Global Optimization of Expensive Black-Box Functions" (1998) Journal of Global Optimization
+        Ginsbourger, Le Riche, and Carraro, "Kriging is well-suited to parallelize optimization" (2010) Computational Intelligence in Expensive Optimization Problems
+
+    Examples:
+        >>> import grama as gr
+        >>> md = (
+        >>>     gr.Model("Constrained bowl")
+        >>>     >> gr.cp_vec_function(
+        >>>         fun=lambda df: gr.df_make(
+        >>>             f=df.x**2 + df.y**2,
+        >>>             g=df.x + df.y + 1,
+        >>>         ),
+        >>>         var=["x", "y"],
+        >>>         out=["f", "g"],
+        >>>     )
+        >>>     >> gr.cp_bounds(x=(-1, +1), y=(-1, +1))
+        >>> )
+        >>> md >> gr.ev_bayes_opt(
+        >>>     out_min="f",
+        >>>     out_geq=["g"],
+        >>>     n_iter=10,
+        >>>     batch=2,
+        >>>     seed=101,
+        >>> )
+
+    """
+    ## Check that model has only deterministic variables
+    if model.n_var_rand > 0:
+        raise ValueError("model must have no random variables")
+    ## Check that objective is in model
+    if not (out_min in model.out):
+        raise ValueError("model must contain out_min")
+    ## Check that constraints are in model
+    out_geq = [] if out_geq is None else list(out_geq)
+    out_leq = [] if out_leq is None else list(out_leq)
+    out_diff = set(out_geq + out_leq).difference(set(model.out))
+    if len(out_diff) > 0:
+        raise ValueError(
+            "model must contain each constraint; missing {}".format(out_diff)
+        )
+    if batch < 1:
+        raise ValueError("batch must be a positive integer")
+
+    ## Parse the bounds
+    n_var = model.n_var
+    lb = array([model.domain.get_bound(v)[0] for v in model.var], dtype=float)
+    ub = array([model.domain.get_bound(v)[1] for v in model.var], dtype=float)
+    if not all(isfinite(lb) & isfinite(ub)):
+        var_prob = [v for v, l, u in zip(model.var, lb, ub) if not isfinite(l + u)]
+        raise ValueError(
+            "all variables must have finite bounds; offending var = {}".format(var_prob)
+        )
+    wid = ub - lb
+
+    out_fit = [out_min] + out_geq + out_leq
+    if ft is None:
+        from grama.fit import ft_gp
+
+        ft = ft_gp(var=model.var, out=out_fit, seed=seed)
+    if n_init is None:
+        n_init = max([2 * n_var + 1, 5])
+
+    if not (seed is None):
+        setseed(seed)
+
+    ## Evaluate a batch of points; U holds normalized variables
+    def evaluate(U, i_round):
+        df_x = DataFrame(lb + U * wid, columns=model.var)
+        n_chunk = 1 if n_jobs is None else min([n_jobs, df_x.shape[0]])
+        chunks = [df_x.iloc[I] for I in array_split(arange(df_x.shape[0]), n_chunk)]
+        rows = _fork_map(
+            lambda df: eval_df(model, df=df.reset_index(drop=True)), chunks, n_jobs
+        )
+        df_res = concat(rows, axis=0).reset_index(drop=True)
+        df_res["round"] = i_round
+
+        return df_res
+
+    ## Total constraint violation of evaluated points
+    def violation(df):
+        return maximum(0, -df[out_geq].values).sum(axis=1) + maximum(
+            0, df[out_leq].values
+        ).sum(axis=1)
+
+    ## Acquisition; expected improvement times probability of feasibility
+    def acquisition(md_fit, U, f_best):
+        df_pred = eval_df(
+            md_fit,
+            df=DataFrame(lb + atleast_2d(U) * wid, columns=model.var),
+            append=False,
+        )
+        pof = ones(df_pred.shape[0])
+        for out in out_geq:
+            mu, sd = df_pred[out + "_mean"].values, df_pred[out + "_sd"].values
+            pof = pof * norm.cdf(mu / maximum(sd, 1e-300))
+        for out in out_leq:
+            mu, sd = df_pred[out + "_mean"].values, df_pred[out + "_sd"].values
+            pof = pof * norm.cdf(-mu / maximum(sd, 1e-300))
+        if f_best is None:
+            return pof
+
+        mu, sd = df_pred[out_min + "_mean"].values, df_pred[out_min + "_sd"].values
+        return _expected_improvement(mu, sd, f_best) * pof
+
+    ## Maximize acquisition by random search, polished with L-BFGS-B
+    def propose(md_fit, f_best):
+        U = random((n_cand, n_var))
+        u0 = U[argmax(acquisition(md_fit, U, f_best))]
+        res = minimize(
+            lambda u: -acquisition(md_fit, u, f_best)[0],
+            u0,
+            method="L-BFGS-B",
+            bounds=[(0, 1)] * n_var,
+        )
+        if -res.fun > acquisition(md_fit, u0, f_best)[0]:
+            return res.x
+        return u0
+
+    ## Initial Latin hypercube design
+    U = (argsort(random((n_var, n_init)), axis=1).T + random((n_init, n_var))) / n_init
+    df_data = evaluate(U, 0)
+
+    ## Optimization rounds
+    for i_round in range(1, n_iter + 1):
+        v = violation(df_data)
+        f = df_data[out_min].values
+        f_best = f[v == 0].min() if any(v == 0) else None
+
+        df_fit = df_data[model.var + out_fit]
+        md_round = df_fit >> ft
+        ## Believer refits reuse this round's kernels, if the surrogate allows
+        refit = all(hasattr(fun, "refit") for fun in md_round.functions)
+        U_batch = []
+        for k in range(batch):
+            if k == 0:
+                md_fit = md_round
+            elif refit:
+                md_fit = Model(
+                    functions=[fun.refit(df_fit) for fun in md_round.functions],
+                    domain=md_round.domain,
+                    density=md_round.density,
+                )
+            else:
+                md_fit = df_fit >> ft
+            u = propose(md_fit, f_best)
+            U_batch.append(u)
+            if k < batch - 1:
+                ## Kriging believer; treat the predicted mean as observed
+                df_pred = eval_df(
+                    md_fit, df=DataFrame([lb + u * wid], columns=model.var)
+                )
+                df_fit = concat(
+                    (
+                        df_fit,
+                        df_pred[model.var].assign(
+                            **{o: df_pred[o + "_mean"].values for o in out_fit}
+                        ),
+                    ),
+                    axis=0,
+                ).reset_index(drop=True)
+
+        df_data = concat(
+            (df_data, evaluate(array(U_batch), i_round)), axis=0
+        ).reset_index(drop=True)
+
+    if history:
+        return df_data
+
+    ## Select the best feasible point; least infeasible otherwise
+    v = violation(df_data)
+    i_best = lexsort((df_data[out_min].values, v))[0]
+    df_res = df_data.iloc[[i_best]][model.var + model.out].reset_index(drop=True)
+    df_res["success"] = [v[i_best] == 0]
+    df_res["message"] = [
+        "Evaluation budget exhausted" if v[i_best] == 0 else "No feasible point found"
+    ]
+    df_res["n_iter"] = [n_iter]
+
+    return df_res
+
+
+ev_bayes_opt = add_pipe(eval_bayes_opt)
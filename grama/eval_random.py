@@ -1,37 +1,281 @@
 __all__ = [
     "eval_monte_carlo",
     "ev_monte_carlo",
+    "SummaryAccumulator",
+    "eval_monte_carlo_adaptive",
+    "ev_monte_carlo_adaptive",
+    "eval_qmc",
+    "ev_qmc",
+    "eval_lhs",
+    "ev_lhs",
+    "eval_multifidelity",
+    "ev_multifidelity",
     "eval_sinews",
     "ev_sinews",
+    "eval_morris",
+    "ev_morris",
     "eval_hybrid",
     "ev_hybrid",
 ]
 
-from numpy import tile, linspace, zeros, isfinite
-from numpy.random import random
+from numpy import tile, linspace, zeros, isfinite, repeat, arange, argsort, argmin
+from numpy import fill_diagonal, inf, sqrt, floor, ceil, sort, clip
+from numpy import asarray, ones, concatenate, cumsum, arcsin, pi, unique, bincount
+from numpy import interp, errstate, tril, take_along_axis, argmax, newaxis, empty
+from numpy.random import random, randint, SeedSequence, default_rng
 from numpy.random import seed as set_seed
-from pandas import DataFrame
+from pandas import DataFrame, concat
 
 import warnings
 
+from copy import deepcopy
+from time import perf_counter
+
 import grama as gr
 from grama import add_pipe, pipe, custom_formatwarning
 from scipy.stats import norm, lognorm
+from scipy.spatial.distance import cdist
 from toolz import curry
 from numpy.linalg import cholesky, inv
 from numbers import Integral
 
 warnings.formatwarning = custom_formatwarning
 
+## Streaming summaries
+# --------------------------------------------------
+def _wilson(n_s, n, z):
+    ## Wilson interval half-width; see binomial_ci()
+    return z / (n + z ** 2) * sqrt(n_s * (n - n_s) / n + 0.25 * z ** 2)
+
+
+class _TDigest:
+    ## Merging t-digest quantile sketch; Dunning and Ertl (2019). Centroids
+    ## are grouped by unit steps of the arcsine scale function, which keeps
+    ## the tails at fine resolution within a bounded size (~delta/2).
+    def __init__(self, delta=1000):
+        self.delta = delta
+        self.means = zeros(0)
+        self.weights = zeros(0)
+        self.min = inf
+        self.max = -inf
+
+    def update(self, values, weights=None):
+        values = asarray(values, dtype=float).ravel()
+        if len(values) == 0:
+            return self
+        if weights is None:
+            weights = ones(len(values))
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+
+        m = concatenate((self.means, values))
+        w = concatenate((self.weights, weights))
+        order = argsort(m, kind="mergesort")
+        m, w = m[order], w[order]
+
+        ## Group by scale function of mid-point quantile
+        cw = cumsum(w)
+        q = (cw - w / 2) / cw[-1]
+        k = floor(self.delta / (2 * pi) * arcsin(2 * q - 1))
+        _, group = unique(k, return_inverse=True)
+        self.weights = bincount(group, weights=w)
+        self.means = bincount(group, weights=w * m) / self.weights
+
+        return self
+
+    def merge(self, other):
+        new = deepcopy(self)
+        new.update(other.means, other.weights)
+        new.min = min(self.min, other.min)
+        new.max = max(self.max, other.max)
+
+        return new
+
+    def quantile(self, q):
+        cw = cumsum(self.weights)
+        c = (cw - self.weights / 2) / cw[-1]
+        return interp(
+            q,
+            concatenate(([0], c, [1])),
+            concatenate(([self.min], self.means, [self.max])),
+        )
+
+
+class SummaryAccumulator:
+    """Mergeable summary of model outputs
+
+    Accumulates summary statistics of model outputs chunk-by-chunk, without
+    storing the samples: Moments (Welford), failure counts (outputs <= 0),
+    and a t-digest quantile sketch. Accumulators built on separate chunks
+    (e.g. by parallel workers) combine with merge().
+
+    Examples:
+
+        >>> import grama as gr
+        >>> from grama.models import make_cantilever_beam
+        >>> md = make_cantilever_beam()
+        >>> acc1 = gr.SummaryAccumulator(md.out).update(
+        >>>     md >> gr.ev_monte_carlo(n=1e3, df_det="nom", seed=101)
+        >>> )
+        >>> acc2 = gr.SummaryAccumulator(md.out).update(
+        >>>     md >> gr.ev_monte_carlo(n=1e3, df_det="nom", seed=102)
+        >>> )
+        >>> acc1.merge(acc2).summary()
+
+    """
+
+    def __init__(self, out, quantiles=(0.05, 0.5, 0.95), delta=1000):
+        """Constructor
+
+        Args:
+            out (list of str): Outputs to summarize
+            quantiles (list of float): Quantile levels to report; values in
+                [0, 1]
+            delta (int): Compression of quantile sketch; larger values are
+                more accurate
+
+        Returns:
+            gr.SummaryAccumulator: Empty accumulator
+
+        """
+        self.out = list(out)
+        self.quantiles = list(quantiles)
+        self.n = 0
+        self.mean = zeros(len(self.out))
+        self.M2 = zeros(len(self.out))
+        self.n_fail = zeros(len(self.out))
+        self.digests = [_TDigest(delta=delta) for o in self.out]
+
+    def _combine(self, n, mean, M2):
+        ## Pairwise moment update; Chan, Golub, and LeVeque (1983)
+        n_total = self.n + n
+        delta = mean - self.mean
+        self.mean = self.mean + delta * n / n_total
+        self.M2 = self.M2 + M2 + delta ** 2 * self.n * n / n_total
+        self.n = n_total
+
+    def update(self, df):
+        """Add a chunk of samples
+
+        Args:
+            df (DataFrame): Samples; must contain the accumulator's outputs
+
+        Returns:
+            gr.SummaryAccumulator: Self, updated
+
+        """
+        X = df[self.out].values.astype(float)
+        if X.shape[0] == 0:
+            return self
+
+        mean = X.mean(axis=0)
+        self._combine(X.shape[0], mean, ((X - mean) ** 2).sum(axis=0))
+        self.n_fail = self.n_fail + (X <= 0).sum(axis=0)
+        for i, digest in enumerate(self.digests):
+            digest.update(X[:, i])
+
+        return self
+
+    def merge(self, other):
+        """Combine with another accumulator
+
+        Args:
+            other (gr.SummaryAccumulator): Accumulator with the same outputs
+
+        Returns:
+            gr.SummaryAccumulator: New accumulator summarizing both
+
+        """
+        if other.out != self.out:
+            raise ValueError("Accumulators must summarize the same outputs")
+
+        new = deepcopy(self)
+        if other.n > 0:
+            new._combine(other.n, other.mean, other.M2)
+            new.n_fail = self.n_fail + other.n_fail
+            new.digests = [d.merge(e) for d, e in zip(self.digests, other.digests)]
+
+        return new
+
+    def summary(self, alpha=0.05):
+        """Summary table
+
+        Args:
+            alpha (float): Significance level; intervals have 1 - alpha
+                coverage. Value in (0, 1)
+
+        Returns:
+            DataFrame: One row per output, with the sample count, mean,
+                standard deviation, probability of failure (fraction of
+                outputs <= 0) and its Wilson interval, and quantiles.
+
+        """
+        if self.n == 0:
+            raise ValueError("Accumulator is empty")
+
+        z = -norm.ppf(alpha / 2)
+        pof = self.n_fail / self.n
+        mid = (self.n_fail + 0.5 * z ** 2) / (self.n + z ** 2)
+        delta = _wilson(self.n_fail, self.n, z)
+
+        df_summary = DataFrame(
+            {
+                "out": self.out,
+                "n": self.n,
+                "mean": self.mean,
+                "sd": sqrt(self.M2 / max(self.n - 1, 1)),
+                "pof": pof,
+                "pof_lo": mid - delta,
+                "pof_up": mid + delta,
+            }
+        )
+        for q in self.quantiles:
+            df_summary["q{}".format(q)] = [d.quantile(q) for d in self.digests]
+
+        return df_summary
+
+
+def _eval_summarize(model, draw, n, n_chunk, df_det, summarize):
+    ## Evaluate in chunks, accumulate outputs, and discard samples
+    if summarize is True:
+        acc = SummaryAccumulator(model.out)
+    else:
+        acc = SummaryAccumulator(model.out, quantiles=summarize)
+
+    n_done = 0
+    while n_done < n:
+        n_c = min(n_chunk, n - n_done)
+        df_samp = model.var_outer(draw(n_c), df_det=df_det)
+        if df_samp.shape[0] != n_c:
+            raise ValueError("summarize requires a single deterministic level")
+        acc.update(gr.eval_df(model, df=df_samp, append=False))
+        n_done += n_c
+
+    return acc.summary()
+
+
 ## Simple Monte Carlo
 # --------------------------------------------------
 @curry
-def eval_monte_carlo(model, n=1, df_det=None, seed=None, append=True, skip=False):
+def eval_monte_carlo(
+    model,
+    n=1,
+    df_det=None,
+    seed=None,
+    append=True,
+    skip=False,
+    summarize=None,
+    n_chunk=10000,
+):
     r"""Monte Carlo evaluation
 
     Evaluates a given model at a given dataframe. Generates outer product
     with deterministic samples.
 
+    With summarize, samples are drawn and evaluated in chunks and reduced to
+    summary statistics (see SummaryAccumulator), so memory use does not grow
+    with n.
+
     Args:
         model (gr.Model): Model to evaluate
         n (numeric): number of Monte Carlo samples to draw
@@ -39,10 +283,16 @@ def eval_monte_carlo(model, n=1, df_det=None, seed=None, append=True, skip=False
             for nominal deterministic levels.
         seed (int): random seed to use
         append (bool): Append results to random values?
-        skip (bool): Skip evaluation of the functions?
+        skip (bool): Skip evaluation of the functions? Ignored with summarize
+        summarize (bool or list of float): Return a summary of the outputs
+            rather than the samples? Pass a list of quantile levels to
+            report; True reports the 5%, 50%, and 95% quantiles. Requires a
+            single deterministic level.
+        n_chunk (int): Number of samples per chunk when summarizing
 
     Returns:
-        DataFrame: Results of evaluation or unevaluated design
+        DataFrame: Results of evaluation or unevaluated design; summary of
+            outputs if summarize
 
     Examples:
 
@@ -51,6 +301,8 @@ def eval_monte_carlo(model, n=1, df_det=None, seed=None, append=True, skip=False
         >>> md = make_test()
         >>> df = md >> gr.ev_monte_carlo(n=1e2, df_det="nom")
         >>> df.describe()
+        >>> ## Summarize without storing samples
+        >>> md >> gr.ev_monte_carlo(n=1e6, df_det="nom", summarize=[0.01, 0.99])
 
     """
     ## Set seed only if given
@@ -62,6 +314,16 @@ def eval_monte_carlo(model, n=1, df_det=None, seed=None, append=True, skip=False
         print("eval_monte_carlo() is rounding n...")
         n = int(n)
 
+    if summarize:
+        return _eval_summarize(
+            model,
+            lambda n_c: model.density.sample(n=n_c),
+            n,
+            n_chunk,
+            df_det,
+            summarize,
+        )
+
     ## Draw samples
     df_rand = model.density.sample(n=n, seed=seed)
     ## Construct outer-product DOE
@@ -101,6 +363,657 @@ def eval_monte_carlo(model, n=1, df_det=None, seed=None, append=True, skip=False
 
 ev_monte_carlo = add_pipe(eval_monte_carlo)
 
+## Adaptive Monte Carlo
+# --------------------------------------------------
+def _mc_estimate(values, stat, z):
+    ## Point estimate and CI half-width of a Monte Carlo statistic
+    n = len(values)
+    if stat == "mean":
+        return values.mean(), z * values.std(ddof=1) / sqrt(n)
+    if stat == "pof":
+        n_s = (values <= 0).sum()
+        return n_s / n, _wilson(n_s, n, z)
+    if stat.startswith("q"):
+        ## Distribution-free interval from order statistics
+        q = float(stat[1:])
+        x = sort(values)
+        w = z * sqrt(n * q * (1 - q))
+        i_lo = int(clip(floor(n * q - w) - 1, 0, n - 1))
+        i_up = int(clip(ceil(n * q + w) - 1, 0, n - 1))
+        return x[int(clip(ceil(n * q) - 1, 0, n - 1))], (x[i_up] - x[i_lo]) / 2
+
+    raise ValueError("stat {} not recognized".format(stat))
+
+
+@curry
+def eval_monte_carlo_adaptive(
+    model,
+    target=None,
+    n_batch=100,
+    max_n=10000,
+    alpha=0.05,
+    df_det=None,
+    seed=None,
+    append=True,
+):
+    r"""Adaptive Monte Carlo evaluation
+
+    Evaluates a given model on Monte Carlo samples drawn in batches, until
+    every target statistic is estimated to a desired precision: Sampling
+    stops once each confidence interval half-width falls below its target,
+    or after max_n samples.
+
+    Args:
+        model (gr.Model): Model to evaluate
+        target (dict): Precision targets; keys are outputs, values are dicts
+            of {stat: half-width}. Available stats are:
+            - "mean": Mean of the output
+            - "pof": Probability of failure; fraction of output values <= 0
+            - "q[level]": Quantile at level, e.g. "q0.9" for the 90% quantile
+        n_batch (int): Number of samples per batch
+        max_n (int): Maximum total number of samples
+        alpha (float): Significance level; intervals have confidence level
+            1 - alpha. Value in (0, 1)
+        df_det (DataFrame): Deterministic levels for evaluation; use "nom"
+            for nominal deterministic levels. Must be a single level.
+        seed (int): random seed to use
+        append (bool): Append results to random values?
+
+    Returns:
+        tuple: (DataFrame, DataFrame)
+            - Results of evaluation
+            - Convergence history; one row per batch and target, with the
+              sample size, estimate, and CI half-width
+
+    Examples:
+
+        >>> import grama as gr
+        >>> from grama.models import make_cantilever_beam
+        >>> md = make_cantilever_beam()
+        >>> df_res, df_hist = gr.eval_monte_carlo_adaptive(
+        >>>     md,
+        >>>     target={"g_stress": {"pof": 0.005}, "g_disp": {"mean": 0.01}},
+        >>>     df_det="nom",
+        >>>     seed=101,
+        >>> )
+        >>> df_hist >> gr.tf_filter(gr.X.n == gr.colmax(gr.X.n))
+
+    """
+    if not target:
+        raise ValueError("Must provide at least one target")
+    for out, stats in target.items():
+        if out not in model.out:
+            raise ValueError("target output {} not in model.out".format(out))
+        for stat in stats.keys():
+            if stat in ("mean", "pof"):
+                continue
+            try:
+                q = float(stat[1:]) if stat.startswith("q") else None
+            except ValueError:
+                q = None
+            if (q is None) or not (0 < q < 1):
+                raise ValueError("stat {} not recognized".format(stat))
+
+    ## Set seed only if given
+    if seed is not None:
+        set_seed(seed)
+
+    ## Ensure sample counts are int
+    n_batch = int(n_batch)
+    max_n = int(max_n)
+    z = -norm.ppf(alpha / 2)
+
+    ## Batches are joined once at the end; target outputs go to flat buffers
+    dfs_res = []
+    values_all = {out: empty(max_n) for out in target.keys()}
+    n_all = 0
+    rows_hist = []
+    converged = False
+    while (not converged) and (n_all < max_n):
+        ## Draw and evaluate a batch
+        n = min(n_batch, max_n - n_all)
+        df_rand = model.density.sample(n=n)
+        df_samp = model.var_outer(df_rand, df_det=df_det)
+        if df_samp.shape[0] != n:
+            raise ValueError(
+                "eval_monte_carlo_adaptive() requires a single deterministic level"
+            )
+        df_res = gr.eval_df(model, df=df_samp, append=append)
+        dfs_res.append(df_res)
+        for out in target.keys():
+            values_all[out][n_all : n_all + n] = df_res[out].values
+        n_all += n
+
+        ## Update estimates
+        converged = True
+        for out, stats in target.items():
+            values = values_all[out][:n_all]
+            for stat, hw_target in stats.items():
+                est, hw = _mc_estimate(values, stat, z)
+                converged = converged and (hw <= hw_target)
+                rows_hist.append(
+                    {
+                        "n": n_all,
+                        "out": out,
+                        "stat": stat,
+                        "est": est,
+                        "hw": hw,
+                        "hw_target": hw_target,
+                    }
+                )
+
+    if not converged:
+        warnings.warn(
+            "eval_monte_carlo_adaptive() reached max_n before meeting all targets",
+            RuntimeWarning,
+        )
+
+    df_all = concat(dfs_res, axis=0, ignore_index=True)
+
+    return df_all, DataFrame(rows_hist)
+
+
+ev_monte_carlo_adaptive = add_pipe(eval_monte_carlo_adaptive)
+
+## Quasi-Monte Carlo
+# --------------------------------------------------
+@curry
+def eval_qmc(
+    model,
+    n=1,
+    df_det=None,
+    engine="sobol",
+    scramble=True,
+    seed=None,
+    n_rep=1,
+    start=0,
+    repname="qmc_rep",
+    append=True,
+    skip=False,
+    summarize=None,
+    n_chunk=10000,
+):
+    r"""Quasi-Monte Carlo evaluation
+
+    Evaluates a given model on a low-discrepancy (quasi-random) sample of its
+    joint density. Unit-cube points are mapped through the model's copula and
+    marginals. Generates outer product with deterministic samples.
+
+    For smooth responses, QMC estimates of moments converge faster than simple
+    Monte Carlo. Use n_rep > 1 to draw independently-scrambled replicates
+    (randomized QMC); the spread of an estimate across replicates gives an
+    error estimate.
+
+    Args:
+        model (gr.Model): Model to evaluate
+        n (numeric): Number of QMC samples to draw (per replicate); use a power
+            of 2 with engine="sobol" to retain balance properties
+        df_det (DataFrame): Deterministic levels for evaluation; use "nom"
+            for nominal deterministic levels.
+        engine (str): Low-discrepancy sequence; "sobol" or "halton"
+        scramble (bool): Randomly scramble the sequence? Required for n_rep > 1
+        seed (int): Random seed for scrambling
+        n_rep (int): Number of randomized replicates
+        start (int): Index of first point to draw from the sequence; with a
+            fixed seed, successive calls with start=0, n, 2n, ... stream
+            consecutive chunks of the same sequence
+        repname (str): Column name for replicate index; only added if n_rep > 1
+        append (bool): Append results to random values?
+        skip (bool): Skip evaluation of the functions? Ignored with summarize
+        summarize (bool or list of float): Return a summary of the outputs
+            rather than the samples; one summary per replicate. See
+            eval_monte_carlo()
+        n_chunk (int): Number of samples per chunk when summarizing
+
+    Returns:
+        DataFrame: Results of evaluation or unevaluated design; summary of
+            outputs if summarize
+
+    Notes:
+        - Wrapper on scipy.stats.qmc
+        - The unscrambled sequences begin at the origin, which maps to
+            infinite values for unbounded marginals; that point is dropped
+
+    Examples:
+
+        >>> import grama as gr
+        >>> from grama.models import make_test
+        >>> md = make_test()
+        >>> df = md >> gr.ev_qmc(n=2 ** 7, df_det="nom", seed=101)
+        >>> df.describe()
+        >>> ## Randomized QMC; replicate-to-replicate error estimate
+        >>> (
+        >>>     md
+        >>>     >> gr.ev_qmc(n=2 ** 7, n_rep=8, df_det="nom", seed=101)
+        >>>     >> gr.tf_group_by("qmc_rep")
+        >>>     >> gr.tf_summarize(mu=gr.mean(gr.X.y0))
+        >>>     >> gr.tf_ungroup()
+        >>>     >> gr.tf_summarize(
+        >>>         mu=gr.mean(gr.X.mu),
+        >>>         mu_se=gr.sd(gr.X.mu) / 8 ** 0.5,
+        >>>     )
+        >>> )
+
+    """
+    ## Quasi-Monte Carlo engines need scipy>=1.7; import only when used
+    try:
+        from scipy.stats import qmc
+    except ImportError:
+        raise ImportError("eval_qmc requires scipy>=1.7 for scipy.stats.qmc")
+
+    engines = {"sobol": qmc.Sobol, "halton": qmc.Halton}
+    if engine not in engines:
+        raise ValueError(
+            "engine must be one of {}; got {}".format(list(engines.keys()), engine)
+        )
+    if (n_rep > 1) and (not scramble):
+        raise ValueError("Randomized replicates (n_rep > 1) require scramble=True")
+    if model.density.copula is None:
+        raise ValueError("Present model copula must be defined for sampling.")
+
+    ## Ensure sample count is int
+    if not isinstance(n, Integral):
+        print("eval_qmc() is rounding n...")
+        n = int(n)
+
+    ## Independent scramblings, one per replicate
+    samplers = []
+    for child in SeedSequence(seed).spawn(n_rep):
+        sampler = engines[engine](
+            d=model.n_var_rand, scramble=scramble, seed=default_rng(child)
+        )
+        ## Skip the origin of unscrambled sequences
+        n_skip = start + (0 if scramble else 1)
+        if n_skip > 0:
+            sampler.fast_forward(n_skip)
+        samplers.append(sampler)
+
+    def draw(sampler, n_c):
+        ## Impose dependence, then convert to desired marginals
+        U = model.density.copula.z2u(norm.ppf(sampler.random(n_c)))
+        return model.density.pr2sample(DataFrame(data=U, columns=model.var_rand))
+
+    if summarize:
+        df_summary = concat(
+            [
+                _eval_summarize(
+                    model,
+                    lambda n_c: draw(sampler, n_c),
+                    n,
+                    n_chunk,
+                    df_det,
+                    summarize,
+                )
+                for sampler in samplers
+            ],
+            axis=0,
+            ignore_index=True,
+        )
+        if n_rep > 1:
+            df_summary.insert(0, repname, repeat(arange(n_rep), model.n_out))
+
+        return df_summary
+
+    df_rand = concat([draw(sampler, n) for sampler in samplers], ignore_index=True)
+    if n_rep > 1:
+        df_rand[repname] = repeat(arange(n_rep), n)
+    ## Construct outer-product DOE
+    df_samp = model.var_outer(df_rand, df_det=df_det)
+
+    if skip:
+        ## Attach metadata
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            df_samp._plot_info = {
+                "type": "monte_carlo_inputs",
+                "var": model.var_rand,
+            }
+
+        return df_samp
+    else:
+        df_res = gr.eval_df(model, df=df_samp, append=append)
+
+        ## Attach metadata
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            df_res._plot_info = {"type": "monte_carlo_outputs", "out": model.out}
+
+        return df_res
+
+
+ev_qmc = add_pipe(eval_qmc)
+
+## Multifidelity Monte Carlo
+# --------------------------------------------------
+@curry
+def eval_multifidelity(
+    md_hi,
+    md_lo,
+    n_hi=100,
+    n_lo=None,
+    out=None,
+    df_det=None,
+    max_ratio=100,
+    alpha=0.05,
+    seed=None,
+):
+    r"""Multifidelity Monte Carlo estimate of output means
+
+    Estimates output means of an expensive model md_hi using a cheap,
+    correlated model md_lo (e.g. a fitted metamodel or coarse physics) as a
+    control variate [1]. Both models are evaluated on n_hi shared samples; the
+    cheap model is evaluated on n_lo - n_hi additional samples. The control
+    variate weight is estimated from the shared samples.
+
+    If n_lo is None, it is allocated from the runtimes and correlation
+    measured on the shared samples, using the optimal ratio of [1]:
+    n_lo / n_hi = sqrt(w_hi rho^2 / (w_lo (1 - rho^2))).
+
+    Args:
+        md_hi (gr.Model): Expensive model; its density defines the inputs
+        md_lo (gr.Model): Cheap model; must take the same inputs
+        n_hi (int): Number of shared samples, evaluated by both models
+        n_lo (int or None): Total number of samples evaluated by md_lo; must
+            be at least n_hi. Allocated automatically if None.
+        out (list of str or None): Outputs to estimate; must be common to
+            both models. Uses all common outputs if None.
+        df_det (DataFrame): Deterministic levels for evaluation; use "nom"
+            for nominal deterministic levels. Must be a single level.
+        max_ratio (float): Largest allowed n_lo / n_hi when allocating
+            automatically
+        alpha (float): Significance level; intervals have confidence level
+            1 - alpha. Value in (0, 1)
+        seed (int): Random seed to use
+
+    Returns:
+        DataFrame: One row per output, with the multifidelity estimate "mean"
+            and its standard error "se" and confidence interval bounds, the
+            md_hi-only Monte Carlo estimate "mean_mc" and "se_mc" for
+            comparison,
+            the correlation "rho", control variate weight "weight", and sample
+            counts
+
+    References:
+        - [1] Peherstorfer, Willcox, and Gunzburger, "Optimal model management for multifidelity Monte Carlo estimation," SIAM Journal on Scientific Computing, 2016
+
+    Examples:
+
+        >>> import grama as gr
+        >>> from grama.models import make_cantilever_beam
+        >>> md = make_cantilever_beam()
+        >>> md_fit = (
+        >>>     md
+        >>>     >> gr.ev_monte_carlo(n=100, df_det="nom", seed=101)
+        >>>     >> gr.ft_lm(var=md.var, out=md.out)
+        >>> )
+        >>> gr.eval_multifidelity(md, md_fit, n_hi=100, n_lo=10000, df_det="nom")
+
+    """
+    ## Check invariants
+    if out is None:
+        out = [o for o in md_hi.out if o in md_lo.out]
+    if (len(out) == 0) or (not set(out).issubset(set(md_hi.out) & set(md_lo.out))):
+        raise ValueError("out must be a nonempty subset of md_hi.out and md_lo.out")
+    if not set(md_lo.var).issubset(set(md_hi.var)):
+        raise ValueError("md_lo.var must be a subset of md_hi.var")
+    n_hi = int(n_hi)
+    if (n_lo is not None) and (n_lo < n_hi):
+        raise ValueError("n_lo must be at least n_hi")
+
+    ## Set seed only if given
+    if seed is not None:
+        set_seed(seed)
+
+    def draw(n):
+        df_samp = md_hi.var_outer(md_hi.density.sample(n=n), df_det=df_det)
+        if df_samp.shape[0] != n:
+            raise ValueError(
+                "eval_multifidelity() requires a single deterministic level"
+            )
+        return df_samp
+
+    ## Shared samples; time both models
+    df_shared = draw(n_hi)
+    t0 = perf_counter()
+    Y_hi = gr.eval_df(md_hi, df=df_shared, append=False)[out].values
+    t1 = perf_counter()
+    Y_lo = gr.eval_df(md_lo, df=df_shared, append=False)[out].values
+    t2 = perf_counter()
+
+    mean_hi = Y_hi.mean(axis=0)
+    mean_lo = Y_lo.mean(axis=0)
+    var_hi = Y_hi.var(axis=0, ddof=1)
+    var_lo = Y_lo.var(axis=0, ddof=1)
+    cov = ((Y_hi - mean_hi) * (Y_lo - mean_lo)).sum(axis=0) / (n_hi - 1)
+    rho = cov / sqrt(var_hi * var_lo)
+    weight = cov / var_lo
+
+    ## Allocate cheap samples; the least correlated output sets the ratio
+    if n_lo is None:
+        with errstate(divide="ignore"):
+            r = sqrt((t1 - t0) * rho ** 2 / ((t2 - t1) * (1 - rho ** 2))).min()
+        n_lo = int(ceil(clip(r, 1, max_ratio) * n_hi))
+    n_lo = int(n_lo)
+
+    ## Additional cheap samples
+    if n_lo > n_hi:
+        Y_add = gr.eval_df(md_lo, df=draw(n_lo - n_hi), append=False)[out].values
+        mean_lo_all = (Y_lo.sum(axis=0) + Y_add.sum(axis=0)) / n_lo
+    else:
+        mean_lo_all = mean_lo
+
+    mean = mean_hi + weight * (mean_lo_all - mean_lo)
+    se = sqrt(var_hi / n_hi * (1 - (1 - n_hi / n_lo) * rho ** 2))
+    z = -norm.ppf(alpha / 2)
+
+    return DataFrame(
+        {
+            "out": out,
+            "mean": mean,
+            "se": se,
+            "mean_lo": mean - z * se,
+            "mean_up": mean + z * se,
+            "mean_mc": mean_hi,
+            "se_mc": sqrt(var_hi / n_hi),
+            "rho": rho,
+            "weight": weight,
+            "n_hi": n_hi,
+            "n_lo": n_lo,
+        }
+    )
+
+
+ev_multifidelity = add_pipe(eval_multifidelity)
+
+## Latin Hypercube Sampling (LHS)
+# --------------------------------------------------
+def _lhs_design(n, d, center=False):
+    ## Independent random permutation of strata per column
+    strata = argsort(random((n, d)), axis=0)
+    if center:
+        return (strata + 0.5) / n
+    return (strata + random((n, d))) / n
+
+
+def _lhs_maximin(X, p=50, n_iter=20, n_inner=50, n_cand=50):
+    ## Enhanced stochastic evolutionary (ESE) optimization of the phi_p
+    ## criterion; Jin, Chen, and Sudjianto (2005). Column-wise row swaps keep
+    ## the Latin property; distances are updated incrementally per swap.
+    n, d = X.shape
+    X = X.copy()
+    n_cand = min(n_cand, n * (n - 1) // 2)
+    ind_cand = arange(n_cand)
+
+    ## Pairwise squared distances, scaled for numerical range; the infinite
+    ## diagonal drops self-distances from the criterion
+    D2 = cdist(X, X, "sqeuclidean")
+    fill_diagonal(D2, inf)
+    scale = D2.min()
+    D2 /= scale
+    Dp = D2 ** (-p / 2)
+    S = Dp.sum() / 2
+
+    f = S ** (1 / p)
+    f_best = f
+    X_best = X.copy()
+    T = 0.005 * f
+
+    for i_iter in range(n_iter):
+        f_old_best = f_best
+        n_acpt = 0
+        n_imp = 0
+
+        for i_inner in range(n_inner):
+            k = i_inner % d
+            ## Candidate swaps of rows a, b within column k
+            a = randint(0, n, size=n_cand)
+            b = (a + randint(1, n, size=n_cand)) % n
+            xa = X[a, k][:, None]
+            xb = X[b, k][:, None]
+            dx2 = ((X[:, k] - xa) ** 2 - (X[:, k] - xb) ** 2) / scale
+            ## Distances from rows a, b to all others after swap; the a-b
+            ## distance is unchanged
+            Da = D2[a] - dx2
+            Db = D2[b] + dx2
+            Da[ind_cand, b] = inf
+            Db[ind_cand, a] = inf
+            Pa = Da ** (-p / 2)
+            Pb = Db ** (-p / 2)
+            dSa = Pa - Dp[a]
+            dSb = Pb - Dp[b]
+            dSa[ind_cand, b] = 0
+            dSb[ind_cand, a] = 0
+            dS = dSa.sum(axis=1) + dSb.sum(axis=1)
+
+            j = argmin(dS)
+            f_try = max(S + dS[j], 0) ** (1 / p)
+            if f_try - f <= T * random():
+                ia, ib = a[j], b[j]
+                X[ia, k], X[ib, k] = X[ib, k], X[ia, k]
+                ## Update cached distances
+                d_ab, p_ab = D2[ia, ib], Dp[ia, ib]
+                D2[ia], D2[:, ia] = Da[j], Da[j]
+                D2[ib], D2[:, ib] = Db[j], Db[j]
+                Dp[ia], Dp[:, ia] = Pa[j], Pa[j]
+                Dp[ib], Dp[:, ib] = Pb[j], Pb[j]
+                D2[ia, ib], D2[ib, ia] = d_ab, d_ab
+                Dp[ia, ib], Dp[ib, ia] = p_ab, p_ab
+
+                S = S + dS[j]
+                f = f_try
+                n_acpt += 1
+                if f < f_best:
+                    f_best = f
+                    X_best[:] = X
+                    n_imp += 1
+
+        ## Threshold control
+        r_acpt = n_acpt / n_inner
+        r_imp = n_imp / n_inner
+        if f_best < f_old_best:
+            ## Improving process
+            if (r_acpt > 0.1) and (r_imp < r_acpt):
+                T *= 0.8
+            elif r_acpt <= 0.1:
+                T /= 0.8
+        else:
+            ## Exploration process
+            if r_acpt < 0.1:
+                T /= 0.7
+            elif r_acpt > 0.8:
+                T *= 0.9
+
+    return X_best
+
+
+@curry
+def eval_lhs(
+    model,
+    n=1,
+    df_det=None,
+    seed=None,
+    criterion=None,
+    center=False,
+    p=50,
+    n_iter=20,
+    append=True,
+    skip=False,
+):
+    r"""Latin Hypercube evaluation
+
+    Evaluates a given model on a latin hypercube sample (LHS) using the model's
+    density. The design is built in the copula's independent space and mapped
+    through the copula and marginals; with a Gaussian copula, the samples
+    follow the specified dependence.
+
+    Args:
+        model (gr.Model): Model to evaluate
+        n (numeric): Number of LHS samples to draw
+        df_det (DataFrame): Deterministic levels for evaluation; use "nom"
+            for nominal deterministic levels.
+        seed (int): Random seed to use
+        criterion (str or None): Space-filling criterion to optimize; None for
+            a random LHS, or "maximin" to maximize the spacing between points
+        center (bool): Place points at the center of their strata?
+        p (float): Exponent of the phi_p criterion; larger values more
+            closely approximate maximin
+        n_iter (int): Number of outer optimization iterations
+        append (bool): Append results to random values?
+        skip (bool): Skip evaluation of the functions?
+
+    Returns:
+        DataFrame: Results of evaluation or unevaluated design
+
+    Notes:
+        - The "maximin" criterion is optimized through the phi_p surrogate of
+            Morris and Mitchell (1995), using the enhanced stochastic
+            evolutionary algorithm of Jin, Chen, and Sudjianto (2005).
+        - See grama.eval.eval_lhs for a wrapper on pyDOE.lhs
+
+    Examples:
+
+        >>> import grama as gr
+        >>> from grama.models import make_cantilever_beam
+        >>> md = make_cantilever_beam()
+        >>> df = md >> gr.ev_lhs(n=100, df_det="nom", criterion="maximin", seed=101)
+        >>> df.describe()
+
+    """
+    if criterion not in (None, "maximin"):
+        raise ValueError(
+            "criterion must be None or 'maximin'; got {}".format(criterion)
+        )
+    if model.density.copula is None:
+        raise ValueError("Present model copula must be defined for sampling.")
+
+    ## Set seed only if given
+    if seed is not None:
+        set_seed(seed)
+
+    ## Ensure sample count is int
+    if not isinstance(n, Integral):
+        print("eval_lhs() is rounding n...")
+        n = int(n)
+
+    ## Build design
+    U = _lhs_design(n, model.n_var_rand, center=center)
+    if (criterion == "maximin") and (n > 2) and (model.n_var_rand > 1):
+        U = _lhs_maximin(U, p=p, n_iter=n_iter)
+
+    ## Impose dependence, then convert to desired marginals
+    U = model.density.copula.z2u(norm.ppf(U))
+    df_rand = model.density.pr2sample(DataFrame(data=U, columns=model.var_rand))
+    ## Construct outer-product DOE
+    df_samp = model.var_outer(df_rand, df_det=df_det)
+
+    if skip:
+        return df_samp
+    else:
+        return gr.eval_df(model, df=df_samp, append=append)
+
+
+ev_lhs = add_pipe(eval_lhs)
+
 ## Marginal sweeps with random origins
 # --------------------------------------------------
 @curry
@@ -256,6 +1169,161 @@ def eval_sinews(
 
 ev_sinews = add_pipe(eval_sinews)
 
+## Morris elementary effects
+# --------------------------------------------------
+def _morris_trajectories(n, d, levels):
+    ## Random Morris (1991) trajectories on the unit grid, vectorized over n;
+    ## shape (n, d + 1, d)
+    delta = levels / (2 * (levels - 1))
+    x_base = randint(0, levels // 2, size=(n, 1, d)) / (levels - 1)
+    signs = 2 * randint(0, 2, size=(n, 1, d)) - 1
+    B = 2 * tril(ones((d + 1, d)), k=-1) - 1
+
+    X = x_base + delta / 2 * (B[newaxis] * signs + 1)
+    ## Random order of inputs
+    perm = argsort(random((n, d)), axis=1)
+
+    return take_along_axis(X, perm[:, newaxis, :], axis=2)
+
+
+def _morris_spread(X, r):
+    ## Greedy selection of r trajectories with maximum spread; Campolongo,
+    ## Cariboni, and Saltelli (2007)
+    n, n_pt, d = X.shape
+    points = X.reshape((n * n_pt, d))
+    D = zeros((n, n))
+    for m in range(n):
+        dist = cdist(X[m], points).reshape((n_pt, n, n_pt))
+        D[m] = dist.sum(axis=(0, 2))
+
+    i, j = divmod(argmax(D), n)
+    selected = [i, j]
+    score = D[i] ** 2 + D[j] ** 2
+    while len(selected) < r:
+        score[selected] = -inf
+        k = argmax(score)
+        selected.append(k)
+        score = score + D[k] ** 2
+
+    return X[selected[:r]]
+
+
+@curry
+def eval_morris(
+    model,
+    r=10,
+    levels=4,
+    n_cand=None,
+    df_det=None,
+    seed=None,
+    varname="morris_var",
+    indname="morris_ind",
+    append=True,
+    skip=False,
+):
+    r"""Morris elementary effects screening
+
+    Evaluate a model on Morris one-at-a-time trajectories to support
+    screening inputs by elementary effects (Morris, 1991). Each trajectory
+    changes each random variable once, by a fixed fraction of its quantiles.
+    Use gr.tran_morris() to post-process the results.
+
+    Costs r * (d + 1) evaluations, all in a single call to gr.eval_df().
+
+    Args:
+        model (gr.Model): Model to evaluate
+        r (int): Number of trajectories; at least 2, as the spread of the
+            elementary effects needs more than one trajectory
+        levels (int): Number of grid levels; must be even
+        n_cand (int or None): Number of candidate trajectories, from which r
+            are chosen to maximize spread (Campolongo et al., 2007); use
+            n_cand=r to skip the optimization. Default is 4 * r.
+        df_det (DataFrame): Deterministic levels for evaluation; use "nom"
+            for nominal deterministic levels.
+        seed (int): Random seed to use
+        varname (str): Column name for the variable changed into each point;
+            "_" for the first point of a trajectory
+        indname (str): Column name for the trajectory index
+        append (bool): Append results to random values?
+        skip (bool): Skip evaluation of the functions?
+
+    Returns:
+        DataFrame: Results of evaluation or unevaluated design
+
+    Notes:
+        - Grid levels are mapped to the midpoints of equal-probability
+          intervals of each marginal, so unbounded marginals stay finite.
+
+    References:
+        M.D. Morris, "Factorial sampling plans for preliminary computational
+        experiments" (1991) Technometrics, Vol 33.
+
+    Examples:
+
+        >>> import grama as gr
+        >>> from grama.models import make_cantilever_beam
+        >>> md = make_cantilever_beam()
+        >>> df_morris = md >> gr.ev_morris(r=20, df_det="nom", seed=101)
+        >>> df_morris >> gr.tf_morris()
+
+    """
+    ## Check invariants
+    if (levels < 2) or (levels % 2 != 0):
+        raise ValueError("levels must be a positive even integer")
+    if r < 2:
+        raise ValueError("r must be at least 2")
+    if n_cand is None:
+        n_cand = 4 * r
+    if n_cand < r:
+        raise ValueError("n_cand must be at least r")
+
+    ## Set seed only if given
+    if seed is not None:
+        set_seed(seed)
+
+    d = model.n_var_rand
+    X = _morris_trajectories(n_cand, d, levels)
+    if n_cand > r:
+        X = _morris_spread(X, r)
+    ## Input changed at each step
+    ind_var = argmax(X[:, 1:] != X[:, :-1], axis=2)
+
+    ## Map grid to equal-probability interval midpoints
+    Q_all = (X.reshape((r * (d + 1), d)) * (levels - 1) + 0.5) / levels
+    df_rand = model.density.pr2sample(DataFrame(data=Q_all, columns=model.var_rand))
+    ## Label each point by the input changed into it
+    C_var = asarray(["_"] + model.var_rand, dtype=object)
+    ind_label = concatenate((zeros((r, 1), dtype=int), ind_var + 1), axis=1)
+    df_rand[varname] = C_var[ind_label.flatten()]
+    df_rand[indname] = repeat(arange(r), d + 1)
+    ## Construct outer-product DOE
+    df_samp = model.var_outer(df_rand, df_det=df_det)
+
+    metadata = dict(
+        type="eval_morris",
+        varname=varname,
+        indname=indname,
+        delta=levels / (2 * (levels - 1)),
+        var_rand=model.var_rand,
+        out=model.out,
+    )
+    if skip:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            df_samp._meta = metadata
+
+        return df_samp
+    else:
+        df_res = gr.eval_df(model, df=df_samp, append=append)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            df_res._meta = metadata
+
+        return df_res
+
+
+ev_morris = add_pipe(eval_morris)
+
 ## Hybrid points for Sobol' indices
 # --------------------------------------------------
 @curry
@@ -268,6 +1336,7 @@ def eval_hybrid(
     seed=None,
     append=True,
     skip=False,
+    second=False,
 ):
     r"""Hybrid points for Sobol' indices
 
@@ -275,16 +1344,22 @@ def eval_hybrid(
     indices. Use gr.tran_sobol() to post-process the results and compute
     estimates.
 
+    The "both" plan uses the design of Saltelli et al. (2010) to estimate
+    first-order and total indices from a single evaluation of n * (d + 2)
+    points, rather than n * (d + 1) points for each of "first" and "total".
+
     Args:
         model (gr.Model): Model to evaluate; must have CopulaIndependence
         n (numeric): Number of points along each sweep
-        plan (str): Sobol' index to compute; plan={"first", "total"}
+        plan (str): Sobol' index to compute; plan={"first", "total", "both"}
         seed (int): Random seed to use
         df_det (DataFrame): Deterministic levels for evaluation; use "nom"
             for nominal deterministic levels.
         varname (str): Column name to give for sweep variable; default="hybrid_var"
         append (bool): Append results to conservative inputs?
         skip (bool): Skip evaluation of the functions?
+        second (bool): Add n * d points to support second-order indices? Only
+            available with plan="both"
 
     Returns:
         DataFrame: Results of evaluation or unevaluated design
@@ -293,6 +1368,10 @@ def eval_hybrid(
         I.M. Sobol', "Sensitivity Estimates for Nonlinear Mathematical Models"
         (1999) MMCE, Vol 1.
 
+        A. Saltelli et al., "Variance based sensitivity analysis of model
+        output. Design and estimator for the total sensitivity index" (2010)
+        Computer Physics Communications, Vol 181.
+
     Examples:
 
         >>> import grama as gr
@@ -302,6 +1381,9 @@ def eval_hybrid(
         >>>
         >>> df_total = md >> gr.ev_hybrid(df_det="nom", plan="total")
         >>> df_total >> gr.tf_sobol()
+        >>>
+        >>> df_both = md >> gr.ev_hybrid(df_det="nom", plan="both", second=True)
+        >>> df_both >> gr.tf_sobol()
 
     """
     ## Check invariants
@@ -310,6 +1392,10 @@ def eval_hybrid(
             "model must have CopulaIndependence structure;\n"
             + "Sobol' indices only defined for independent variables"
         )
+    if plan not in ["first", "total", "both"]:
+        raise ValueError("plan must be `first`, `total`, or `both`")
+    if second and (plan != "both"):
+        raise ValueError("second-order points require plan `both`")
 
     ## Set seed only if given
     if seed is not None:
@@ -323,32 +1409,35 @@ def eval_hybrid(
     X = random((n, model.n_var_rand))
     Z = random((n, model.n_var_rand))
 
-    ## Reserve space
-    Q_all = zeros((n * (model.n_var_rand + 1), model.n_var_rand))
-    Q_all[:n] = X  # Base samples
-    C_var = ["_"] * (n * (model.n_var_rand + 1))
+    ## Blocks of the design; base samples first
+    blocks = [X]
+    C_block = ["_"]
+    if plan == "both":
+        blocks.append(Z)
+        C_block.append("__")
 
-    ## Interleave samples
     for i_in in range(model.n_var_rand):
-        i_start = (i_in + 1) * n
-        i_end = (i_in + 2) * n
-
         if plan == "first":
-            Q_all[i_start:i_end, :] = Z
-            Q_all[i_start:i_end, i_in] = X[:, i_in]
-        elif plan == "total":
-            Q_all[i_start:i_end, :] = X
-            Q_all[i_start:i_end, i_in] = Z[:, i_in]
+            Q = Z.copy()
+            Q[:, i_in] = X[:, i_in]
         else:
-            raise ValueError("plan must be `first` or `total`")
+            Q = X.copy()
+            Q[:, i_in] = Z[:, i_in]
+        blocks.append(Q)
+        C_block.append(model.var_rand[i_in])
 
-        C_var[i_start:i_end] = [model.var_rand[i_in]] * n
+    if second:
+        for i_in in range(model.n_var_rand):
+            Q = Z.copy()
+            Q[:, i_in] = X[:, i_in]
+            blocks.append(Q)
+            C_block.append("__" + model.var_rand[i_in])
 
     ## Construct sampling plan
-    df_pr = DataFrame(data=Q_all, columns=model.var_rand)
+    df_pr = DataFrame(data=concatenate(blocks, axis=0), columns=model.var_rand)
     ## Convert samples to desired marginals
     df_rand = model.density.pr2sample(df_pr)
-    df_rand[varname] = C_var
+    df_rand[varname] = repeat(C_block, n)
     ## Construct outer-product DOE
     df_samp = model.var_outer(df_rand, df_det=df_det)
 
@@ -359,6 +1448,7 @@ def eval_hybrid(
                 type="eval_hybrid",
                 varname=varname,
                 plan=plan,
+                second=second,
                 var_rand=model.var_rand,
                 out=model.out,
             )
@@ -372,6 +1462,7 @@ def eval_hybrid(
                 type="eval_hybrid",
                 varname=varname,
                 plan=plan,
+                second=second,
                 var_rand=model.var_rand,
                 out=model.out,
             )
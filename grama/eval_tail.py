@@ -3,16 +3,29 @@ __all__ = [
     "ev_form_pma",
     "eval_form_ria",
     "ev_form_ria",
+    "eval_importance",
+    "ev_importance",
+    "eval_subset_sim",
+    "ev_subset_sim",
 ]
 
 import grama as gr
 from grama import add_pipe, pipe, custom_formatwarning
-from numpy import array, argmin, ones, eye, zeros, sqrt, NaN, max
+from numpy import array, argmin, ones, eye, zeros, sqrt, NaN, max, exp, isfinite
+from numpy import argsort, concatenate, where, arange, atleast_2d, newaxis, sign
+from numpy import array_equal, maximum, minimum, array_split, Inf, ndim
+from numpy.random import standard_normal
+from numpy.random import seed as set_seed
 from numpy.linalg import norm as length
-from numpy.random import multivariate_normal
+from numpy.random import default_rng, randint
 from pandas import DataFrame, concat
-from scipy.optimize import minimize
+from scipy.stats import norm
+from scipy.optimize import minimize, OptimizeResult
 from toolz import curry
+from grama.tools import _fork_map
+import warnings
+
+warnings.formatwarning = custom_formatwarning
 
 ## Utility Functions
 # --------------------------------------------------
@@ -27,6 +40,353 @@ def make_T(model, df_corr):
     raise NotImplementedError
 
 
+def _z2df(model, Z, df_det):
+    """Map standard normal values to a DataFrame of model inputs
+
+    Args:
+        model (gr.Model): Model to evaluate
+        Z (array): Standard normal values; single vector or one row per point
+        df_det (DataFrame): Single row of deterministic levels
+
+    Returns:
+        DataFrame: Model inputs, one row per point
+
+    """
+    df = DataFrame(data=model.z2x(atleast_2d(Z)), columns=model.var_rand)
+    for var in model.var_det:
+        df[var] = df_det[var].values[0]
+
+    return df
+
+
+def _limit_z(model, Z, df_det, key):
+    """Evaluate a limit state at a batch of standard normal points
+
+    Evaluates all points with a single call to eval_df().
+
+    """
+    df_res = gr.eval_df(model, df=_z2df(model, Z, df_det), append=False)
+    return df_res[key].values
+
+
+def _limit_grad_z(model, z, df_det, key, h=1e-6):
+    """Value and gradient of a limit state in standard normal space
+
+    Chains the model jacobian with the inverse transform jacobian if
+    model.has_jac; otherwise uses forward differences in standard normal space,
+    evaluated as a single batch of n_var_rand + 1 points.
+
+    Returns:
+        float: Limit state value
+        array: Gradient with respect to z
+
+    """
+    if model.has_jac:
+        df_out, J = model._jac_chain(_z2df(model, z, df_det), model.var_rand)
+        grad_x = J[0, model.out.index(key), :]
+
+        return df_out[key].values[0], model.dxdz(z).dot(grad_x)
+
+    Z = concatenate((atleast_2d(z), z + h * eye(model.n_var_rand)), axis=0)
+    G = _limit_z(model, Z, df_det, key)
+
+    return G[0], (G[1:] - G[0]) / h
+
+
+def _make_limit_z(model, df_det, key):
+    """Build array-in limit state functions for an MPP search
+
+    Returns:
+        function: fun(Z); limit state values at a batch of points, or at a
+            single point
+        function: fun_grad(z); memoized (value, gradient) at a single point
+
+    """
+    cache = {"z": None}
+
+    def fun(Z):
+        if (ndim(Z) == 1) and (cache["z"] is not None) and array_equal(Z, cache["z"]):
+            return cache["val"]
+        G = _limit_z(model, Z, df_det, key)
+        return G[0] if ndim(Z) == 1 else G
+
+    def fun_grad(z):
+        if (cache["z"] is None) or (not array_equal(z, cache["z"])):
+            cache["val"], cache["grad"] = _limit_grad_z(model, z, df_det, key)
+            cache["z"] = array(z, copy=True)
+        return cache["val"], cache["grad"]
+
+    return fun, fun_grad
+
+
+def _form_ihlrf(fun, fun_grad, z0, tol, n_maxiter, n_line=8):
+    """Improved HL-RF search for the MPP; reliability index approach
+
+    Iterates the Hasofer-Lind-Rackwitz-Fiessler update with an Armijo line
+    search on the merit function m(z) = |z|^2 / 2 + c |g(z)| [1]. All line
+    search candidates are evaluated as a single batch.
+
+    References:
+        - [1] Zhang and Der Kiureghian, "Finite element reliability methods for inelastic structures," Report No. UCB/SEMM-97/05, 1997
+
+    """
+    z = array(z0, dtype=float)
+    g, grad = fun_grad(z)
+    steps = 0.5 ** arange(n_line)
+    success = False
+
+    for n_iter in range(1, n_maxiter + 1):
+        len_grad = length(grad)
+        if len_grad == 0:
+            break
+        ## HL-RF search direction
+        len_z = length(z)
+        d = (grad.dot(z) - g) / len_grad ** 2 * grad - z
+
+        ## Check convergence: on the limit state, and at the HL-RF fixed point
+        if (abs(g) / len_grad <= tol) and (length(d) <= tol * maximum(len_z, 1)):
+            success = True
+            break
+
+        c = 2 * maximum(len_z, length(z + d)) / len_grad + 1
+        m0 = 0.5 * z.dot(z) + c * abs(g)
+        slope = (z + c * sign(g) * grad).dot(d)
+
+        ## Batched Armijo line search
+        Z = z + steps[:, newaxis] * d
+        G = fun(Z)
+        M = 0.5 * (Z ** 2).sum(axis=1) + c * abs(G)
+        i_ok = where(M <= m0 + 0.5 * steps * minimum(slope, 0))[0]
+        i_step = i_ok[0] if len(i_ok) > 0 else n_line - 1
+
+        z = Z[i_step]
+        g, grad = fun_grad(z)
+
+    return OptimizeResult(
+        x=z, fun=z.dot(z), nit=n_iter, status=0 if success else 1, success=success
+    )
+
+
+def _form_amv(fun, fun_grad, z0, beta, tol, n_maxiter, n_line=8):
+    """Advanced mean value search for the MPP; performance measure approach
+
+    Iterates z = -beta * grad / |grad| on the sphere |z| = beta [1]. Each
+    update is safeguarded by a batched search along the arc towards the new
+    point, which stabilizes the iteration for concave limit states. Success
+    requires z to be stationary, anti-parallel to the gradient within tol;
+    status is 1 if n_maxiter is reached, and 2 if the arc search finds no
+    decrease before that.
+
+    References:
+        - [1] Wu, Millwater, and Cruse, "Advanced probabilistic structural analysis method for implicit performance functions," AIAA Journal, 1990
+
+    """
+    z = beta * z0 / maximum(length(z0), 1e-16)
+    g, grad = fun_grad(z)
+    steps = 0.5 ** arange(n_line)
+    success = False
+    status = 1
+
+    for n_iter in range(1, n_maxiter + 1):
+        len_grad = length(grad)
+        if len_grad == 0:
+            break
+        z_amv = -beta * grad / len_grad
+        if length(z_amv - z) <= tol * maximum(beta, 1):
+            success = True
+            status = 0
+            break
+
+        ## Batched search along the arc from z to z_amv
+        Z = (1 - steps[:, newaxis]) * z + steps[:, newaxis] * z_amv
+        Z_len = length(Z, axis=1)
+        Z = beta * Z[Z_len > 0] / Z_len[Z_len > 0, newaxis]
+        G = fun(Z)
+        i_dec = where(G < g)[0]
+        ## No decrease available, but z is not stationary; stalled
+        if len(i_dec) == 0:
+            status = 2
+            break
+
+        z = Z[i_dec[0]]
+        g, grad = fun_grad(z)
+
+    return OptimizeResult(x=z, fun=g, nit=n_iter, status=status, success=success)
+
+
+def _form_search(
+    model, df_inner, key, target, z0, method, rng, tol, n_maxiter, n_restart
+):
+    """Run an MPP search with restarts for one limit state and det level
+
+    Args:
+        target (float or None): Reliability index for PMA; None for RIA
+        rng (numpy.random.Generator): Source of random restart points
+
+    Returns:
+        dict: MPP in standard normal space `z`, optimal value `fun`, and
+            iteration counts `nit`, `nit_total`; `z` is None if unsuccessful
+
+    """
+    fun, fun_grad = _make_limit_z(model, df_inner, key)
+
+    def con_beta(z):
+        return z.dot(z) - target ** 2
+
+    def con_beta_jac(z):
+        return 2 * z
+
+    def fun_jac(z):
+        ## Squared reliability index
+        return (z.dot(z), 2 * z)
+
+    con_limit = {"type": "eq", "fun": fun, "jac": lambda z: fun_grad(z)[1]}
+
+    res_all = []
+    for jnd in range(n_restart):
+        if method == "amv":
+            res = _form_amv(fun, fun_grad, z0, target, tol, n_maxiter)
+        elif method == "ihlrf":
+            res = _form_ihlrf(fun, fun_grad, z0, tol, n_maxiter)
+        elif target is not None:
+            res = minimize(
+                fun_grad,
+                z0,
+                args=(),
+                method="SLSQP",
+                jac=True,
+                tol=tol,
+                options={"maxiter": n_maxiter, "disp": False},
+                constraints=[{"type": "eq", "fun": con_beta, "jac": con_beta_jac}],
+            )
+        else:
+            res = minimize(
+                fun_jac,
+                z0,
+                args=(),
+                method="SLSQP",
+                jac=True,
+                tol=tol,
+                options={"maxiter": n_maxiter, "disp": False},
+                constraints=[con_limit],
+            )
+        # Append only a successful result
+        if res["status"] == 0:
+            res_all.append(res)
+        # Set a random start; repeat
+        z0 = rng.standard_normal(model.n_var_rand)
+        z0 = z0 / length(z0) * (1 if target is None else target)
+
+    # Choose value among restarts
+    n_iter_total = sum([res_all[i].nit for i in range(len(res_all))])
+    if len(res_all) == 0:
+        return dict(z=None, fun=NaN, nit=0, nit_total=n_iter_total)
+    i_star = argmin([res.fun for res in res_all])
+
+    return dict(
+        z=res_all[i_star].x,
+        fun=res_all[i_star].fun,
+        nit=res_all[i_star].nit,
+        nit_total=n_iter_total,
+    )
+
+
+def _form_path(D):
+    """Greedy nearest-neighbor ordering of points (rows of D)"""
+    n = D.shape[0]
+    visited = zeros(n, dtype=bool)
+    order = [0]
+    visited[0] = True
+    for i in range(1, n):
+        dist = ((D - D[order[-1]]) ** 2).sum(axis=1)
+        dist[visited] = Inf
+        order.append(argmin(dist))
+        visited[order[-1]] = True
+
+    return order
+
+
+def _form_chunk(
+    model, df_det, D, key, i_key, target, rows, method, warm_start, seed, kw
+):
+    """Solve the MPP searches for one limit state over a chunk of det levels
+
+    Each search starts from the MPP of the nearest already-solved det level in
+    the chunk, if warm_start, otherwise from the conservative direction.
+    Random restarts for det row ind draw from a stream seeded by (seed, ind,
+    i_key), so they do not depend on how rows are split into chunks.
+
+    """
+    ## Use conservative direction for default initial guess
+    signs = array([model.density.marginals[k].sign for k in model.var_rand])
+    if length(signs) > 0:
+        z_default = signs / length(signs)
+    else:
+        z_default = ones(model.n_var_rand) / sqrt(model.n_var_rand)
+    if target is not None:
+        z_default = target * z_default
+
+    solved = []
+    z_solved = []
+    results = []
+    for ind in rows:
+        z0 = z_default
+        if warm_start and (len(solved) > 0):
+            dist = ((D[solved] - D[ind]) ** 2).sum(axis=1)
+            z0 = z_solved[argmin(dist)]
+
+        df_inner = df_det.iloc[[ind]].reset_index(drop=True)
+        rng = default_rng([seed, ind, i_key])
+        res = _form_search(model, df_inner, key, target, z0, method, rng, **kw)
+        results.append((ind, key, res))
+        if res["z"] is not None:
+            solved.append(ind)
+            z_solved.append(res["z"])
+
+    return results
+
+
+def _form_run(model, df_det, targets, method, warm_start, n_jobs, seed, kw):
+    """Run all MPP searches, optionally across a process pool
+
+    Args:
+        targets (dict): Limit state names mapped to a reliability index (PMA)
+            or None (RIA)
+        seed (int or None): Base seed for random restarts; drawn from the
+            global random state if None and restarts are used
+
+    Returns:
+        dict: Search results keyed by (det row, limit state)
+
+    """
+    ## Normalize det levels for nearest-neighbor warm starts
+    if warm_start:
+        D = df_det.values.astype(float)
+        if D.shape[1] > 0:
+            D_range = D.max(axis=0) - D.min(axis=0)
+            D_range[D_range == 0] = 1
+            D = (D - D.min(axis=0)) / D_range
+        order = _form_path(D)
+    else:
+        D = None
+        order = list(range(df_det.shape[0]))
+
+    ## Split spatially contiguous chunks across workers
+    n_chunk = 1 if n_jobs is None else max([min([n_jobs, len(order)]), 1])
+    chunks = [list(c) for c in array_split(order, n_chunk) if len(c) > 0]
+    if seed is None:
+        seed = randint(2 ** 31 - 1) if kw["n_restart"] > 1 else 0
+    tasks = [
+        (D, key, i_key, target, rows, method, warm_start, seed, kw)
+        for i_key, (key, target) in enumerate(targets.items())
+        for rows in chunks
+    ]
+
+    results = _fork_map(lambda task: _form_chunk(model, df_det, *task), tasks, n_jobs)
+
+    return {(ind, key): res for chunk in results for ind, key, res in chunk}
+
+
 ## FORM
 # --------------------------------------------------
 @curry
@@ -40,6 +400,10 @@ def eval_form_pma(
     tol=1e-3,
     n_maxiter=25,
     n_restart=1,
+    method="SLSQP",
+    warm_start=False,
+    n_jobs=None,
+    seed=None,
     verbose=False,
 ):
     r"""Tail quantile via FORM PMA
@@ -50,6 +414,12 @@ def eval_form_pma(
     confidence levels `cons` and estimator covariance `df_corr` to compute with
     margin in beta [2].
 
+    The limit state is evaluated directly on arrays of standard normal values.
+    Gradients are analytic if every model function provides a jacobian, and
+    are otherwise forward differences evaluated as one batch per point. MPP
+    searches are independent, and may be run across a process pool with
+    `n_jobs`.
+
     Args:
         model (gr.Model): Model to analyze
         betas (dict): Target reliability indices;
@@ -64,6 +434,16 @@ def eval_form_pma(
             for nominal deterministic levels.
         n_maxiter (int): Maximum iterations for each optimization run
         n_restart (int): Number of restarts (== number of optimization runs)
+        method (str): MPP search method; "SLSQP" for constrained optimization,
+            "AMV" for the advanced mean value iteration [3]
+        warm_start (bool): Start each MPP search from the MPP of the nearest
+            solved det level? Det levels are visited along a nearest-neighbor
+            path.
+        n_jobs (int or None): Number of worker processes; None or 1 for serial
+            evaluation. Searches over det levels and limit states are split
+            into spatially contiguous chunks across workers.
+        seed (int or None): Random seed for restarts; results do not depend
+            on n_jobs
         append (bool): Append MPP results for random values?
         verbose (bool): Print optimization results?
 
@@ -77,6 +457,15 @@ def eval_form_pma(
     References:
         - [1] Tu, Choi, and Park, "A new study on reliability-based design optimization," Journal of Mechanical Design, 1999
         - [2] del Rosario, Fenrich, and Iaccarino, "Fast precision margin with the first-order reliability method," AIAA Journal, 2019
+        - [3] Wu, Millwater, and Cruse, "Advanced probabilistic structural analysis method for implicit performance functions," AIAA Journal, 1990
+
+    Examples:
+
+        >>> import grama as gr
+        >>> from grama.models import make_cantilever_beam
+        >>> md = make_cantilever_beam()
+        >>> md >> gr.ev_form_pma(df_det="nom", betas=dict(g_stress=3))
+        >>> md >> gr.ev_form_pma(df_det="nom", betas=dict(g_stress=3), method="AMV")
 
     """
     ## Check invariants
@@ -93,6 +482,8 @@ def eval_form_pma(
             if df_corr is None:
                 raise ValueError("Must provide df_corr is using cons")
         raise NotImplementedError
+    if method.lower() not in ["slsqp", "amv"]:
+        raise ValueError("method must be 'SLSQP' or 'AMV'")
 
     df_det = model.var_outer(
         DataFrame(data=zeros((1, model.n_var_rand)), columns=model.var_rand),
@@ -100,74 +491,34 @@ def eval_form_pma(
     )
     df_det = df_det[model.var_det]
 
+    ## Run MPP searches
+    kw = dict(tol=tol, n_maxiter=n_maxiter, n_restart=n_restart)
+    results = _form_run(
+        model, df_det, betas, method.lower(), warm_start, n_jobs, seed, kw
+    )
+
     df_return = DataFrame()
     for ind in range(df_det.shape[0]):
         ## Loop over objectives
         for key in betas.keys():
             ## Temp dataframe
             df_inner = df_det.iloc[[ind]].reset_index(drop=True)
+            res = results[(ind, key)]
 
-            ## Construct lambdas
-            def objective(z):
-                ## Transform: standard normal-to-random variable
-                df_norm = DataFrame(data=[z], columns=model.var_rand)
-                df_rand = model.norm2rand(df_norm)
-                df = model.var_outer(df_rand, df_det=df_inner)
-
-                df_res = gr.eval_df(model, df=df)
-                g = df_res[key].iloc[0]
-
-                # return (g, jac)
-                return g
-
-            def con_beta(z):
-                return z.dot(z) - (betas[key]) ** 2
-
-            ## Use conservative direction for initial guess
-            signs = array([model.density.marginals[k].sign for k in model.var_rand])
-            if length(signs) > 0:
-                z0 = betas[key] * signs / length(signs)
-            else:
-                z0 = betas[key] * ones(model.n_var_rand) / sqrt(model.n_var_rand)
-
-            ## Minimize
-            res_all = []
-            for jnd in range(n_restart):
-                res = minimize(
-                    objective,
-                    z0,
-                    args=(),
-                    method="SLSQP",
-                    jac=False,
-                    tol=tol,
-                    options={"maxiter": n_maxiter, "disp": False},
-                    constraints=[{"type": "eq", "fun": con_beta}],
-                )
-                # Append only a successful result
-                if res["status"] == 0:
-                    res_all.append(res)
-                # Set a random start; repeat
-                z0 = multivariate_normal([0] * model.n_var_rand, eye(model.n_var_rand))
-                z0 = z0 / length(z0) * betas[key]
-
-            # Choose value among restarts
-            n_iter_total = sum([res_all[i].nit for i in range(len(res_all))])
-            if len(res_all) > 0:
-                i_star = argmin([res.fun for res in res_all])
-                x_star = res_all[i_star].x
-                fun_star = res_all[i_star].fun
+            if res["z"] is not None:
+                x_star = res["z"]
+                fun_star = res["fun"]
                 if verbose:
                     print("out = {}: Optimization successful".format(key))
-                    print("n_iter = {}".format(res_all[i_star].nit))
-                    print("n_iter_total = {}".format(n_iter_total))
+                    print("n_iter = {}".format(res["nit"]))
+                    print("n_iter_total = {}".format(res["nit_total"]))
             else:
                 ## WARNING
                 x_star = [NaN] * model.n_var_rand
                 fun_star = NaN
                 if verbose:
                     print("out = {}: Optimization unsuccessful".format(key))
-                    print("n_iter = {}".format(res_all[i_star].nit))
-                    print("n_iter_total = {}".format(n_iter_total))
+                    print("n_iter_total = {}".format(res["nit_total"]))
 
             ## Extract results
             if append:
@@ -208,6 +559,10 @@ def eval_form_ria(
     tol=1e-3,
     n_maxiter=25,
     n_restart=1,
+    method="SLSQP",
+    warm_start=False,
+    n_jobs=None,
+    seed=None,
     verbose=False,
 ):
     r"""Tail reliability via FORM RIA
@@ -218,6 +573,12 @@ def eval_form_ria(
     `cons` and estimator covariance `df_corr` to compute with margin in beta
     [2].
 
+    The limit state is evaluated directly on arrays of standard normal values.
+    Gradients are analytic if every model function provides a jacobian, and
+    are otherwise forward differences evaluated as one batch per point. MPP
+    searches are independent, and may be run across a process pool with
+    `n_jobs`.
+
     Args:
         model (gr.Model): Model to analyze
         limits (list): Target limit states; must be in model.out; limit state
@@ -231,6 +592,16 @@ def eval_form_ria(
             for nominal deterministic levels.
         n_maxiter (int): Maximum iterations for each optimization run
         n_restart (int): Number of restarts (== number of optimization runs)
+        method (str): MPP search method; "SLSQP" for constrained optimization,
+            "iHLRF" for the improved HL-RF iteration [3]
+        warm_start (bool): Start each MPP search from the MPP of the nearest
+            solved det level? Det levels are visited along a nearest-neighbor
+            path.
+        n_jobs (int or None): Number of worker processes; None or 1 for serial
+            evaluation. Searches over det levels and limit states are split
+            into spatially contiguous chunks across workers.
+        seed (int or None): Random seed for restarts; results do not depend
+            on n_jobs
         append (bool): Append MPP results for random values?
         verbose (bool): Print optimization results?
 
@@ -244,6 +615,15 @@ def eval_form_ria(
     References:
         - [1] Tu, Choi, and Park, "A new study on reliability-based design optimization," Journal of Mechanical Design, 1999
         - [2] del Rosario, Fenrich, and Iaccarino, "Fast precision margin with the first-order reliability method," AIAA Journal, 2019
+        - [3] Zhang and Der Kiureghian, "Finite element reliability methods for inelastic structures," Report No. UCB/SEMM-97/05, 1997
+
+    Examples:
+
+        >>> import grama as gr
+        >>> from grama.models import make_cantilever_beam
+        >>> md = make_cantilever_beam()
+        >>> md >> gr.ev_form_ria(df_det="nom", limits=["g_stress"])
+        >>> md >> gr.ev_form_ria(df_det="nom", limits=["g_stress"], method="iHLRF")
 
     """
     ## Check invariants
@@ -260,6 +640,8 @@ def eval_form_ria(
             if df_corr is None:
                 raise ValueError("Must provide df_corr is using cons")
         raise NotImplementedError
+    if method.lower() not in ["slsqp", "ihlrf"]:
+        raise ValueError("method must be 'SLSQP' or 'iHLRF'")
 
     df_det = model.var_outer(
         DataFrame(data=zeros((1, model.n_var_rand)), columns=model.var_rand),
@@ -267,6 +649,19 @@ def eval_form_ria(
     )
     df_det = df_det[model.var_det]
 
+    ## Run MPP searches
+    kw = dict(tol=tol, n_maxiter=n_maxiter, n_restart=n_restart)
+    results = _form_run(
+        model,
+        df_det,
+        {key: None for key in limits},
+        method.lower(),
+        warm_start,
+        n_jobs,
+        seed,
+        kw,
+    )
+
     # df_return = DataFrame(columns=model.var_rand + model.var_det + limits)
     df_return = DataFrame()
     for ind in range(df_det.shape[0]):
@@ -274,72 +669,22 @@ def eval_form_ria(
         for key in limits:
             ## Temp dataframe
             df_inner = df_det.iloc[[ind]].reset_index(drop=True)
+            res = results[(ind, key)]
 
-            ## Construct lambdas
-            def fun_jac(z):
-                ## Squared reliability index
-                fun = z.dot(z)
-                jac = 2 * z * length(z)
-
-                return (fun, jac)
-
-            def con_limit(z):
-                ## Transform: standard normal-to-random variable
-                df_norm = DataFrame(data=[z], columns=model.var_rand)
-                df_rand = model.norm2rand(df_norm)
-                df = model.var_outer(df_rand, df_det=df_inner)
-
-                ## Eval limit state
-                df_res = gr.eval_df(model, df=df)
-                g = df_res[key].iloc[0]
-
-                return g
-
-            ## Use conservative direction for initial guess
-            signs = array([model.density.marginals[k].sign for k in model.var_rand])
-            if length(signs) > 0:
-                z0 = signs / length(signs)
-            else:
-                z0 = ones(model.n_var_rand) / sqrt(model.n_var_rand)
-
-            ## Minimize
-            res_all = []
-            for jnd in range(n_restart):
-                res = minimize(
-                    fun_jac,
-                    z0,
-                    args=(),
-                    method="SLSQP",
-                    jac=True,
-                    tol=tol,
-                    options={"maxiter": n_maxiter, "disp": False},
-                    constraints=[{"type": "eq", "fun": con_limit}],
-                )
-                # Append only a successful result
-                if res["status"] == 0:
-                    res_all.append(res)
-                # Set a random start; repeat
-                z0 = multivariate_normal([0] * model.n_var_rand, eye(model.n_var_rand))
-                z0 = z0 / length(z0)
-
-            # Choose value among restarts
-            n_iter_total = sum([res_all[i].nit for i in range(len(res_all))])
-            if len(res_all) > 0:
-                i_star = argmin([res.fun for res in res_all])
-                x_star = res_all[i_star].x
-                fun_star = sqrt(res_all[i_star].fun)
+            if res["z"] is not None:
+                x_star = res["z"]
+                fun_star = sqrt(res["fun"])
                 if verbose:
                     print("out = {}: Optimization successful".format(key))
-                    print("n_iter = {}".format(res_all[i_star].nit))
-                    print("n_iter_total = {}".format(n_iter_total))
+                    print("n_iter = {}".format(res["nit"]))
+                    print("n_iter_total = {}".format(res["nit_total"]))
             else:
                 ## WARNING
                 x_star = [NaN] * model.n_var_rand
                 fun_star = NaN
                 if verbose:
                     print("out = {}: Optimization unsuccessful".format(key))
-                    print("n_iter = {}".format(res_all[i_star].nit))
-                    print("n_iter_total = {}".format(n_iter_total))
+                    print("n_iter_total = {}".format(res["nit_total"]))
 
             ## Extract results
             if append:
@@ -366,3 +711,288 @@ def eval_form_ria(
 
 
 ev_form_ria = add_pipe(eval_form_ria)
+
+
+## Importance sampling
+# --------------------------------------------------
+@curry
+def eval_importance(
+    model,
+    limits=None,
+    df_det=None,
+    n=1000,
+    df_mpp=None,
+    alpha=0.05,
+    seed=None,
+):
+    r"""Failure probability via importance sampling
+
+    Estimate failure probabilities (limit state g <= 0) by importance sampling
+    about the most probable point (MPP) of each limit state [1]. Samples are
+    drawn from a unit normal centered at the MPP in standard normal space,
+    mapped to the model's random variables, and weighted by the likelihood
+    ratio. Unlike FORM, the estimate is unbiased regardless of limit state
+    curvature.
+
+    Args:
+        model (gr.Model): Model to analyze
+        limits (list): Target limit states; must be in model.out; limit state
+            assumed to be critical at g == 0
+        df_det (DataFrame): Deterministic levels for evaluation; use "nom"
+            for nominal deterministic levels.
+        n (int): Number of samples per limit state and deterministic level
+        df_mpp (DataFrame or None): MPP results from gr.eval_form_ria() with
+            append=True, for the same df_det; MPPs are computed if None
+        alpha (float): Significance level; intervals have confidence level
+            1 - alpha. Value in (0, 1)
+        seed (int): Random seed to use
+
+    Returns:
+        DataFrame: One row per deterministic level, with the failure
+            probability estimate "pof_[limit]" and its confidence interval
+            bounds "pof_[limit]_lo" and "pof_[limit]_up"
+
+    References:
+        - [1] Melchers, "Importance sampling in structural systems," Structural Safety, 1989
+
+    Examples:
+
+        >>> import grama as gr
+        >>> from grama.models import make_cantilever_beam
+        >>> md = make_cantilever_beam()
+        >>> md >> gr.ev_importance(df_det="nom", limits=["g_stress"], n=1000)
+
+    """
+    ## Check invariants
+    if limits is None:
+        raise ValueError(
+            "Must provide `limits` keyword argument to define reliability targets"
+        )
+    if not set(limits).issubset(set(model.out)):
+        raise ValueError("`limits` must be subset of model.out")
+
+    ## Set seed only if given
+    if seed is not None:
+        set_seed(seed)
+    n = int(n)
+    z_alpha = -norm.ppf(alpha / 2)
+
+    df_det = model.var_outer(
+        DataFrame(data=zeros((1, model.n_var_rand)), columns=model.var_rand),
+        df_det=df_det,
+    )
+    df_det = df_det[model.var_det]
+
+    df_return = DataFrame()
+    for ind in range(df_det.shape[0]):
+        df_inner = df_det.iloc[[ind]].reset_index(drop=True)
+        results = {}
+
+        for key in limits:
+            ## Locate the MPP in standard normal space
+            if df_mpp is None:
+                df_key = eval_form_ria(model, limits=[key], df_det=df_inner)
+            else:
+                df_key = df_mpp[df_mpp["beta_" + key].notna()]
+                if model.n_var_det > 0:
+                    df_key = df_key[
+                        (df_key[model.var_det].values == df_inner.values).all(axis=1)
+                    ]
+                if df_key.shape[0] != 1:
+                    raise ValueError(
+                        "df_mpp must contain one MPP for {} per deterministic "
+                        "level".format(key)
+                    )
+            z_star = model.x2z(df_key[model.var_rand].values[0])
+
+            if not isfinite(z_star).all():
+                pof, hw = NaN, NaN
+            else:
+                ## Sample about the MPP; weight by likelihood ratio
+                Z = z_star + standard_normal((n, model.n_var_rand))
+                W = exp(-Z.dot(z_star) + 0.5 * z_star.dot(z_star))
+                df_rand = DataFrame(data=model.z2x(Z), columns=model.var_rand)
+                df_res = gr.eval_df(model, df=model.var_outer(df_rand, df_det=df_inner))
+
+                Y = (df_res[key].values <= 0) * W
+                pof = Y.mean()
+                hw = z_alpha * Y.std(ddof=1) / sqrt(n)
+
+            results["pof_" + key] = pof
+            results["pof_" + key + "_lo"] = max([pof - hw, 0])
+            results["pof_" + key + "_up"] = min([pof + hw, 1])
+
+        df_return = concat((df_return, df_inner.assign(**results)), axis=0, sort=False)
+
+    return df_return.reset_index(drop=True)
+
+
+ev_importance = add_pipe(eval_importance)
+
+
+## Subset simulation
+# --------------------------------------------------
+def _subset_gamma(I):
+    ## Correlation factor for the CoV of a level's estimate; Au and Beck
+    ## (2001). I is the failure indicator, shape (chain length, n_chains)
+    L, n_c = I.shape
+    N = L * n_c
+    p = I.mean()
+    R0 = p * (1 - p)
+    if R0 == 0:
+        return 0.0
+
+    gamma = 0.0
+    for k in range(1, L):
+        R = (I[:-k] * I[k:]).mean() - p ** 2
+        gamma += 2 * (1 - k * n_c / N) * R / R0
+
+    return gamma
+
+
+@curry
+def eval_subset_sim(
+    model,
+    limit=None,
+    df_det=None,
+    n_per_level=1000,
+    p0=0.1,
+    rho=0.8,
+    n_max_level=20,
+    seed=None,
+):
+    r"""Failure probability via subset simulation
+
+    Estimate a small failure probability (limit state g <= 0) by subset
+    simulation [1]: The failure event is expressed as a sequence of nested
+    intermediate events, each with conditional probability about p0. Samples
+    conditional on each intermediate event are generated by Markov chains in
+    standard normal space, using conditional sampling [2]. All chains take
+    each step together, so every step is a single batch evaluation through
+    eval_df().
+
+    Args:
+        model (gr.Model): Model to analyze
+        limit (str): Target limit state; must be in model.out; limit state
+            assumed to be critical at g == 0
+        df_det (DataFrame): Deterministic levels for evaluation; use "nom"
+            for nominal deterministic levels.
+        n_per_level (int): Number of samples per level
+        p0 (float): Conditional probability of intermediate levels; value in
+            (0, 1), such that 1 / p0 is an integer dividing n_per_level
+        rho (float): Correlation between successive chain states; value in
+            (0, 1). Larger values move more slowly, but accept more often.
+        n_max_level (int): Maximum number of levels; if the failure region is
+            not reached within n_max_level levels a RuntimeWarning is issued,
+            and the estimate is biased high
+        seed (int): Random seed to use
+
+    Returns:
+        DataFrame: One row per deterministic level, with the failure
+            probability estimate "pof_[limit]", its estimated coefficient of
+            variation "cov_[limit]", and the number of levels and model
+            evaluations used
+
+    References:
+        - [1] Au and Beck, "Estimation of small failure probabilities in high dimensions by subset simulation," Probabilistic Engineering Mechanics, 2001
+        - [2] Papaioannou, Betz, Zwirglmaier, and Straub, "MCMC algorithms for subset simulation," Probabilistic Engineering Mechanics, 2015
+
+    Examples:
+
+        >>> import grama as gr
+        >>> from grama.models import make_cantilever_beam
+        >>> md = make_cantilever_beam()
+        >>> md >> gr.ev_subset_sim(df_det="nom", limit="g_stress")
+
+    """
+    ## Check invariants
+    if limit is None:
+        raise ValueError("Must provide `limit` keyword argument")
+    if limit not in model.out:
+        raise ValueError("`limit` must be in model.out")
+    n_per_level = int(n_per_level)
+    n_chain = int(round(n_per_level * p0))
+    if (n_chain < 1) or (n_chain * int(round(1 / p0)) != n_per_level):
+        raise ValueError("1 / p0 must be an integer dividing n_per_level")
+    n_step = n_per_level // n_chain
+
+    ## Set seed only if given
+    if seed is not None:
+        set_seed(seed)
+
+    df_det = model.var_outer(
+        DataFrame(data=zeros((1, model.n_var_rand)), columns=model.var_rand),
+        df_det=df_det,
+    )
+    df_det = df_det[model.var_det]
+
+    df_return = DataFrame()
+    for ind in range(df_det.shape[0]):
+        df_inner = df_det.iloc[[ind]].reset_index(drop=True)
+
+        def fun_limit(Z):
+            ## Batch evaluation of limit state at standard normal points
+            df_rand = DataFrame(data=model.z2x(Z), columns=model.var_rand)
+            df_res = gr.eval_df(model, df=model.var_outer(df_rand, df_det=df_inner))
+            return df_res[limit].values
+
+        ## Level 0: Simple Monte Carlo
+        Z = standard_normal((n_per_level, model.n_var_rand))
+        G = fun_limit(Z)
+        n_eval = n_per_level
+        pof = 1.0
+        cov2 = 0.0
+        gamma = 0.0
+
+        for i_level in range(n_max_level):
+            ## Intermediate threshold; the p0-quantile of the present level
+            order = argsort(G)
+            b = max([(G[order[n_chain - 1]] + G[order[n_chain]]) / 2, 0])
+            I = G <= b
+            p_level = I.mean()
+            cov2 += (1 - p_level) / (n_per_level * p_level) * (1 + gamma)
+            pof *= p_level
+
+            if b <= 0:
+                break
+            if i_level == n_max_level - 1:
+                warnings.warn(
+                    "eval_subset_sim() reached n_max_level before the failure "
+                    "region at deterministic level {}; pof is biased high".format(ind),
+                    RuntimeWarning,
+                )
+                break
+
+            ## Conditional sampling from the seeds, all chains in one batch
+            Z_chain = zeros((n_step, n_chain, model.n_var_rand))
+            G_chain = zeros((n_step, n_chain))
+            Z_chain[0] = Z[order[:n_chain]]
+            G_chain[0] = G[order[:n_chain]]
+            for k in range(1, n_step):
+                Z_prop = rho * Z_chain[k - 1] + sqrt(1 - rho ** 2) * standard_normal(
+                    (n_chain, model.n_var_rand)
+                )
+                G_prop = fun_limit(Z_prop)
+                n_eval += n_chain
+                accept = G_prop <= b
+                Z_chain[k] = where(accept[:, None], Z_prop, Z_chain[k - 1])
+                G_chain[k] = where(accept, G_prop, G_chain[k - 1])
+
+            Z = Z_chain.reshape((n_per_level, model.n_var_rand))
+            G = G_chain.reshape(n_per_level)
+
+            ## Chain correlation for next level's estimate
+            order_next = argsort(G)
+            b_next = max([(G[order_next[n_chain - 1]] + G[order_next[n_chain]]) / 2, 0])
+            gamma = _subset_gamma(G_chain <= b_next)
+
+        df_inner["pof_" + limit] = pof
+        df_inner["cov_" + limit] = sqrt(cov2)
+        df_inner["n_level"] = i_level + 1
+        df_inner["n_eval"] = n_eval
+        df_return = concat((df_return, df_inner), axis=0, sort=False)
+
+    return df_return.reset_index(drop=True)
+
+
+ev_subset_sim = add_pipe(eval_subset_sim)
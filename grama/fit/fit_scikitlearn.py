@@ -107,6 +107,29 @@ class FunctionGPR(gr.Function):
 
         return func_new
 
+    def refit(self, df):
+        """Refit to new data, holding the fitted kernel hyperparameters fixed
+
+        Args:
+            df (DataFrame): Data with columns var and the modeled output
+
+        Returns:
+            FunctionGPR: Function with the same kernel, conditioned on df
+        """
+        gpr = clone(self.gpr).set_params(kernel=self.gpr.kernel_, optimizer=None)
+        df_sd = standardize_cols(df, self.var_min, self.var_max, self.var)
+        gpr.fit(df_sd[self.var], df_sd[self.out_nat[0]])
+
+        return FunctionGPR(
+            gpr,
+            self.var,
+            self.out_nat,
+            self.name,
+            self.runtime,
+            self.var_min,
+            self.var_max,
+        )
+
 
 class FunctionRegressor(gr.Function):
     def __init__(self, regressor, var, out, name, runtime):
@@ -4,6 +4,7 @@ __all__ = [
     "custom_formatwarning",
     "df_equal",
     "df_make",
+    "marg_empirical",
     "marg_gkde",
     "marg_named",
     "param_dist",
@@ -15,7 +16,9 @@ import grama as gr
 import pandas as pd
 import warnings
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from functools import wraps
+from multiprocessing import get_context, get_all_start_methods
 from numbers import Integral
 from inspect import signature
 
@@ -498,7 +501,131 @@ def marg_gkde(data, sign=None):
     return gr.MarginalGKDE(kde, sign=sign)
 
 
+## Fit an empirical distribution to data
+def marg_empirical(data, sign=None, smooth=False, bins="auto"):
+    r"""Fit an empirical distribution to data
+
+    Uses the empirical distribution of data as a marginal. Sampling costs a
+    binary search per sample, independent of the size of the dataset, which
+    makes this much faster than a KDE for resampling large datasets.
+
+    Args:
+        data (iterable): Data for fit
+        sign (bool): Include sign? (Optional)
+        smooth (bool): Use a (binned) gaussian KDE for the density function?
+            Uses a histogram if False.
+        bins (int or str): Histogram bins; see numpy.histogram. Ignored if
+            smooth == True.
+
+    Returns:
+        gr.MarginalEmpirical: Marginal distribution
+
+    Examples:
+
+        >>> import grama as gr
+        >>> from grama.data import df_stang
+        >>> md = gr.Model("Marginal Example") >> \
+        >>>     gr.cp_marginals(
+        >>>         E=gr.marg_empirical(df_stang.E),
+        >>>         mu=gr.marg_empirical(df_stang.mu)
+        >>>     )
+        >>> md.printpretty()
+
+    """
+    ## Catch case where user provides entire DataFrame
+    if isinstance(data, pd.DataFrame):
+        raise ValueError("`data` argument must be a single column; try data.var")
+
+    if sign is not None:
+        if not (sign in [-1, 0, +1]):
+            raise ValueError("Invalid `sign`")
+    else:
+        sign = 0
+
+    return gr.MarginalEmpirical(data, smooth=smooth, bins=bins, sign=sign)
+
+
 ## Monkey-patched warning fcn
 def custom_formatwarning(msg, *args, **kwargs):
     # ignore everything except the message
     return "Warning: " + str(msg) + "\n"
+
+
+## Process-parallel map over forked workers
+_FORK_STATE = {}
+
+
+def _fork_apply(arg):
+    return _FORK_STATE["fun"](arg)
+
+
+def _fork_map(fun, args, n_jobs=None, stop=None):
+    r"""Map a function over arguments across forked worker processes
+
+    Workers are started with the "fork" method and inherit `fun` from the
+    parent process, so `fun` and anything it closes over (e.g. models, whose
+    functions are typically lambdas) need not be pickled. Each entry of args is
+    still pickled to send it to a worker, as is each result on the way back;
+    pass small arguments such as indices and close over large data instead.
+    Falls back to a serial map if n_jobs is None or 1, or if "fork" is
+    unavailable on the platform.
+
+    Args:
+        fun (function): Function to apply to each argument
+        args (list): Arguments
+        n_jobs (int or None): Number of worker processes
+        stop (function or None): Early termination rule; called with the dict
+            of results {index: result} for the leading arguments completed so
+            far, returns True to cancel any remaining work. The rule only sees
+            a contiguous prefix of the arguments, so the returned results are
+            the same as for a serial map, whatever the completion order.
+
+    Returns:
+        list: Completed results, ordered by argument index; the prefix at which
+            stop returned True, if it did
+
+    """
+    results = {}
+    if (n_jobs is not None) and (n_jobs > 1) and (len(args) > 1):
+        if "fork" not in get_all_start_methods():
+            warnings.formatwarning = custom_formatwarning
+            warnings.warn(
+                "n_jobs > 1 requires the 'fork' start method; running serially"
+            )
+            n_jobs = None
+
+    ## Serial map
+    if (n_jobs is None) or (n_jobs == 1) or (len(args) < 2):
+        for i, arg in enumerate(args):
+            results[i] = fun(arg)
+            if (stop is not None) and stop(results):
+                break
+
+        return [results[i] for i in sorted(results)]
+
+    ## Parallel map
+    _FORK_STATE["fun"] = fun
+    try:
+        with ProcessPoolExecutor(
+            max_workers=n_jobs, mp_context=get_context("fork")
+        ) as executor:
+            futures = {
+                executor.submit(_fork_apply, arg): i for i, arg in enumerate(args)
+            }
+            n_prefix = 0
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                if stop is None:
+                    continue
+                ## Test the rule on each newly completed leading argument
+                while n_prefix in results:
+                    n_prefix += 1
+                    prefix = {i: results[i] for i in range(n_prefix)}
+                    if stop(prefix):
+                        for future_pending in futures:
+                            future_pending.cancel()
+                        return [prefix[i] for i in range(n_prefix)]
+    finally:
+        _FORK_STATE.clear()
+
+    return [results[i] for i in sorted(results)]
@@ -9,9 +9,16 @@ __all__ = [
     "tf_pca",
     "tran_sobol",
     "tf_sobol",
+    "tran_sobol_given_data",
+    "tf_sobol_given_data",
+    "tran_morris",
+    "tf_morris",
 ]
 
-from numpy import round, dot
+from numpy import round, dot, array, argsort, bincount, concatenate, newaxis, errstate
+from numpy import arange, empty, take_along_axis, sqrt, ceil, sign, tile
+from numpy import abs as npabs
+from numpy import repeat
 from numpy.linalg import svd
 from pandas import concat, DataFrame
 
@@ -43,12 +50,15 @@ def tran_sobol(df, typename="ind", digits=2, full=False):
         DataFrame: Sobol' indices
 
     Notes:
-        - Index type ["first", "total"] is inferred from input df._meta;
-          this is assigned by gr.eval_hybrid().
+        - Index type ["first", "total", "both"] is inferred from input
+          df._meta; this is assigned by gr.eval_hybrid().
         - Index normalization coded in the "ind" column;
           S: Normalized index
           T: Un-normalized index
           var: Total variance
+        - The "both" plan reports first-order indices as "S_[var]" and total
+          indices as "ST_[var]" (Saltelli et al., 2010; Jansen, 1999), and
+          second-order indices as "S_[var1]:[var2]" if available.
 
     References:
         I.M. Sobol', "Sensitivity Estimates for Nonlinear Mathematical Models"
@@ -64,6 +74,9 @@ def tran_sobol(df, typename="ind", digits=2, full=False):
         >>>
         >>> df_total = md >> gr.ev_hybrid(df_det="nom", plan="total")
         >>> df_total >> gr.tf_sobol()
+        >>>
+        >>> df_both = md >> gr.ev_hybrid(df_det="nom", plan="both")
+        >>> df_both >> gr.tf_sobol()
 
     """
     ## Determine plan from dataframe metadata
@@ -73,74 +86,180 @@ def tran_sobol(df, typename="ind", digits=2, full=False):
         varname = metadata["varname"]
         var_rand = metadata["var_rand"]
         out = metadata["out"]
+        second = metadata.get("second", False)
     else:
         raise ValueError("df not hybrid points!")
 
     ## Check invariants
     if not (varname in df.columns):
         raise ValueError("{} not in df.columns".format(varname))
+    if plan not in ["first", "total", "both"]:
+        raise ValueError("plan `{}` not valid".format(plan))
 
-    ## Setup
-    I_base = df[varname] == "_"
-    df_var = DataFrame(df[out].var()).transpose()
-    df_var[typename] = "var"
-
-    df_res = df_var.copy()
+    ## Group outputs by design block; shape (block, n, out)
+    labels = ["_"] + (["__"] if plan == "both" else []) + list(var_rand)
+    if second:
+        labels = labels + ["__" + var for var in var_rand]
+    codes = df[varname].map(dict(zip(labels, range(len(labels))))).values
+    counts = bincount(codes, minlength=len(labels))
+    if (counts != counts[0]).any():
+        raise ValueError("df must contain equal-size blocks of hybrid points")
+    Y = (
+        df[out]
+        .values[argsort(codes, kind="stable")]
+        .reshape((len(labels), counts[0], len(out)))
+    )
+
+    d = len(var_rand)
+    A = Y[0]
+    if plan == "both":
+        B, Y_var = Y[1], Y[2 : d + 2]
+        var = concatenate((A, B), axis=0).var(axis=0, ddof=1)
+    else:
+        Y_var = Y[1 : d + 1]
+        var = df[out].var().values
 
+    ## Estimate un-normalized indices
+    names = ["var"]
+    T = [var]
     if plan == "first":
-        mu_base = df[out][I_base].mean()
-
-        for i_var, var in enumerate(var_rand):
-            I_var = df[varname] == var
-
-            mu_var = df[out][I_var].mean()
-            mu_tot = 0.5 * (mu_base + mu_var)
-            s2_var = (
-                df[out][I_base]
-                .reset_index(drop=True)
-                .mul(df[out][I_var].reset_index(drop=True))
-            ).mean()
-
-            df_tau = DataFrame(s2_var - mu_tot ** 2).transpose()
-            df_tau[typename] = "T_" + var
-
-            df_index = (
-                df_tau[out]
-                .reset_index(drop=True)
-                .truediv(df_var.drop(columns=typename))
-            )
-            df_index[typename] = "S_" + var
+        mu_tot = 0.5 * (A.mean(axis=0) + Y_var.mean(axis=1))
+        T.extend((A[newaxis] * Y_var).mean(axis=1) - mu_tot ** 2)
+        names.extend(["T_" + v for v in var_rand])
+    elif plan == "total":
+        T.extend(0.5 * ((A[newaxis] - Y_var) ** 2).mean(axis=1))
+        names.extend(["T_" + v for v in var_rand])
+    else:
+        ## Saltelli (2010) first-order, Jansen total
+        T_first = (B[newaxis] * (Y_var - A[newaxis])).mean(axis=1)
+        T.extend(T_first)
+        T.extend(0.5 * ((A[newaxis] - Y_var) ** 2).mean(axis=1))
+        names.extend(["T_" + v for v in var_rand] + ["TT_" + v for v in var_rand])
+
+        ## Saltelli (2002) second-order, closed minus first-order effects
+        if second:
+            Y_ba = Y[d + 2 :]
+            for i, j in itertools.combinations(range(d), 2):
+                T_closed = (Y_ba[i] * Y_var[j] - A * B).mean(axis=0)
+                T.append(T_closed - T_first[i] - T_first[j])
+                names.append("T_{}:{}".format(var_rand[i], var_rand[j]))
+
+    T = array(T)
+    df_res = DataFrame(data=T, columns=out)
+    df_res[typename] = names
+    with errstate(divide="ignore", invalid="ignore"):
+        df_index = DataFrame(data=T[1:] / var[newaxis], columns=out)
+    df_index[typename] = ["S" + name[1:] for name in names[1:]]
+    df_res = concat((df_res, df_index))
 
-            df_res = concat((df_res, df_tau, df_index))
+    ## Post-process
+    outputs = df_res.drop(typename, axis=1).columns
+    df_res[outputs] = df_res[outputs].apply(lambda row: round(row, decimals=digits))
+    df_res.sort_values(typename, inplace=True)
 
-    elif plan == "total":
-        for i_var, var in enumerate(var_rand):
-            I_var = df[varname] == var
-            s2_var = (
-                (
-                    df[out][I_base].reset_index(drop=True)
-                    - df[out][I_var].reset_index(drop=True)
-                )
-                ** 2
-            ).mean() * 0.5
+    ## Filter, if necessary
+    if not full:
+        I_normalized = list(map(lambda s: s[0] == "S", df_res[typename]))
+        df_res = df_res[I_normalized]
 
-            df_tau = DataFrame(s2_var).transpose()
-            df_tau[typename] = "T_" + var
+    ## Fill NaN's
+    df_res.fillna(value=0, inplace=True)
 
-            df_index = (
-                df_tau.drop(columns=typename)
-                .reset_index(drop=True)
-                .truediv(df_var.drop(columns=typename))
-            )
-            df_index[typename] = "S_" + var
+    return df_res
+
+
+tf_sobol = add_pipe(tran_sobol)
+
+
+@curry
+def tran_sobol_given_data(
+    df, var=None, out=None, method="rank", typename="ind", digits=2, full=False
+):
+    r"""First-order Sobol' indices from given data
+
+    Estimate first-order Sobol' indices from independent, identically
+    distributed samples, such as results from gr.eval_monte_carlo() or
+    gr.eval_lhs(); no special design or additional model evaluations are
+    required. Costs O(n log n) per input, for sorting.
+
+    Args:
+        df (DataFrame): Samples of inputs and outputs
+        var (list of str): Input variables; must be independent
+        out (list of str): Outputs to analyze
+        method (str): Estimator to use;
+            "rank": Rank-based estimator of Gamboa et al. (2022), using
+                successive differences of outputs sorted by each input
+            "bin": Ratio of between-bin to total variance, with sqrt(n)
+                equal-count bins along each input
+        typename (str): Name to give index type column in results
+        digits (int): Number of digits for rounding reported results
+        full (bool): Return un-normalized indices and variance?
+
+    Returns:
+        DataFrame: Sobol' indices; same format as gr.tran_sobol()
+
+    References:
+        F. Gamboa, T. Klein, and A. Lagnoux, "Global sensitivity analysis: A
+        novel generation of mighty estimators based on rank statistics"
+        (2022) Bernoulli, Vol 28.
+
+    Examples:
+
+        >>> import grama as gr
+        >>> from grama.models import make_cantilever_beam
+        >>> md = make_cantilever_beam()
+        >>> df_mc = md >> gr.ev_monte_carlo(n=1e4, df_det="nom", seed=101)
+        >>> df_mc >> gr.tf_sobol_given_data(var=md.var_rand, out=md.out)
 
-            df_res = concat((df_res, df_tau, df_index))
+    """
+    ## Check invariants
+    if (var is None) or (out is None):
+        raise ValueError("Must provide var and out")
+    if not set(var + out).issubset(set(df.columns)):
+        raise ValueError("var and out must be subset of df.columns")
+    if method not in ["rank", "bin"]:
+        raise ValueError("method `{}` not valid".format(method))
+
+    X = df[var].values
+    Y = df[out].values.astype(float)
+    n = Y.shape[0]
+    Y_c = Y - Y.mean(axis=0)
+    SS = (Y_c ** 2).sum(axis=0)
+
+    ## Outputs sorted along each input; shape (n, var, out)
+    order = argsort(X, axis=0, kind="stable")
+    Y_sort = Y_c[order]
+
+    if method == "rank":
+        D2 = ((Y_sort[1:] - Y_sort[:-1]) ** 2).sum(axis=0)
+        with errstate(divide="ignore", invalid="ignore"):
+            S = 1 - D2 / (2 * SS[newaxis])
     else:
-        raise ValueError("plan `{}` not valid".format(plan))
+        n_bin = int(ceil(sqrt(n)))
+        ind_bin = arange(n) * n_bin // n
+        S = empty((len(var), len(out)))
+        for j in range(len(out)):
+            for i in range(len(var)):
+                sums = bincount(ind_bin, weights=Y_sort[:, i, j])
+                S[i, j] = (sums ** 2 / bincount(ind_bin)).sum()
+        with errstate(divide="ignore", invalid="ignore"):
+            S = S / SS[newaxis]
+
+    var_y = SS / (n - 1)
+    df_res = concat(
+        (
+            DataFrame(data=[var_y], columns=out).assign(**{typename: "var"}),
+            DataFrame(data=S * var_y[newaxis], columns=out).assign(
+                **{typename: ["T_" + v for v in var]}
+            ),
+            DataFrame(data=S, columns=out).assign(
+                **{typename: ["S_" + v for v in var]}
+            ),
+        )
+    )
 
     ## Post-process
-    outputs = df_res.drop(typename, axis=1).columns
-    df_res[outputs] = df_res[outputs].apply(lambda row: round(row, decimals=digits))
+    df_res[out] = df_res[out].apply(lambda row: round(row, decimals=digits))
     df_res.sort_values(typename, inplace=True)
 
     ## Filter, if necessary
@@ -154,7 +273,87 @@ def tran_sobol(df, typename="ind", digits=2, full=False):
     return df_res
 
 
-tf_sobol = add_pipe(tran_sobol)
+tf_sobol_given_data = add_pipe(tran_sobol_given_data)
+
+## Morris screening
+# --------------------------------------------------
+@curry
+def tran_morris(df):
+    r"""Post-process results from gr.eval_morris()
+
+    Compute elementary effect statistics from Morris trajectories (Morris,
+    1991; Campolongo et al., 2007). Elementary effects are measured in grid
+    units of input quantiles, so effects are comparable across inputs.
+
+    Args:
+        df (DataFrame): Trajectory results from gr.eval_morris()
+
+    Returns:
+        DataFrame: One row per input and output, with the mean elementary
+            effect "mu", mean absolute elementary effect "mu_star", and
+            standard deviation of elementary effects "sigma". Large mu_star
+            indicates an important input; large sigma indicates nonlinearity
+            or interactions.
+
+    References:
+        M.D. Morris, "Factorial sampling plans for preliminary computational
+        experiments" (1991) Technometrics, Vol 33.
+
+    Examples:
+
+        >>> import grama as gr
+        >>> from grama.models import make_cantilever_beam
+        >>> md = make_cantilever_beam()
+        >>> df_morris = md >> gr.ev_morris(r=20, df_det="nom", seed=101)
+        >>> df_morris >> gr.tf_morris()
+
+    """
+    ## Determine design from dataframe metadata
+    metadata = df._meta
+    if metadata["type"] == "eval_morris":
+        varname = metadata["varname"]
+        indname = metadata["indname"]
+        delta = metadata["delta"]
+        var_rand = metadata["var_rand"]
+        out = metadata["out"]
+    else:
+        raise ValueError("df not Morris trajectories!")
+
+    ## Check invariants
+    if not set([varname, indname]).issubset(set(df.columns)):
+        raise ValueError("{} and {} must be in df.columns".format(varname, indname))
+    d = len(var_rand)
+    r = df[indname].nunique()
+    if df.shape[0] != r * (d + 1):
+        raise ValueError("df must contain complete trajectories at one df_det level")
+
+    ## Arrange by trajectory; shape (r, d + 1, *)
+    order = argsort(df[indname].values, kind="stable")
+    X = df[var_rand].values[order].reshape((r, d + 1, d))
+    Y = df[out].values[order].reshape((r, d + 1, len(out)))
+    codes = (
+        df[varname].map(dict(zip(var_rand, range(d)))).values[order].reshape((r, d + 1))
+    )
+    codes = codes[:, 1:].astype(int)
+
+    ## Elementary effects, signed by step direction
+    dX = take_along_axis(X[:, 1:] - X[:, :-1], codes[:, :, newaxis], axis=2)
+    EE_step = (Y[:, 1:] - Y[:, :-1]) / (sign(dX) * delta)
+    EE = empty((r, d, len(out)))
+    EE[arange(r)[:, newaxis], codes] = EE_step
+
+    return DataFrame(
+        {
+            "var": tile(var_rand, len(out)),
+            "out": repeat(out, d),
+            "mu": EE.mean(axis=0).T.flatten(),
+            "mu_star": npabs(EE).mean(axis=0).T.flatten(),
+            "sigma": EE.std(axis=0, ddof=1).T.flatten(),
+        }
+    )
+
+
+tf_morris = add_pipe(tran_morris)
 
 ## Linear algebra tools
 ##################################################
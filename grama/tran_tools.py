@@ -369,7 +369,7 @@ tf_angles = add_pipe(tran_angles)
 
 ## Compute Gaussian copula correlations from data
 # --------------------------------------------------
-def tran_copula_corr(df, model=None, density=None):
+def tran_copula_corr(df, model=None, density=None, matrix=False):
     r"""Compute Gaussian copula correlations from data
 
     Convenience function to fit a Gaussian copula (correlations) based on data
@@ -380,9 +380,14 @@ def tran_copula_corr(df, model=None, density=None):
         df (DataFrame): Matrix of data for correlation estimation
         model (gr.Model): Model with defined marginals
         density (gr.Density): Density with defined marginals
+        matrix (bool): Return the full correlation matrix, rather than
+            long-format pairwise correlations? Recommended for many random
+            variables.
 
     Returns:
-        DataFrame: Correlation data ready for use with gr.comp_copula_gaussian()
+        DataFrame: Correlation data ready for use with gr.comp_copula_gaussian();
+            either long-format with columns ["var1", "var2", "corr"], or a
+            correlation matrix with var_rand as index and columns
 
     Examples:
 
@@ -410,20 +415,18 @@ def tran_copula_corr(df, model=None, density=None):
 
     ## Compute correlations
     df_mat = df_norm.corr()
-    Ind = triu_indices(len(density.marginals), 1)
-
-    ## Arrange
-    var_rand = df_mat.columns
-    var1_all = []
-    var2_all = []
-    corr_all = []
+    if matrix:
+        return df_mat
 
-    for i, j in zip(Ind[0], Ind[1]):
-        var1_all.append(var_rand[i])
-        var2_all.append(var_rand[j])
-        corr_all.append(df_mat.iloc[i, j])
+    ## Arrange upper-triangular entries
+    Ind = triu_indices(len(density.marginals), 1)
+    var_rand = df_mat.columns.values
 
-    return DataFrame(dict(var1=var1_all, var2=var2_all, corr=corr_all))
+    return DataFrame(
+        dict(
+            var1=var_rand[Ind[0]], var2=var_rand[Ind[1]], corr=df_mat.values[Ind],
+        )
+    )
 
 
 tf_copula_corr = add_pipe(tran_copula_corr)
@@ -7,6 +7,7 @@ setup(
     version="0.1.9",
     packages=[
         "grama",
+        "grama.comp",
         "grama.data",
         "grama.dfply",
         "grama.eval",
@@ -5,6 +5,10 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 
 import grama
 import grama.core as core
+try:
+    import grama.comp as comp
+except ModuleNotFoundError:
+    comp = None
 import grama.models as models
 import grama.data as data
 import grama.fit as fit
@@ -188,6 +188,26 @@ class TestModel(unittest.TestCase):
 
         self.assertTrue(np.allclose(dxdz_fd, dxdz_p))
 
+        ## Batch transforms match pointwise transforms
+        Z = np.array([[0.0, 0.0], [1.0, -0.5], [-2.0, 0.3]])
+        X = md.z2x(Z)
+        X_point = np.array([md.z2x(z_i) for z_i in Z])
+
+        self.assertTrue(np.allclose(X, X_point))
+        self.assertTrue(np.allclose(md.x2z(X), Z))
+
+        ## Batch jacobian matches pointwise jacobian
+        J = md.dxdz(Z)
+        J_point = np.array([md.dxdz(z_i) for z_i in Z])
+
+        self.assertTrue(J.shape == (3, 2, 2))
+        self.assertTrue(np.allclose(J, J_point))
+
+        ## Factored jacobian reconstructs full jacobian
+        A, W = md.dxdz(Z, factor=True)
+        self.assertTrue(W.shape == Z.shape)
+        self.assertTrue(np.allclose(A[np.newaxis] * W[:, np.newaxis, :], J))
+
     ## Test DAG construction
 
     def test_dag(self):
@@ -333,6 +353,18 @@ class TestDensity(unittest.TestCase):
 
         self.assertTrue(np.allclose(dudz_fd, dudz_p))
 
+        ## Generator sampling reproducible and correctly correlated
+        df_rng1 = copula.sample(n=10000, rng=np.random.default_rng(101))
+        df_rng2 = copula.sample(n=10000, rng=np.random.default_rng(101))
+
+        self.assertTrue(df_rng1.equals(df_rng2))
+        corr = np.corrcoef(norm.ppf(df_rng1.values).T)[0, 1]
+        self.assertTrue(abs(corr - 0.5) < 0.05)
+
+        ## Batch transforms invariant
+        Z = np.array([[0.0, 0.0], [1.0, -1.0], [0.5, 2.0]])
+        self.assertTrue(np.allclose(copula.u2z(copula.z2u(Z)), Z))
+
     def test_conversion(self):
         df_pr_true = pd.DataFrame(dict(x=[0.5], y=[0.5]))
         df_sp_true = pd.DataFrame(dict(x=[0.0], y=[0.0]))
@@ -343,6 +375,30 @@ class TestDensity(unittest.TestCase):
         self.assertTrue(gr.df_equal(df_pr_true, df_pr_res))
         self.assertTrue(gr.df_equal(df_sp_true, df_sp_res))
 
+        ## Columns follow marginal order
+        df_pr_perm = pd.DataFrame(dict(y=[0.5, 0.75], x=[0.25, 0.5]))
+        df_sp_perm = self.density.pr2sample(df_pr_perm)
+        self.assertTrue(list(df_sp_perm.columns) == ["x", "y"])
+        self.assertTrue(list(self.density.sample2pr(df_sp_perm).columns) == ["x", "y"])
+
+        ## Array version writes to given buffer
+        prval = np.array([[0.25, 0.5], [0.5, 0.75]])
+        out = np.zeros((2, 2))
+        res = self.density.pr2sample_array(prval, out=out)
+        self.assertTrue(res is out)
+        self.assertTrue(np.allclose(out, df_sp_perm[["x", "y"]].values))
+        self.assertTrue(
+            np.allclose(self.density.sample2pr_array(out, var=["x", "y"]), prval)
+        )
+
+        ## Parallel evaluation matches serial
+        self.assertTrue(
+            np.allclose(self.density.pr2sample_array(prval, n_jobs=2), out)
+        )
+
+        with self.assertRaises(ValueError):
+            self.density.pr2sample_array(prval, var=["x"])
+
     def test_sampling(self):
         df_sample = self.density.sample(n=1, seed=101)
 
@@ -409,6 +465,55 @@ class TestFunction(unittest.TestCase):
         self.assertTrue(func_copy.name == func.name)
         self.assertTrue(func_copy.runtime == func.runtime)
 
+    def test_jacobian(self):
+        md = (
+            gr.Model()
+            >> gr.cp_function(
+                fun=lambda x: [x[0] * x[1], x[0] + x[1] ** 2],
+                var=["a", "b"],
+                out=["u", "v"],
+                jac=lambda x: [[x[1], x[0]], [1, 2 * x[1]]],
+            )
+            >> gr.cp_vec_function(
+                fun=lambda df: gr.df_make(y=df.u * df.v + df.c),
+                var=["u", "v", "c"],
+                out=["y"],
+                jac=lambda df: gr.df_make(
+                    Dy_Du=df.v, Dy_Dv=df.u, Dy_Dc=np.ones(df.shape[0])
+                ),
+            )
+        )
+        df = pd.DataFrame(dict(a=[1.0, 0.5], b=[2.0, -1.0], c=[0.0, 1.0]))
+
+        ## Chain rule through the DAG matches finite differences
+        self.assertTrue(md.has_jac)
+        df_jac = md.evaluate_jac(df)
+        df_fd = gr.eval_grad_fd(md, df_base=df, h=1e-6, use_jac=False)
+        self.assertTrue(set(df_jac.columns) == set(df_fd.columns))
+        self.assertTrue(
+            np.allclose(df_jac[df_fd.columns].values, df_fd.values, atol=1e-6)
+        )
+        ## eval_grad_fd uses the analytic jacobian automatically
+        df_auto = gr.eval_grad_fd(md, df_base=df)
+        self.assertTrue(gr.df_equal(df_auto, df_jac[df_auto.columns]))
+        ## y = a^2 b + a b^3 + c
+        self.assertTrue(np.allclose(df_jac["Dy_Da"], [2 * 1 * 2 + 8, 2 * 0.5 * -1 - 1]))
+
+        ## Subset of variables
+        df_sub = md.evaluate_jac(df, var=["c"])
+        self.assertTrue(set(df_sub.columns) == {"Du_Dc", "Dv_Dc", "Dy_Dc"})
+
+        ## Jacobians survive copies and model composition
+        md_comp = gr.Model() >> gr.cp_md_det(md=md)
+        self.assertTrue(md_comp.copy().has_jac)
+        self.assertTrue(gr.df_equal(md_comp.evaluate_jac(df), df_jac, close=True))
+
+        ## Any function without a jacobian disables analytic derivatives
+        md_none = md >> gr.cp_function(fun=lambda x: x[0], var=["y"], out=["z"])
+        self.assertFalse(md_none.has_jac)
+        with self.assertRaises(ValueError):
+            md_none.evaluate_jac(df)
+
 
 ## Run tests
 if __name__ == "__main__":
@@ -7,7 +7,10 @@ from context import core
 from context import grama as gr
 from context import models
 from context import ev
+from context import fit
 from pyDOE import lhs
+from scipy.spatial.distance import pdist
+from sklearn.gaussian_process.kernels import RBF
 
 ##################################################
 class TestDefaults(unittest.TestCase):
@@ -94,6 +97,32 @@ class TestDefaults(unittest.TestCase):
         df_det = gr.eval_grad_fd(md_test, df_base=df_base, var="det", append=False)
         self.assertTrue(gr.df_equal(df_true[["Dy0_Dx1"]], df_det, close=True))
 
+        ## Forward differences
+        df_fwd = gr.eval_grad_fd(md_test, df_base=df_base, h=1e-6, method="forward")
+        self.assertTrue(
+            np.allclose(df_fwd[df_true.columns].values, df_true.values, atol=1e-4)
+        )
+
+        ## Per-variable stepsize
+        df_h = gr.eval_grad_fd(md_test, df_base=df_base, h=np.array([1e-4, 1e-5]))
+        self.assertTrue(np.allclose(df_h[df_true.columns].values, df_true.values))
+
+        ## Skip returns the full stencil
+        df_central = gr.eval_grad_fd(md_test, df_base=df_base, skip=True)
+        df_forward = gr.eval_grad_fd(
+            md_test, df_base=df_base, method="forward", skip=True
+        )
+        self.assertTrue(df_central.shape == (2 * 4, 2))
+        self.assertTrue(df_forward.shape == (2 * 3, 2))
+        self.assertTrue(set(df_central.columns) == set(md_test.var))
+
+        ## Fixed variables are carried along the stencil
+        df_sub = gr.eval_grad_fd(md_test, df_base=df_base, var=["x0"], skip=True)
+        self.assertTrue(all(df_sub["x1"].values == [0, 0, 1, 1]))
+
+        with self.assertRaises(ValueError):
+            gr.eval_grad_fd(md_test, df_base=df_base, method="backward")
+
     def test_conservative(self):
         ## Accuracy
         df_res = gr.eval_conservative(self.model_2d, quantiles=[0.1, 0.1])
@@ -213,6 +242,164 @@ class TestRandom(unittest.TestCase):
         df_noappend = gr.eval_monte_carlo(self.md, df_det="nom", append=False)
         self.assertTrue(set(df_noappend.columns) == set(self.md.out))
 
+    def test_monte_carlo_summarize(self):
+        md = self.md_mixed >> gr.cp_function(
+            fun=lambda x: x[0] - 0.1, var=["x0"], out=["g"]
+        )
+        df_res = gr.eval_monte_carlo(md, n=5000, df_det="nom", seed=101)
+        df_sum = gr.eval_monte_carlo(
+            md, n=5000, df_det="nom", seed=101, summarize=[0.1, 0.5], n_chunk=700
+        )
+
+        ## Chunked summary matches full sample
+        self.assertTrue(set(df_sum.out) == set(["y0", "g"]))
+        df_sum = df_sum.set_index("out").loc[["y0", "g"]]
+        self.assertTrue((df_sum.n == 5000).all())
+        self.assertTrue(np.allclose(df_sum["mean"], df_res[["y0", "g"]].mean()))
+        self.assertTrue(np.allclose(df_sum["sd"], df_res[["y0", "g"]].std()))
+        self.assertTrue(np.allclose(df_sum["pof"]["g"], (df_res.g <= 0).mean()))
+        lo, up = gr.binomial_ci(df_res.g <= 0)
+        self.assertTrue(np.allclose(df_sum.loc["g", ["pof_lo", "pof_up"]], [lo, up]))
+        self.assertTrue(
+            np.allclose(df_sum["q0.5"], df_res[["y0", "g"]].quantile(0.5), atol=5e-3)
+        )
+        self.assertTrue(
+            np.allclose(df_sum["q0.1"], df_res[["y0", "g"]].quantile(0.1), atol=5e-3)
+        )
+
+        ## Accumulators merge
+        acc1 = gr.SummaryAccumulator(["y0"]).update(df_res.iloc[:1000])
+        acc2 = gr.SummaryAccumulator(["y0"]).update(df_res.iloc[1000:])
+        acc = gr.SummaryAccumulator(["y0"]).update(df_res)
+        df_merged = acc1.merge(acc2).summary()
+        self.assertTrue(
+            np.allclose(
+                df_merged[["n", "mean", "sd", "pof"]],
+                acc.summary()[["n", "mean", "sd", "pof"]],
+            )
+        )
+        self.assertTrue(abs(df_merged["q0.95"][0] - df_res.y0.quantile(0.95)) < 5e-3)
+
+        ## QMC replicates
+        df_qmc = gr.eval_qmc(
+            md, n=256, n_rep=2, df_det="nom", seed=101, summarize=True, n_chunk=100
+        )
+        self.assertTrue(df_qmc.shape[0] == 4)
+        self.assertTrue(list(df_qmc.qmc_rep) == [0, 0, 1, 1])
+        self.assertTrue(np.allclose(df_qmc["mean"][df_qmc.out == "y0"], 0.5, atol=1e-2))
+
+    def test_monte_carlo_adaptive(self):
+        md = self.md_mixed >> gr.cp_function(
+            fun=lambda x: x[0] - 0.1, var=["x0"], out=["g"]
+        )
+        df_res, df_hist = gr.eval_monte_carlo_adaptive(
+            md,
+            target={"y0": {"mean": 0.02, "q0.5": 0.05}, "g": {"pof": 0.03}},
+            df_det="nom",
+            seed=101,
+        )
+        ## Stops once all targets are met
+        df_last = df_hist[df_hist.n == df_hist.n.max()]
+        self.assertTrue(df_res.shape[0] == df_hist.n.max())
+        self.assertTrue(df_res.shape[0] % 100 == 0)
+        self.assertTrue((df_last.hw <= df_last.hw_target).all())
+        self.assertFalse(
+            (df_hist[df_hist.n == 100].hw <= df_hist[df_hist.n == 100].hw_target).all()
+        )
+        ## Estimates are accurate
+        est = df_last.set_index("stat").est
+        self.assertTrue(abs(est["mean"] - 0.5) < 0.04)
+        self.assertTrue(abs(est["q0.5"] - 0.5) < 0.1)
+        self.assertTrue(abs(est["pof"] - 0.1) < 0.06)
+
+        ## Budget exhausted
+        with self.assertWarns(RuntimeWarning):
+            df_max, _ = gr.eval_monte_carlo_adaptive(
+                md, target={"y0": {"mean": 1e-4}}, max_n=150, df_det="nom"
+            )
+        self.assertTrue(df_max.shape[0] == 150)
+
+        with self.assertRaises(ValueError):
+            gr.eval_monte_carlo_adaptive(md, target={"foo": {"mean": 0.1}})
+        with self.assertRaises(ValueError):
+            gr.eval_monte_carlo_adaptive(md, target={"g": {"median": 0.1}})
+        # Malformed quantile levels fail before any evaluation
+        md_count = md >> gr.cp_vec_function(
+            fun=lambda df: self.fail("model evaluated"), var=["x0"], out=["h"]
+        )
+        for stat in ["qfoo", "q1.5", "q0"]:
+            with self.assertRaises(ValueError):
+                gr.eval_monte_carlo_adaptive(md_count, target={"g": {stat: 0.1}})
+
+    def test_multifidelity(self):
+        md_hi = (
+            gr.Model()
+            >> gr.cp_vec_function(
+                fun=lambda df: gr.df_make(y=df.x + 0.1 * np.sin(10 * df.x)),
+                var=["x"],
+                out=["y"],
+            )
+            >> gr.cp_marginals(x=dict(dist="uniform", loc=0, scale=1))
+            >> gr.cp_copula_independence()
+        )
+        md_lo = gr.Model() >> gr.cp_vec_function(
+            fun=lambda df: gr.df_make(y=df.x, z=df.x), var=["x"], out=["y", "z"]
+        )
+        mean_true = 0.5 + 0.01 * (1 - np.cos(10))
+
+        df_res = gr.eval_multifidelity(md_hi, md_lo, n_hi=50, n_lo=5000, seed=101)
+        self.assertTrue(list(df_res.out) == ["y"])
+        self.assertTrue(df_res.se[0] < 0.5 * df_res.se_mc[0])
+        self.assertTrue(abs(df_res["mean"][0] - mean_true) < 3 * df_res.se[0])
+        self.assertTrue(df_res.mean_lo[0] < mean_true < df_res.mean_up[0])
+
+        ## Automatic allocation
+        df_auto = gr.eval_multifidelity(md_hi, md_lo, n_hi=50, seed=101)
+        self.assertTrue(50 <= df_auto.n_lo[0] <= 5000)
+
+        with self.assertRaises(ValueError):
+            gr.eval_multifidelity(md_hi, md_lo, out=["z"])
+        with self.assertRaises(ValueError):
+            gr.eval_multifidelity(md_hi, md_lo, n_hi=50, n_lo=10)
+
+    def test_qmc(self):
+        df_min = gr.eval_qmc(self.md_mixed, n=8, df_det="nom", seed=101)
+        self.assertTrue(df_min.shape == (8, self.md_mixed.n_var + 1))
+        ## Scrambled Sobol' points are balanced
+        self.assertTrue(np.allclose(np.sort(np.floor(df_min.x0 * 8)), np.arange(8)))
+
+        df_piped = self.md_mixed >> gr.ev_qmc(n=8, df_det="nom", seed=101)
+        self.assertTrue(df_min.equals(df_piped))
+
+        ## Chunks stream the same sequence
+        df_chunks = pd.concat(
+            [
+                gr.eval_qmc(self.md_mixed, n=4, df_det="nom", seed=101),
+                gr.eval_qmc(self.md_mixed, n=4, start=4, df_det="nom", seed=101),
+            ],
+            ignore_index=True,
+        )
+        self.assertTrue(gr.df_equal(df_min, df_chunks))
+
+        ## Unscrambled sequence skips origin
+        df_halton = gr.eval_qmc(
+            self.md_mixed, n=2, engine="halton", scramble=False, df_det="nom"
+        )
+        self.assertTrue(np.allclose(df_halton[["x0", "x1"]].values[0], [0.5, 1 / 3]))
+
+        ## Replicates
+        df_rep = gr.eval_qmc(
+            self.md_mixed, n=8, n_rep=3, df_det="nom", seed=101, skip=True
+        )
+        self.assertTrue(df_rep.shape[0] == 24)
+        self.assertTrue(list(df_rep.qmc_rep.unique()) == [0, 1, 2])
+        self.assertFalse(np.allclose(df_rep.x0.values[:8], df_rep.x0.values[8:16]))
+
+        with self.assertRaises(ValueError):
+            gr.eval_qmc(self.md_mixed, n=8, engine="foo", df_det="nom")
+        with self.assertRaises(ValueError):
+            gr.eval_qmc(self.md_mixed, n=8, n_rep=2, scramble=False, df_det="nom")
+
     def test_lhs(self):
         df_min = ev.eval_lhs(self.md, df_det="nom")
         self.assertTrue(df_min.shape == (1, self.md.n_var + self.md.n_out))
@@ -228,6 +415,44 @@ class TestRandom(unittest.TestCase):
         df_noappend = ev.eval_lhs(self.md, df_det="nom", append=False)
         self.assertTrue(set(df_noappend.columns) == set(self.md.out))
 
+    def test_lhs_native(self):
+        df_min = gr.eval_lhs(self.md, df_det="nom")
+        self.assertTrue(df_min.shape == (1, self.md.n_var + self.md.n_out))
+
+        df_seeded = gr.eval_lhs(self.md_mixed, n=10, df_det="nom", seed=101)
+        df_piped = self.md_mixed >> gr.ev_lhs(n=10, df_det="nom", seed=101)
+        self.assertTrue(df_seeded.equals(df_piped))
+
+        ## Optimized design is Latin and better spaced
+        df_lhs = gr.eval_lhs(self.md_mixed, n=20, df_det="nom", seed=101, skip=True)
+        df_opt = gr.eval_lhs(
+            self.md_mixed,
+            n=20,
+            df_det="nom",
+            seed=101,
+            criterion="maximin",
+            skip=True,
+        )
+        for var in ["x0", "x1"]:
+            self.assertTrue(
+                np.all(np.sort(np.floor(df_opt[var] * 20)) == np.arange(20))
+            )
+        self.assertTrue(
+            pdist(df_opt[["x0", "x1"]].values).min()
+            > pdist(df_lhs[["x0", "x1"]].values).min()
+        )
+
+        ## Centered strata
+        df_center = gr.eval_lhs(
+            self.md_mixed, n=4, df_det="nom", center=True, skip=True
+        )
+        self.assertTrue(
+            np.allclose(np.sort(df_center.x0), [0.125, 0.375, 0.625, 0.875])
+        )
+
+        with self.assertRaises(ValueError):
+            gr.eval_lhs(self.md_mixed, n=4, df_det="nom", criterion="foo")
+
     def test_sinews(self):
         df_min = gr.eval_sinews(self.md, df_det="nom")
         self.assertTrue(
@@ -245,6 +470,34 @@ class TestRandom(unittest.TestCase):
 
         df_mixed = gr.eval_sinews(self.md_mixed, df_det="swp")
 
+    def test_morris(self):
+        df_morris = gr.eval_morris(self.md_mixed, r=5, df_det="nom", seed=101)
+        self.assertTrue(df_morris.shape[0] == 5 * (self.md_mixed.n_var_rand + 1))
+        self.assertTrue(df_morris._meta["type"] == "eval_morris")
+
+        df_piped = self.md_mixed >> gr.ev_morris(r=5, df_det="nom", seed=101)
+        self.assertTrue(df_morris.equals(df_piped))
+
+        ## Each trajectory changes each input once, on the grid
+        for ind, df_traj in df_morris.groupby("morris_ind"):
+            self.assertTrue(list(df_traj.morris_var)[0] == "_")
+            self.assertTrue(set(df_traj.morris_var[1:]) == set(["x0", "x1"]))
+            dX = np.diff(df_traj[["x0", "x1"]].values, axis=0)
+            self.assertTrue(np.all((dX != 0).sum(axis=1) == 1))
+            self.assertTrue(np.allclose(np.abs(dX).sum(axis=1), 0.5))
+
+        df_skip = gr.eval_morris(self.md_mixed, r=5, df_det="nom", skip=True)
+        self.assertTrue("y0" not in df_skip.columns)
+
+        with self.assertRaises(ValueError):
+            gr.eval_morris(self.md_mixed, levels=3, df_det="nom")
+        with self.assertRaises(ValueError):
+            gr.eval_morris(self.md_mixed, r=1, df_det="nom")
+        # Smallest design keeps exactly r trajectories
+        df_two = gr.eval_morris(self.md_mixed, r=2, df_det="nom", seed=101)
+        self.assertTrue(set(df_two.morris_ind) == set([0, 1]))
+        self.assertTrue(df_two.shape[0] == 2 * (self.md_mixed.n_var_rand + 1))
+
     def test_hybrid(self):
         df_min = gr.eval_hybrid(self.md, df_det="nom")
         self.assertTrue(
@@ -265,6 +518,16 @@ class TestRandom(unittest.TestCase):
         df_skip = gr.eval_hybrid(self.md, df_det="nom", skip=True)
         self.assertTrue(set(df_skip.columns) == set(self.md.var + ["hybrid_var"]))
 
+        ## Single design for first and total indices
+        df_both = gr.eval_hybrid(self.md, n=10, df_det="nom", plan="both", skip=True)
+        self.assertTrue(df_both.shape[0] == 10 * (self.md.n_var_rand + 2))
+        df_second = gr.eval_hybrid(
+            self.md, n=10, df_det="nom", plan="both", second=True, skip=True
+        )
+        self.assertTrue(df_second.shape[0] == 10 * (2 * self.md.n_var_rand + 2))
+        with self.assertRaises(ValueError):
+            gr.eval_hybrid(self.md, df_det="nom", plan="first", second=True)
+
         ## Raises
         md_buckle = models.make_plate_buckle()
         with self.assertRaises(ValueError):
@@ -324,6 +587,15 @@ class TestOpt(unittest.TestCase):
         df_multi = gr.eval_nls(md_feat, df_data=df_data, n_restart=2)
         self.assertTrue(df_multi.shape[0] == 2)
 
+        ## Parallel restarts match serial restarts
+        df_serial = gr.eval_nls(
+            md_feat, df_data=df_data, n_restart=3, seed=101, append=True
+        )
+        df_parallel = gr.eval_nls(
+            md_feat, df_data=df_data, n_restart=3, seed=101, append=True, n_jobs=2
+        )
+        self.assertTrue(gr.df_equal(df_serial, df_parallel))
+
         ## Specified initial guess
         df_spec = gr.eval_nls(
             md_feat, df_data=df_data, df_init=gr.df_make(x0=0.5), append=False
@@ -339,6 +611,58 @@ class TestOpt(unittest.TestCase):
         with self.assertRaises(ValueError):
             gr.eval_nls(md_feat, df_data=df_data, df_init=gr.df_make(foo=0.5))
 
+        ## Analytic gradients
+        md_jac = (
+            gr.Model()
+            >> gr.cp_function(
+                fun=lambda x: x[0] * x[1] + x[2],
+                var=3,
+                out=1,
+                jac=lambda x: [[x[1], x[0], 1]],
+            )
+            >> gr.cp_bounds(x0=[-1, +1], x2=[0, 0])
+            >> gr.cp_marginals(x1=dict(dist="norm", loc=0, scale=1))
+        )
+        df_jac = gr.eval_nls(md_jac, df_data=df_data, append=False)
+        pd.testing.assert_frame_equal(
+            df_jac,
+            df_true,
+            check_exact=False,
+            check_dtype=False,
+            check_column_type=False,
+        )
+
+        ## Residual least squares
+        for method in ["trf", "dogbox"]:
+            df_lsq = gr.eval_nls(md_feat, df_data=df_data, method=method)
+            pd.testing.assert_frame_equal(
+                df_lsq,
+                df_true,
+                check_exact=False,
+                check_dtype=False,
+                check_column_type=False,
+            )
+        df_lsq_jac = gr.eval_nls(md_jac, df_data=df_data, method="trf", append=True)
+        self.assertTrue(abs(df_lsq_jac.x0[0] - 0.1) < 1e-6)
+        self.assertTrue(df_lsq_jac.mse[0] < 1e-12)
+        # Levenberg-Marquardt requires unbounded variables
+        with self.assertRaises(ValueError):
+            gr.eval_nls(md_feat, df_data=df_data, method="lm")
+
+        md_free = (
+            gr.Model()
+            >> gr.cp_function(fun=lambda x: np.exp(x[0] * x[1]), var=2, out=1)
+            >> gr.cp_marginals(
+                x0=dict(dist="norm", loc=0, scale=1),
+                x1=dict(dist="norm", loc=0, scale=1),
+            )
+        )
+        df_free = md_free >> gr.ev_df(
+            df=gr.df_make(x0=0.7, x1=[-1, -0.5, +0, +0.5, +1])
+        )
+        df_lm = gr.eval_nls(md_free, df_data=df_free[["x1", "y0"]], method="lm")
+        self.assertTrue(abs(df_lm.x0[0] - 0.7) < 1e-6)
+
     def test_opt(self):
         md_bowl = (
             gr.Model("Constrained bowl")
@@ -376,6 +700,226 @@ class TestOpt(unittest.TestCase):
         )
         self.assertTrue(df_multi.shape[0] == 2)
 
+        # Parallel restarts match serial restarts
+        df_serial = gr.eval_min(
+            md_bowl, out_min="f", out_geq=["g1"], out_leq=["g2"], n_restart=4, seed=101
+        )
+        df_parallel = gr.eval_min(
+            md_bowl,
+            out_min="f",
+            out_geq=["g1"],
+            out_leq=["g2"],
+            n_restart=4,
+            seed=101,
+            n_jobs=2,
+        )
+        self.assertTrue(gr.df_equal(df_serial, df_parallel))
+
+        # Early termination once restarts agree on the optimum
+        df_agree = gr.eval_min(
+            md_bowl,
+            out_min="f",
+            out_geq=["g1"],
+            out_leq=["g2"],
+            n_restart=4,
+            seed=101,
+            n_agree=2,
+        )
+        self.assertTrue(df_agree.shape[0] == 2)
+        self.assertTrue(gr.df_equal(df_agree, df_serial.iloc[:2], close=True))
+        df_agree_parallel = gr.eval_min(
+            md_bowl,
+            out_min="f",
+            out_geq=["g1"],
+            out_leq=["g2"],
+            n_restart=4,
+            seed=101,
+            n_agree=2,
+            n_jobs=2,
+        )
+        self.assertTrue(gr.df_equal(df_agree, df_agree_parallel))
+        with self.assertRaises(ValueError):
+            gr.eval_min(md_bowl, out_min="f", n_restart=2, n_agree=0)
+
+        # Analytic gradients give the same optimum
+        md_jac = (
+            gr.Model("Constrained bowl")
+            >> gr.cp_function(
+                fun=lambda x: x[0] ** 2 + x[1] ** 2,
+                var=["x", "y"],
+                out=["f"],
+                jac=lambda x: [[2 * x[0], 2 * x[1]]],
+            )
+            >> gr.cp_function(
+                fun=lambda x: (x[0] + x[1] + 1),
+                var=["x", "y"],
+                out=["g1"],
+                jac=lambda x: [[1, 1]],
+            )
+            >> gr.cp_function(
+                fun=lambda x: -(-x[0] + x[1] - np.sqrt(2 / 10)),
+                var=["x", "y"],
+                out=["g2"],
+                jac=lambda x: [[1, -1]],
+            )
+            >> gr.cp_bounds(x=(-1, +1), y=(-1, +1),)
+        )
+        df_jac = md_jac >> gr.ev_min(out_min="f", out_geq=["g1"], out_leq=["g2"],)
+
+        self.assertTrue(abs(df_jac.x[0] + np.sqrt(1 / 20)) < 1e-6)
+        self.assertTrue(abs(df_jac.y[0] - np.sqrt(1 / 20)) < 1e-6)
+
+        # Objective and constraints share model evaluations
+        points = []
+
+        def fun_count(df):
+            points.append(df[["x", "y"]].values)
+            return md_bowl.evaluate_df(df)
+
+        md_count = (
+            gr.Model("Counted bowl")
+            >> gr.cp_vec_function(fun=fun_count, var=["x", "y"], out=["f", "g1", "g2"])
+            >> gr.cp_bounds(x=(-1, +1), y=(-1, +1),)
+        )
+        df_count = md_count >> gr.ev_min(out_min="f", out_geq=["g1"], out_leq=["g2"])
+
+        self.assertTrue(gr.df_equal(df_count, df_res, close=True))
+        X = np.concatenate(points[:-1], axis=0)
+        self.assertTrue(np.unique(X, axis=0).shape[0] == X.shape[0])
+
+    def test_min_population(self):
+        sizes = []
+
+        def fun_bowl(df):
+            sizes.append(df.shape[0])
+            return gr.df_make(
+                f=df.x ** 2 + df.y ** 2,
+                g1=df.x + df.y + 1,
+                g2=-(-df.x + df.y - np.sqrt(2 / 10)),
+            )
+
+        md_bowl = (
+            gr.Model("Constrained bowl")
+            >> gr.cp_vec_function(fun=fun_bowl, var=["x", "y"], out=["f", "g1", "g2"])
+            >> gr.cp_bounds(x=(-1, +1), y=(-1, +1),)
+        )
+
+        for method in ["de", "cmaes"]:
+            sizes.clear()
+            df_res = md_bowl >> gr.ev_min_population(
+                out_min="f",
+                out_geq=["g1"],
+                out_leq=["g2"],
+                method=method,
+                pop_size=20,
+                n_gen=300,
+                tol=1e-10,
+                seed=101,
+            )
+            # Check result
+            self.assertTrue(df_res.success[0])
+            self.assertTrue(abs(df_res.x[0] + np.sqrt(1 / 20)) < 1e-3)
+            self.assertTrue(abs(df_res.y[0] - np.sqrt(1 / 20)) < 1e-3)
+            # One model evaluation per generation
+            self.assertTrue(all(size == 20 for size in sizes))
+            self.assertTrue(len(sizes) == df_res.n_iter[0] + 1)
+
+        # History ends at the optimum
+        df_hist = md_bowl >> gr.ev_min_population(
+            out_min="f", out_geq=["g1"], out_leq=["g2"], n_gen=10, history=True,
+        )
+        self.assertTrue(df_hist.shape[0] == 11)
+        self.assertTrue(all(np.diff(df_hist.f[df_hist.violation == 0]) <= 0))
+        self.assertTrue(df_hist.success.iloc[-1] in [True, False])
+        self.assertTrue(isinstance(df_hist.message.iloc[-1], str))
+        self.assertTrue(df_hist.success.iloc[:-1].isnull().all())
+
+        # Equality constraint; optimum at x = y = 0.1
+        md_eq = (
+            gr.Model()
+            >> gr.cp_vec_function(
+                fun=lambda df: gr.df_make(
+                    f=(df.x - 0.3) ** 2 + (df.y + 0.1) ** 2, h=df.x - df.y,
+                ),
+                var=["x", "y"],
+                out=["f", "h"],
+            )
+            >> gr.cp_bounds(x=(-1, +1), y=(-1, +1))
+        )
+        for method in ["de", "cmaes"]:
+            df_eq = md_eq >> gr.ev_min_population(
+                out_min="f", out_eq=["h"], method=method, n_gen=300, seed=101,
+            )
+            self.assertTrue(abs(df_eq.h[0]) <= 1e-6)
+            self.assertTrue(abs(df_eq.f[0] - 0.08) < 1e-3)
+
+        # Check errors for violated invariants
+        with self.assertRaises(ValueError):
+            gr.eval_min_population(md_bowl, out_min="FALSE")
+        with self.assertRaises(ValueError):
+            gr.eval_min_population(md_bowl, out_min="f", out_leq=["FALSE"])
+        with self.assertRaises(ValueError):
+            gr.eval_min_population(md_bowl, out_min="f", method="FALSE")
+        with self.assertRaises(ValueError):
+            gr.eval_min_population(
+                md_bowl >> gr.cp_bounds(x=(-np.Inf, +1)), out_min="f"
+            )
+
+    def test_bayes_opt(self):
+        sizes = []
+
+        def fun_bowl(df):
+            sizes.append(df.shape[0])
+            return gr.df_make(
+                f=df.x ** 2 + df.y ** 2,
+                g1=df.x + df.y + 1,
+                g2=-(-df.x + df.y - np.sqrt(2 / 10)),
+            )
+
+        md_bowl = (
+            gr.Model("Constrained bowl")
+            >> gr.cp_vec_function(fun=fun_bowl, var=["x", "y"], out=["f", "g1", "g2"])
+            >> gr.cp_bounds(x=(-1, +1), y=(-1, +1),)
+        )
+
+        df_res = md_bowl >> gr.ev_bayes_opt(
+            out_min="f", out_geq=["g1"], out_leq=["g2"], n_iter=8, batch=2, seed=101,
+        )
+        # Check result
+        self.assertTrue(df_res.success[0])
+        self.assertTrue(abs(df_res.f[0] - 0.1) < 1e-2)
+        # One model evaluation per batch
+        self.assertTrue(sizes == [5] + [2] * 8)
+
+        # History holds every evaluation
+        df_hist = md_bowl >> gr.ev_bayes_opt(
+            out_min="f", n_init=4, n_iter=2, batch=3, n_jobs=2, history=True,
+        )
+        self.assertTrue(list(df_hist["round"]) == [0] * 4 + [1] * 3 + [2] * 3)
+
+        # Kriging believer reuses each round's fitted kernels
+        sizes_fit = []
+
+        def fit_count(df):
+            """Gaussian process fit that records its training size"""
+            sizes_fit.append(df.shape[0])
+            return fit.fit_gp(
+                df, var=["x", "y"], out=["f"], kernels=RBF(1.0), n_restart=0
+            )
+
+        md_bowl >> gr.ev_bayes_opt(
+            out_min="f", n_init=4, n_iter=2, batch=3, ft=gr.add_pipe(fit_count),
+        )
+        self.assertTrue(sizes_fit == [4, 7])
+
+        # Check errors for violated invariants
+        with self.assertRaises(ValueError):
+            gr.eval_bayes_opt(md_bowl, out_min="FALSE")
+        with self.assertRaises(ValueError):
+            gr.eval_bayes_opt(md_bowl, out_min="f", out_geq=["FALSE"])
+        with self.assertRaises(ValueError):
+            gr.eval_bayes_opt(md_bowl, out_min="f", batch=0)
+
 
 ## Run tests
 if __name__ == "__main__":
@@ -6,6 +6,7 @@ import sys
 
 from context import grama as gr
 from context import models
+from context import comp
 
 ## Test the Model Building Interface
 ##################################################
@@ -93,6 +94,49 @@ class TestMBI(unittest.TestCase):
             gr.df_equal(gr.df_make(x0=0, y0=0), md_vec >> gr.ev_df(df=gr.df_make(x0=0)))
         )
 
+    @unittest.skipIf(comp is None, "sympy not installed")
+    def test_comp_sym_function(self):
+        """Test symbolic function composition"""
+        import sympy as sp
+
+        w, t, H, V, Y = sp.symbols("w t H V Y")
+        md_beam = models.make_cantilever_beam()
+        df = md_beam >> gr.ev_monte_carlo(n=10, df_det="nom", seed=101, skip=True)
+
+        md_sym = self.md >> comp.cp_sym_function(
+            expr={"g_stress": (Y - 600 * V / w / t ** 2 - 600 * H / w ** 2 / t) / 4e4},
+            var=["w", "t", "H", "V", "Y"],
+        )
+
+        ## Matches the hand-written row-wise function
+        df_beam = md_beam >> gr.ev_df(df=df)
+        df_sym = md_sym >> gr.ev_df(df=df)
+        self.assertTrue(np.allclose(df_beam.g_stress, df_sym.g_stress))
+
+        ## Exact jacobian matches finite differences
+        self.assertTrue(md_sym.has_jac)
+        df_jac = md_sym >> gr.ev_grad_fd(df_base=df)
+        df_fd = md_beam >> gr.ev_grad_fd(df_base=df, var=["w", "t", "H", "V", "Y"])
+        self.assertTrue(
+            np.allclose(df_jac, df_fd[df_jac.columns], rtol=1e-4, atol=1e-6)
+        )
+
+        ## Default names; constant expressions are broadcast
+        md_list = self.md >> comp.cp_sym_function(expr=[w * t, sp.Integer(2)], out=2)
+        self.assertTrue(set(md_list.var) == {"t", "w"})
+        self.assertTrue(set(md_list.out) == {"y0", "y1"})
+        df_list = md_list >> gr.ev_df(df=gr.df_make(w=[1, 2], t=[3, 4]))
+        self.assertTrue(np.allclose(df_list.y0, [3, 8]))
+        self.assertTrue(np.allclose(df_list.y1, [2, 2]))
+
+        ## Invariants
+        with self.assertRaises(ValueError):
+            comp.comp_sym_function(self.md, expr=w * t)
+        with self.assertRaises(ValueError):
+            comp.comp_sym_function(self.md, expr=w * t, var=["w"], out=["y"])
+        with self.assertRaises(ValueError):
+            comp.comp_sym_function(self.md, expr=[w, t], out=["y"])
+
     def test_comp_model(self):
         """Test model composition"""
         md_inner = (
@@ -197,3 +241,37 @@ class TestMBI(unittest.TestCase):
         )
         df_gau = md_gaussian.density.sample()
         self.assertTrue(set(df_gau.columns) == set(["x", "y"]))
+
+        ## Matrix correlations match long-format correlations
+        md_matrix = gr.comp_copula_gaussian(
+            md_incomplete, corr=np.array([[1.0, 0.5], [0.5, 1.0]])
+        )
+        self.assertTrue(
+            np.allclose(
+                md_matrix.density.copula.Sigma, md_gaussian.density.copula.Sigma
+            )
+        )
+        self.assertTrue(
+            gr.df_equal(
+                md_matrix.density.copula.df_corr,
+                md_gaussian.density.copula.df_corr,
+            )
+        )
+        with self.assertRaises(ValueError):
+            gr.comp_copula_gaussian(md_incomplete, corr=np.eye(3))
+
+        ## Factor copula
+        md_factor = gr.comp_copula_gaussian(
+            md_incomplete, loadings=np.array([[0.5], [0.5]])
+        )
+        self.assertTrue(
+            np.allclose(
+                md_factor.density.copula.Sigma, np.array([[1.0, 0.25], [0.25, 1.0]])
+            )
+        )
+        df_fac = md_factor.density.sample(n=10, seed=101)
+        self.assertTrue(set(df_fac.columns) == set(["x", "y"]))
+        Z = np.array([[0.0, 0.0], [1.0, -1.0]])
+        self.assertTrue(np.allclose(md_factor.x2z(md_factor.z2x(Z)), Z))
+        with self.assertRaises(ValueError):
+            gr.comp_copula_gaussian(md_incomplete, loadings=np.array([[1.0], [0.5]]))
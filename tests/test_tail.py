@@ -72,6 +72,211 @@ class TestFORM(unittest.TestCase):
         )
         self.assertTrue(df_beam.shape[0] == 1)
 
+        ## Improved HL-RF iteration
+        df_hlrf = self.md >> gr.ev_form_ria(df_det="nom", limits=["g"], method="iHLRF")
+        self.assertTrue(np.allclose(df_hlrf["beta_g"], [self.beta_true], atol=1e-3))
+        df_hlrf_mpp = self.md_log >> gr.ev_form_ria(
+            df_det="nom", limits=["g"], method="iHLRF"
+        )
+        self.assertTrue(
+            gr.df_equal(df_hlrf_mpp, self.df_mpp[["x", "y", "beta_g"]], close=True)
+        )
+        df_beam_hlrf = self.md_beam >> gr.ev_form_ria(
+            df_det="nom", limits=["g_stress", "g_disp"], append=False, method="iHLRF"
+        )
+        self.assertTrue(
+            np.allclose(df_beam_hlrf.values, df_beam.values, rtol=1e-3, atol=1e-3)
+        )
+
+        ## Analytic gradients
+        md_jac = (
+            gr.Model()
+            >> gr.cp_function(
+                fun=lambda x: self.beta_true * 2 - x[0] - np.sqrt(3) * x[1],
+                var=2,
+                out=["g"],
+                jac=lambda x: [[-1, -np.sqrt(3)]],
+            )
+            >> gr.cp_marginals(
+                x0=dict(dist="norm", loc=0, scale=1, sign=1),
+                x1=dict(dist="norm", loc=0, scale=1, sign=1),
+            )
+            >> gr.cp_copula_independence()
+        )
+        for method in ["SLSQP", "iHLRF"]:
+            df_jac = md_jac >> gr.ev_form_ria(df_det="nom", limits=["g"], method=method)
+            self.assertTrue(np.allclose(df_jac["beta_g"], [self.beta_true], atol=1e-3))
+
+        with self.assertRaises(ValueError):
+            self.md >> gr.ev_form_ria(df_det="nom", limits=["g"], method="foo")
+
+    def test_form_parallel(self):
+        df_det = gr.df_make(w=[2.5, 3.5, 2.6, 3.4], t=3)
+        kw = dict(df_det=df_det, limits=["g_stress", "g_disp"], append=False)
+        df_serial = self.md_beam >> gr.ev_form_ria(**kw)
+
+        ## Process pool returns identical results in the same order
+        df_parallel = self.md_beam >> gr.ev_form_ria(n_jobs=2, **kw)
+        self.assertTrue(gr.df_equal(df_serial, df_parallel))
+
+        ## Warm starts converge to the same MPPs
+        df_warm = self.md_beam >> gr.ev_form_ria(warm_start=True, n_jobs=2, **kw)
+        self.assertTrue(
+            np.allclose(df_warm.values, df_serial.values, atol=1e-3, equal_nan=True)
+        )
+
+        ## Random restarts do not depend on the number of workers
+        md_two = (
+            gr.Model()
+            >> gr.cp_vec_function(
+                fun=lambda df: gr.df_make(
+                    g=(4 - df.x0) * (df.x0 + 3) / 7 + 0 * df.x1 + 0 * df.d
+                ),
+                var=["x0", "x1", "d"],
+                out=["g"],
+            )
+            >> gr.cp_bounds(d=(0, 1))
+            >> gr.cp_marginals(
+                x0=dict(dist="norm", loc=0, scale=1),
+                x1=dict(dist="norm", loc=0, scale=1),
+            )
+            >> gr.cp_copula_independence()
+        )
+        kw_two = dict(
+            df_det=gr.df_make(d=np.linspace(0, 1, 6)),
+            limits=["g"],
+            n_restart=2,
+            seed=101,
+            append=False,
+        )
+        df_two_serial = md_two >> gr.ev_form_ria(**kw_two)
+        df_two_parallel = md_two >> gr.ev_form_ria(n_jobs=2, **kw_two)
+        self.assertTrue(gr.df_equal(df_two_serial, df_two_parallel))
+
+        ## Non-numeric det levels are fine without warm starts
+        md_label = (
+            gr.Model()
+            >> gr.cp_vec_function(
+                fun=lambda df: gr.df_make(g=3 - df.x0 + (df.label == "b") + 0 * df.x1),
+                var=["x0", "x1", "label"],
+                out=["g"],
+            )
+            >> gr.cp_marginals(
+                x0=dict(dist="norm", loc=0, scale=1),
+                x1=dict(dist="norm", loc=0, scale=1),
+            )
+            >> gr.cp_copula_independence()
+        )
+        df_label = md_label >> gr.ev_form_ria(
+            df_det=gr.df_make(label=["a", "b"]), limits=["g"], append=False
+        )
+        self.assertTrue(np.allclose(df_label.beta_g, [3, 4], atol=1e-3))
+
+        ## PMA with appended MPPs keeps the tidy format
+        df_pma = self.md_beam >> gr.ev_form_pma(
+            df_det=df_det, betas=dict(g_stress=3), warm_start=True, n_jobs=2
+        )
+        self.assertTrue(df_pma.shape[0] == df_det.shape[0])
+        self.assertTrue(np.allclose(df_pma.w, df_det.w))
+        self.assertTrue(set(self.md_beam.var_rand).issubset(set(df_pma.columns)))
+
+    def test_importance(self):
+        ## Accurate for a rare event
+        md_rare = (
+            gr.Model()
+            >> gr.cp_function(
+                fun=lambda x: 4.75 * 2 - x[0] - np.sqrt(3) * x[1],
+                var=2,
+                out=["g"],
+            )
+            >> gr.cp_marginals(
+                x0=dict(dist="norm", loc=0, scale=1),
+                x1=dict(dist="norm", loc=0, scale=1),
+            )
+            >> gr.cp_copula_independence()
+        )
+        pof_true = norm.cdf(-4.75)
+        df_res = md_rare >> gr.ev_importance(
+            df_det="nom", limits=["g"], n=1000, seed=101
+        )
+        self.assertTrue(abs(df_res.pof_g[0] / pof_true - 1) < 0.25)
+        self.assertTrue(df_res.pof_g_lo[0] < pof_true < df_res.pof_g_up[0])
+
+        ## Reuse MPP
+        df_mpp = self.md >> gr.ev_form_ria(df_det="nom", limits=["g"])
+        df_reuse = self.md >> gr.ev_importance(
+            df_det="nom", limits=["g"], df_mpp=df_mpp, n=1000, seed=101
+        )
+        self.assertTrue(abs(df_reuse.pof_g[0] / norm.cdf(-self.beta_true) - 1) < 0.25)
+
+        ## Deterministic levels
+        df_beam = self.md_beam >> gr.ev_importance(
+            df_det=gr.df_make(w=[2.5, 3.0], t=3), limits=["g_disp"], n=100
+        )
+        self.assertTrue(df_beam.shape[0] == 2)
+        self.assertTrue(df_beam.pof_g_disp[0] > df_beam.pof_g_disp[1])
+
+        ## Reuse MPPs for several limits and deterministic levels
+        df_det = gr.df_make(w=[2.5, 2.8, 3.0], t=3)
+        limits = ["g_stress", "g_disp"]
+        df_mpp = self.md_beam >> gr.ev_form_ria(
+            df_det=df_det, limits=limits, append=True
+        )
+        df_multi = self.md_beam >> gr.ev_importance(
+            df_det=df_det, limits=limits, df_mpp=df_mpp, n=100, seed=101
+        )
+        self.assertTrue(df_multi.shape[0] == 3)
+        self.assertTrue(np.allclose(df_multi.w, df_det.w))
+        for key in limits:
+            self.assertTrue((df_multi["pof_" + key + "_lo"] >= 0).all())
+            self.assertTrue((df_multi["pof_" + key + "_up"] <= 1).all())
+
+        with self.assertRaises(ValueError):
+            self.md >> gr.ev_importance(df_det="nom")
+
+    def test_subset_sim(self):
+        md_rare = (
+            gr.Model()
+            >> gr.cp_vec_function(
+                fun=lambda df: gr.df_make(g=4.75 * 2 - df.x0 - np.sqrt(3) * df.x1),
+                var=["x0", "x1"],
+                out=["g"],
+            )
+            >> gr.cp_marginals(
+                x0=dict(dist="norm", loc=0, scale=1),
+                x1=dict(dist="norm", loc=0, scale=1),
+            )
+            >> gr.cp_copula_independence()
+        )
+        pof_true = norm.cdf(-4.75)
+        df_res = md_rare >> gr.ev_subset_sim(df_det="nom", limit="g", seed=101)
+
+        self.assertTrue(0.3 * pof_true < df_res.pof_g[0] < 3 * pof_true)
+        self.assertTrue(0 < df_res.cov_g[0] < 1)
+        self.assertTrue(df_res.n_level[0] > 4)
+        self.assertTrue(df_res.n_eval[0] == 1000 + 900 * (df_res.n_level[0] - 1))
+
+        ## Common event terminates at first level
+        md_common = md_rare >> gr.cp_vec_function(
+            fun=lambda df: gr.df_make(h=-0.5 - df.x0), var=["x0"], out=["h"]
+        )
+        df_common = md_common >> gr.ev_subset_sim(
+            df_det="nom", limit="h", n_per_level=100, p0=0.5, seed=101
+        )
+        self.assertTrue(df_common.n_level[0] == 1)
+        self.assertTrue(df_common.n_eval[0] == 100)
+
+        ## Level budget exhausted before the failure region
+        with self.assertWarns(RuntimeWarning):
+            df_short = md_rare >> gr.ev_subset_sim(
+                df_det="nom", limit="g", n_max_level=2, seed=101
+            )
+        self.assertTrue(df_short.n_level[0] == 2)
+        self.assertTrue(df_short.pof_g[0] > pof_true)
+
+        with self.assertRaises(ValueError):
+            md_rare >> gr.ev_subset_sim(df_det="nom", limit="g", p0=0.3)
+
     def test_pma(self):
         ## Test accuracy
         df_res = self.md >> gr.ev_form_pma(df_det="nom", betas=dict(g=self.beta_true))
@@ -88,3 +293,47 @@ class TestFORM(unittest.TestCase):
             df_det="nom", betas={"g_stress": 3, "g_disp": 3}, append=False,
         )
         self.assertTrue(df_beam.shape[0] == 1)
+
+        ## Advanced mean value iteration
+        df_amv = self.md >> gr.ev_form_pma(
+            df_det="nom", betas=dict(g=self.beta_true), method="AMV"
+        )
+        self.assertTrue(np.allclose(df_amv["g"], [0], atol=1e-3))
+        df_amv_mpp = self.md_log >> gr.ev_form_pma(
+            df_det="nom", betas=dict(g=1.0), method="AMV"
+        )
+        self.assertTrue(
+            gr.df_equal(df_amv_mpp, self.df_mpp[["x", "y", "g"]], close=True)
+        )
+        df_beam_amv = self.md_beam >> gr.ev_form_pma(
+            df_det="nom",
+            betas={"g_stress": 3, "g_disp": 3},
+            append=False,
+            method="AMV",
+        )
+        self.assertTrue(
+            np.allclose(df_beam_amv.values, df_beam.values, rtol=1e-2, atol=1e-3)
+        )
+
+        ## A stalled search is not reported as an MPP
+        md_stall = (
+            gr.Model()
+            >> gr.cp_function(
+                fun=lambda x: 3 - x[0] - x[1],
+                var=["x0", "x1"],
+                out=["g"],
+                jac=lambda x: [[1, 0]],
+            )
+            >> gr.cp_marginals(
+                x0=dict(dist="norm", loc=0, scale=1),
+                x1=dict(dist="norm", loc=0, scale=1),
+            )
+            >> gr.cp_copula_independence()
+        )
+        df_stall = md_stall >> gr.ev_form_pma(
+            df_det="nom", betas=dict(g=2), method="AMV"
+        )
+        self.assertTrue(df_stall.isna().all(axis=None))
+
+        with self.assertRaises(ValueError):
+            self.md >> gr.ev_form_pma(df_det="nom", betas=dict(g=3), method="foo")
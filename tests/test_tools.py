@@ -21,6 +21,8 @@ class TestMarginals(unittest.TestCase):
     def setUp(self):
         self.mg_gkde = gr.marg_gkde(data.df_stang.E)
         self.mg_norm = gr.marg_named(data.df_stang.E, "norm")
+        self.mg_emp = gr.marg_empirical(data.df_stang.E)
+        self.mg_emp_smooth = gr.marg_empirical(data.df_stang.E, smooth=True)
 
     def test_marginals(self):
         median = np.median(data.df_stang.E)
@@ -39,11 +41,32 @@ class TestMarginals(unittest.TestCase):
 
         self.assertTrue(np.isclose(q_norm[1], median, atol=0, rtol=0.05))
 
+        x_emp = np.array([1, 10000, 10400, 10800, 1e6])
+        p_emp = self.mg_emp.p(x_emp)
+        q_emp = self.mg_emp.q(np.array([0.0, 0.25, 0.50, 0.75, 1.0]))
+        self.mg_emp.summary()
+
+        self.assertTrue(np.isclose(q_emp[2], median))
+        self.assertTrue(q_emp[0] == data.df_stang.E.min())
+        self.assertTrue(q_emp[-1] == data.df_stang.E.max())
+        self.assertTrue(p_emp[0] == 0 and p_emp[-1] == 1)
+        x_in = np.array([10000, 10400, 10600])
+        self.assertTrue(np.allclose(self.mg_emp.q(self.mg_emp.p(x_in)), x_in))
+
+        ## Densities integrate to one
+        x_grid = np.linspace(9000, 12000, 10001)
+        for mg in [self.mg_emp, self.mg_emp_smooth]:
+            l_emp = mg.l(x_grid)
+            self.assertTrue(np.all(l_emp >= 0))
+            self.assertTrue(np.isclose(np.trapz(l_emp, x_grid), 1, atol=1e-2))
+
         ## Raises error when dataframe passed
         with self.assertRaises(ValueError):
             gr.marg_named(data.df_stang, "norm")
         with self.assertRaises(ValueError):
             gr.marg_gkde(data.df_stang)
+        with self.assertRaises(ValueError):
+            gr.marg_empirical(data.df_stang)
 
 
 class TestMisc(unittest.TestCase):
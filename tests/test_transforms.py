@@ -186,6 +186,108 @@ class TestSummaries(unittest.TestCase):
         self.assertTrue(set(df_sobol.columns) == set(["y0", "ind"]))
         self.assertTrue(set(df_sobol["ind"]) == set(["S_x0", "S_x1"]))
 
+        ## First and total from one design
+        df_both = gr.eval_hybrid(self.md, df_det="nom", plan="both", second=True)
+        df_sobol_both = gr.tran_sobol(df_both, full=True)
+        self.assertTrue(
+            set(df_sobol_both["ind"])
+            == set(
+                ["S_x0", "S_x1", "ST_x0", "ST_x1", "S_x0:x1"]
+                + ["T_x0", "T_x1", "TT_x0", "TT_x1", "T_x0:x1", "var"]
+            )
+        )
+
+        ## Accurate on Ishigami function; vectorized for speed
+        md_ishigami = (
+            gr.Model("Ishigami (vectorized)")
+            >> gr.cp_vec_function(
+                fun=lambda df: gr.df_make(
+                    y0=np.sin(df.x1)
+                    + 7.0 * np.sin(df.x2) ** 2
+                    + 0.1 * df.x3 ** 4 * np.sin(df.x1)
+                ),
+                var=["x1", "x2", "x3"],
+                out=["y0"],
+            )
+            >> gr.cp_marginals(
+                x1=dict(dist="uniform", loc=-np.pi, scale=2 * np.pi),
+                x2=dict(dist="uniform", loc=-np.pi, scale=2 * np.pi),
+                x3=dict(dist="uniform", loc=-np.pi, scale=2 * np.pi),
+            )
+            >> gr.cp_copula_independence()
+        )
+        df_ishigami = gr.eval_hybrid(
+            md_ishigami, n=10000, df_det="nom", plan="both", second=True, seed=101
+        )
+        df_ind = gr.tran_sobol(df_ishigami, digits=3).set_index("ind")
+        S_true = {
+            "S_x1": 0.314,
+            "S_x2": 0.442,
+            "S_x3": 0.0,
+            "ST_x1": 0.558,
+            "ST_x2": 0.442,
+            "ST_x3": 0.244,
+            "S_x1:x3": 0.244,
+        }
+        for ind, value in S_true.items():
+            self.assertTrue(abs(df_ind.loc[ind, "y0"] - value) < 0.05)
+
+    def test_sobol_given_data(self):
+        md_ishigami = models.make_ishigami()
+        df_mc = gr.eval_monte_carlo(md_ishigami, n=10000, df_det="nom", seed=101)
+        S_true = {"S_x1": 0.314, "S_x2": 0.442, "S_x3": 0.0}
+
+        for method in ["rank", "bin"]:
+            df_ind = gr.tran_sobol_given_data(
+                df_mc, var=md_ishigami.var_rand, out=["y0"], method=method, digits=3
+            )
+            self.assertTrue(set(df_ind["ind"]) == set(S_true.keys()))
+            df_ind = df_ind.set_index("ind")
+            for ind, value in S_true.items():
+                self.assertTrue(abs(df_ind.loc[ind, "y0"] - value) < 0.04)
+
+        ## Full
+        df_full = df_mc >> gr.tf_sobol_given_data(
+            var=md_ishigami.var_rand, out=["y0"], full=True
+        )
+        self.assertTrue(
+            set(df_full["ind"])
+            == set(["S_x1", "S_x2", "S_x3", "T_x1", "T_x2", "T_x3", "var"])
+        )
+
+        with self.assertRaises(ValueError):
+            gr.tran_sobol_given_data(df_mc, var=["x1"])
+        with self.assertRaises(ValueError):
+            gr.tran_sobol_given_data(df_mc, var=["x1"], out=["y0"], method="foo")
+
+    def test_morris(self):
+        md_lin = (
+            gr.Model()
+            >> gr.cp_vec_function(
+                fun=lambda df: gr.df_make(f=2 * df.x0, g=df.x0 * df.x1),
+                var=["x0", "x1"],
+                out=["f", "g"],
+            )
+            >> gr.cp_marginals(
+                x0=dict(dist="uniform", loc=0, scale=1),
+                x1=dict(dist="uniform", loc=0, scale=1),
+            )
+            >> gr.cp_copula_independence()
+        )
+        df_morris = md_lin >> gr.ev_morris(r=10, df_det="nom", seed=101)
+        df_res = (df_morris >> gr.tf_morris()).set_index(["out", "var"])
+
+        ## Effects in grid units; quantile step is 1/2
+        self.assertTrue(np.isclose(df_res.loc[("f", "x0"), "mu_star"], 1.5))
+        self.assertTrue(np.isclose(df_res.loc[("f", "x0"), "mu"], 1.5))
+        self.assertTrue(np.isclose(df_res.loc[("f", "x0"), "sigma"], 0))
+        self.assertTrue(np.isclose(df_res.loc[("f", "x1"), "mu_star"], 0))
+        ## Interaction shows in sigma
+        self.assertTrue(df_res.loc[("g", "x1"), "sigma"] > 0)
+
+        with self.assertRaises(ValueError):
+            gr.tran_morris(gr.eval_hybrid(md_lin, df_det="nom"))
+
     def test_pca(self):
         df_test = pd.DataFrame(dict(x0=[1, 2, 3], x1=[1, 2, 3]))
         df_offset = pd.DataFrame(dict(x0=[1, 2, 3], x1=[3, 4, 5]))